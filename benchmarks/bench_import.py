@@ -0,0 +1,26 @@
+# import time of yapyvcloud.yapyvcloud in a fresh interpreter, as paid by every short-lived CLI worker
+# "eager" also imports the dependencies the module used to load at import time
+# usage: python benchmarks/bench_import.py [runs]
+import sys, os, subprocess, compileall
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HEAVY = ('requests', 'yaml', 'tarfile', 'netaddr', 'bs4', 'logging.config', 'xml.sax.saxutils', 'email.utils')
+EAGER = 'import %s; import yapyvcloud.yapyvcloud' % ', '.join(HEAVY)
+LAZY = 'import yapyvcloud.yapyvcloud'
+
+def import_time(statement, runs):
+    # best wall time of the imports, measured inside the child to leave out interpreter startup
+    code = 'import time, sys; t = time.time(); %s; sys.stdout.write(repr(time.time() - t))' % statement
+    return min(float(subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)) for i in range(runs))
+
+def loaded_modules():
+    code = 'import sys, yapyvcloud.yapyvcloud; sys.stdout.write(" ".join(m for m in %r if m in sys.modules))' % (HEAVY,)
+    return subprocess.check_output([sys.executable, '-c', code], cwd=ROOT).decode() or '-'
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    # compile up front, the interpreter may not be allowed to write .pyc files itself
+    compileall.compile_dir(os.path.join(ROOT, 'yapyvcloud'), quiet=1)
+    print("dependencies loaded by the import: %s" % loaded_modules())
+    for name, statement in (('lazy', LAZY), ('eager', EAGER)):
+        print("%-5s %.1f ms" % (name, import_time(statement, runs) * 1e3))
@@ -0,0 +1,29 @@
+# compare naming an operation with inspect.stack()[0][3] against the @operation_tag decorator
+# usage: python benchmarks/bench_operation_tag.py [stack_depth] [calls]
+import sys, os, inspect, timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from yapyvcloud.yapyvcloud import Metrics, operation_tag
+
+class Vm(object):
+    def api_post(self, caller=None):
+        return Metrics.operation() if caller == None else caller
+
+    def power_on_stack(self):
+        # what every method did before, often two or three times on failure paths
+        return self.api_post(inspect.stack()[0][3])
+
+    @operation_tag
+    def power_on_tag(self):
+        return self.api_post()
+
+def nested(depth, fn):
+    # callers sit some frames deep in real programs, inspect.stack() walks all of them
+    return fn() if depth == 0 else nested(depth - 1, fn)
+
+if __name__ == '__main__':
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    vm = Vm()
+    for name, fn in (('inspect.stack', vm.power_on_stack), ('operation_tag', vm.power_on_tag)):
+        seconds = min(timeit.repeat(lambda: nested(depth, fn), number=calls, repeat=3))
+        print("%-13s depth %d, %d calls: %.3f s (%.1f us/call)" % (name, depth, calls, seconds, seconds * 1e6 / calls))
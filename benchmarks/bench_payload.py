@@ -0,0 +1,98 @@
+# compare the old BeautifulSoup build + str/reparse payload path with the lxml builder path
+# usage: python benchmarks/bench_payload.py [firewall_rules] [calls]
+import sys, os, timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bs4 import builder, BeautifulSoup, Tag
+from lxml import etree
+from yapyvcloud.yapyvcloud import Container, Payload, XmlResponse
+
+NS = 'http://www.vmware.com/vcloud/v1.5'
+
+def edge_gateway(rules):
+    rule = ('<FirewallRule><IsEnabled>true</IsEnabled><Description>rule-%d</Description><Policy>allow</Policy>'
+        '<Protocols><Tcp>true</Tcp></Protocols><Port>-1</Port><DestinationPortRange>%d</DestinationPortRange>'
+        '<DestinationIp>Any</DestinationIp><SourcePort>-1</SourcePort><SourcePortRange>Any</SourcePortRange>'
+        '<SourceIp>Any</SourceIp><EnableLogging>false</EnableLogging></FirewallRule>')
+    nat_rule = ('<NatRule><RuleType>DNAT</RuleType><IsEnabled>true</IsEnabled><GatewayNatRule>'
+        '<Interface href="https://h/api/admin/network/1"/><OriginalIp>192.0.2.1</OriginalIp><OriginalPort>%d</OriginalPort>'
+        '<TranslatedIp>10.0.0.1</TranslatedIp><TranslatedPort>%d</TranslatedPort><Protocol>tcp</Protocol></GatewayNatRule></NatRule>')
+    return ('<?xml version="1.0" encoding="UTF-8"?><EdgeGateway xmlns="%s" name="edge"><Configuration>'
+        '<EdgeGatewayServiceConfiguration><FirewallService><IsEnabled>true</IsEnabled><DefaultAction>drop</DefaultAction>'
+        '%s</FirewallService><NatService><IsEnabled>true</IsEnabled>%s</NatService></EdgeGatewayServiceConfiguration></Configuration></EdgeGateway>'
+        % (NS, ''.join(rule % (i, i) for i in range(rules)), ''.join(nat_rule % (i, i) for i in range(rules)))).encode('utf-8')
+
+def reparse(params):
+    # the old round-trip; str() keeps the encoding declaration which lxml rejects on py3, so encode first
+    return etree.tostring(etree.fromstring(params.encode()),pretty_print=True)
+
+def bs4_deploy():
+    params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
+    params.append(Tag(builder=builder.TreeBuilder(),name='DeployVAppParams',attrs={'powerOn':'true',
+        'xmlns':NS}))
+    return reparse(params)
+
+def lxml_deploy():
+    return Container.deploy_params(True)
+
+def bs4_firewall(content):
+    params = BeautifulSoup(content,'xml').find('EdgeGatewayServiceConfiguration')
+    rule = Tag(builder=builder.TreeBuilder(),name='FirewallRule')
+    for name, value in (('IsEnabled', 'true'), ('Description', 'new'), ('Policy', 'allow'), ('Port', '-1'),
+            ('DestinationPortRange', '22'), ('DestinationIp', 'Any'), ('SourcePort', '-1'),
+            ('SourcePortRange', 'Any'), ('SourceIp', 'Any'), ('EnableLogging', 'false')):
+        rule.append(Tag(builder=builder.TreeBuilder(),name=name))
+        rule.find(name).string = value
+    params.find('FirewallService').find_all('FirewallRule',recursive=False)[0].insert_before(rule)
+    params['xmlns'] = NS
+    return reparse(params)
+
+def lxml_firewall(content):
+    E = Payload.E
+    rule = E.FirewallRule(E.IsEnabled('true'), E.Description('new'), E.Policy('allow'), E.Port('-1'),
+        E.DestinationPortRange('22'), E.DestinationIp('Any'), E.SourcePort('-1'),
+        E.SourcePortRange('Any'), E.SourceIp('Any'), E.EnableLogging('false'))
+    params = XmlResponse(content).find('EdgeGatewayServiceConfiguration')
+    params.find('{*}FirewallService').findall('{*}FirewallRule')[0].addprevious(rule)
+    return Payload.serialize(params)
+
+def bs4_nat(content):
+    params = BeautifulSoup(content,'xml').find('EdgeGatewayServiceConfiguration')
+    rule = Tag(builder=builder.TreeBuilder(),name='NatRule')
+    rule.append(Tag(builder=builder.TreeBuilder(),name='RuleType'))
+    rule.RuleType.string = 'DNAT'
+    rule.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
+    rule.IsEnabled.string = 'true'
+    rule.append(Tag(builder=builder.TreeBuilder(),name='GatewayNatRule'))
+    rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name='Interface',attrs={'href':'https://h/api/admin/network/1'}))
+    for name, value in (('OriginalIp', '192.0.2.1'), ('OriginalPort', '22'), ('TranslatedIp', '10.0.0.1'),
+            ('TranslatedPort', '22'), ('Protocol', 'tcp')):
+        rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name=name))
+        rule.GatewayNatRule.find(name).string = value
+    params.NatService.append(rule)
+    params['xmlns'] = NS
+    return reparse(params)
+
+def lxml_nat(content):
+    # the EdgeGateway.add_nat_rule payload
+    E = Payload.E
+    rule = E.NatRule(E.RuleType('DNAT'), E.IsEnabled('true'), E.GatewayNatRule(
+        E.Interface(href='https://h/api/admin/network/1'), E.OriginalIp('192.0.2.1'), E.OriginalPort('22'),
+        E.TranslatedIp('10.0.0.1'), E.TranslatedPort('22'), E.Protocol('tcp')))
+    params = XmlResponse(content).find('EdgeGatewayServiceConfiguration')
+    Payload.child(params, 'NatService').append(rule)
+    return Payload.serialize(params)
+
+def rule_count(payload, path='FirewallService/FirewallRule'):
+    return len(etree.fromstring(payload).findall('/'.join('{%s}%s' % (NS, step) for step in path.split('/'))))
+
+if __name__ == '__main__':
+    rules = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    content = edge_gateway(rules)
+    assert rule_count(bs4_firewall(content)) == rule_count(lxml_firewall(content)) == rules + 1
+    assert rule_count(bs4_nat(content), 'NatService/NatRule') == rule_count(lxml_nat(content), 'NatService/NatRule') == rules + 1
+    for name, fn in (('bs4 deploy', bs4_deploy), ('lxml deploy', lxml_deploy),
+            ('bs4 firewall', lambda: bs4_firewall(content)), ('lxml firewall', lambda: lxml_firewall(content)),
+            ('bs4 nat', lambda: bs4_nat(content)), ('lxml nat', lambda: lxml_nat(content))):
+        seconds = min(timeit.repeat(fn, number=calls, repeat=3))
+        print("%-13s %d calls: %.3f s (%.3f ms/call)" % (name, calls, seconds, seconds * 1e3 / calls))
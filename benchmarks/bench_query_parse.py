@@ -0,0 +1,46 @@
+# compare the old BeautifulSoup query page path with the single-parse XmlResponse path
+# usage: python benchmarks/bench_query_parse.py [records_per_page] [pages]
+import sys, os, timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bs4 import BeautifulSoup
+from yapyvcloud.yapyvcloud import XmlResponse
+
+VM_ATTRS = ('name', 'href', 'status', 'vdc', 'vdcName', 'container', 'containerName', 'catalogName',
+    'storageProfileName', 'guestOs', 'hardwareVersion', 'isVAppTemplate', 'isDeployed', 'isDeleted',
+    'isInMaintenanceMode', 'memoryMB', 'numberOfCpus', 'networkName', 'ipAddress', 'hostName',
+    'moref', 'vmToolsVersion', 'pvdcHighestSupportedHardwareVersion', 'taskStatus', 'task')
+
+def query_page(page_size, page, pages):
+    records = []
+    for i in range((page - 1) * page_size, page * page_size):
+        attrs = ' '.join('%s="%s-%d"' % (attr, attr, i) for attr in VM_ATTRS)
+        records.append('<VMRecord %s/>' % attrs)
+    next_page = '<Link rel="nextPage" href="https://vcd/api/query?type=vm&amp;page=%d" type="application/vnd.vmware.vcloud.query.records+xml"/>' % (page + 1) if page < pages else ''
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+        '<QueryResultRecords xmlns="http://www.vmware.com/vcloud/v1.5" total="%d" pageSize="%d" page="%d" name="vm" type="application/vnd.vmware.vcloud.query.records+xml">'
+        '%s%s</QueryResultRecords>' % (page_size * pages, page_size, page, next_page, ''.join(records))).encode('utf-8')
+
+def bs4_path(content):
+    # what get_record did per page before: three parses plus a fourth for the next page link
+    records = BeautifulSoup(content,'xml').find_all('VMRecord')
+    page_size = int(BeautifulSoup(content,'xml').QueryResultRecords['pageSize'])
+    total = int(BeautifulSoup(content,'xml').QueryResultRecords['total'])
+    link = BeautifulSoup(content,'xml').find('Link',attrs={'rel':'nextPage'})
+    return [(record['href'], record['name'], record['status']) for record in records]
+
+def lxml_path(content):
+    page = XmlResponse(content)
+    records = page.records('VMRecord')
+    page_size = int(page['pageSize'])
+    total = int(page['total'])
+    link = page.link('nextPage')
+    return [(record['href'], record['name'], record['status']) for record in records]
+
+if __name__ == '__main__':
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    contents = [query_page(page_size, page, pages) for page in range(1, pages + 1)]
+    assert [bs4_path(c) for c in contents] == [lxml_path(c) for c in contents]
+    for name, fn in (('bs4', bs4_path), ('lxml', lxml_path)):
+        seconds = min(timeit.repeat(lambda: [fn(c) for c in contents], number=1, repeat=3))
+        print("%-5s %d pages x %d records: %.3f s (%.2f ms/page)" % (name, pages, page_size, seconds, seconds * 1e3 / pages))
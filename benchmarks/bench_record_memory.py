@@ -0,0 +1,48 @@
+# resident memory held by query results: xml element records vs compact Record objects
+# usage: python benchmarks/bench_record_memory.py [records]
+import sys, os, gc, subprocess
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+def query_page(page_size, page, pages):
+    # realistic mix: unique name/href/moref, shared vdc/container/status and boolean flags
+    records = []
+    for i in range((page - 1) * page_size, page * page_size):
+        records.append('<VMRecord name="vm-%06d" href="https://vcd/api/vApp/vm-%06d-1b2c-4d5e-8f90-123456789abc" '
+            'status="%s" vdc="https://vcd/api/vdc/%d" container="https://vcd/api/vApp/vapp-%05d" containerName="vapp-%05d" '
+            'guestOs="CentOS 4/5/6/7 (64-bit)" hardwareVersion="11" isVAppTemplate="false" isDeployed="true" isDeleted="false" '
+            'isPublished="false" isInMaintenanceMode="false" isVdcEnabled="true" memoryMB="4096" numberOfCpus="2" '
+            'networkName="net-%d" storageProfileName="gold" vmToolsVersion="10279" moref="vm-%d" vc="https://vcd/api/admin/extension/vimServer/1" '
+            'datastoreName="ds-%d" hostName="esx-%d.example.com" pvdcHighestSupportedHardwareVersion="13" catalogName="" '
+            'taskStatus="success" taskStatusName="vappUpdateVm" task="https://vcd/api/task/%d"/>'
+            % (i, i, ('POWERED_ON', 'POWERED_OFF')[i % 2], i % 8, i // 4, i // 4, i % 16, i, i % 32, i % 64, i))
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+        '<QueryResultRecords xmlns="http://www.vmware.com/vcloud/v1.5" total="%d" pageSize="%d" page="%d" name="vm">'
+        '%s</QueryResultRecords>' % (page_size * pages, page_size, page, ''.join(records))).encode('utf-8')
+
+def rss_kb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+
+def measure(total, compact):
+    from yapyvcloud.yapyvcloud import XmlResponse
+    page_size = 128
+    pages = (total + page_size - 1) // page_size
+    gc.collect()
+    before = rss_kb()
+    records = []
+    for page in range(1, pages + 1):
+        records += XmlResponse(query_page(page_size, page, pages)).records('VMRecord', compact)
+    gc.collect()
+    return len(records), rss_kb() - before
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        print("%d %d" % measure(int(sys.argv[1]), sys.argv[2] == 'compact'))
+        sys.exit(0)
+    total = sys.argv[1] if len(sys.argv) > 1 else '50000'
+    for mode in ('elements', 'compact'):
+        # separate processes so freed arenas of one mode do not hide the other
+        count, kb = subprocess.check_output([sys.executable, os.path.abspath(__file__), total, mode]).split()
+        print("%-8s %s records: %.1f MB resident" % (mode, count.decode(), int(kb) / 1024.0))
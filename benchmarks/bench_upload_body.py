@@ -0,0 +1,58 @@
+# CPU cost of producing an upload body: the former UploadInChunks bytes-per-chunk path
+# against FileSlice mmap slices and readinto buffer, all sent over a local socket pair
+# the draining thread's cpu is included, it costs the same for all three
+# usage: python benchmarks/bench_upload_body.py [size_mb] [chunk_kb]
+import sys, os, time, tempfile, socket, threading
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from yapyvcloud.yapyvcloud import Container, FileSlice
+
+def old_chunks(file_path, chunksize):
+    # the former UploadInChunks: a fresh bytes object and a stderr progress line per chunk (sent to a null stream here)
+    totalsize = os.path.getsize(file_path)
+    readsofar = 0
+    with open(file_path, 'rb') as file, open(os.devnull, 'w') as progress:
+        while True:
+            data = file.read(chunksize)
+            if not data:
+                break
+            readsofar += len(data)
+            progress.write("\rupload {} {} progress:{percent:3.0f}%".format(file_path, readsofar, percent=readsofar * 1e2 / totalsize))
+            yield data
+
+def new_chunks(file_path, chunksize, mapped):
+    Container.upload_mmap = mapped
+    return FileSlice(file_path, 0, os.path.getsize(file_path), chunksize=chunksize)
+
+def receive(sock):
+    buffer = bytearray(1024 * 1024)
+    while sock.recv_into(buffer):
+        pass
+
+def drain(chunks):
+    # process time, what a 10 Gbit/s upload can spare per byte
+    sender, receiver = socket.socketpair()
+    reader = threading.Thread(target=receive, args=(receiver,))
+    reader.start()
+    start = time.process_time()
+    total = 0
+    for chunk in chunks:
+        sender.sendall(chunk)
+        total += len(chunk)
+    sender.close()
+    reader.join()
+    receiver.close()
+    return time.process_time() - start, total
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    chunksize = int(sys.argv[2]) * 1024 if len(sys.argv) > 2 else Container.chunk_size
+    with tempfile.NamedTemporaryFile() as file:
+        block = os.urandom(1024 * 1024)
+        for i in range(size):
+            file.write(block)
+        file.flush()
+        for name, chunks in (('bytes', lambda: old_chunks(file.name, chunksize)),
+                ('mmap', lambda: new_chunks(file.name, chunksize, True)),
+                ('readinto', lambda: new_chunks(file.name, chunksize, False))):
+            seconds, total = min(drain(chunks()) for i in range(3))
+            print("%-8s %d MB in %d KB chunks: %.3f s cpu (%.0f MB/cpu-s)" % (name, total >> 20, chunksize >> 10, seconds, (total >> 20) / max(seconds, 1e-9)))
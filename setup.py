@@ -12,7 +12,8 @@ setup(
     url = 'https://github.com/leanserpent/yapyvcloud',
     download_url = 'https://github.com/leanserpent/yapyvcloud/archive/v0.4.tar.gz',
     keywords = ['python', 'vcloud'],
-    install_requires = ['beautifulsoup4','lxml'],
+    install_requires = ['beautifulsoup4','lxml','futures; python_version < "3"'],
+    extras_require = {'aio':['aiohttp']},
     scripts = []
 )
 
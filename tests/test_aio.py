@@ -0,0 +1,72 @@
+# offline tests of the asyncio client with a fake async transport
+import asyncio, re
+from yapyvcloud.yapyvcloud import Container, ClientContext
+from yapyvcloud.aio import AsyncResponse, AsyncContainer, AsyncOrgVdc, AsyncVm
+
+NS = 'http://www.vmware.com/vcloud/v1.5'
+
+class FakeAsyncTransport(object):
+    # routes (method, url regex) to a response body or a function of the url
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    async def request(self, method, url, headers=None, data=None, auth=None, timeout=None):
+        self.calls.append((method, url))
+        for (route_method, pattern), content in self.routes.items():
+            if route_method == method and re.search(pattern, url):
+                content = content(url) if callable(content) else content
+                return content if isinstance(content, AsyncResponse) else AsyncResponse(200, content, {})
+        return AsyncResponse(404, b'', {})
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request('PUT', url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request('DELETE', url, **kwargs)
+
+def context(routes):
+    transport = FakeAsyncTransport(routes)
+    return ClientContext('https://h/api', {'Accept':'application/*+xml;version=27.0'}, 'org1', transport), transport
+
+def records_page(tag, names, page, page_size, total):
+    records = ''.join('<%s name="%s" href="https://h/api/vApp/%s"/>' % (tag, name, name) for name in names)
+    return ('<QueryResultRecords xmlns="%s" total="%d" pageSize="%d" page="%d">%s</QueryResultRecords>' % (NS, total, page_size, page, records)).encode()
+
+def test_async_container_does_not_expose_the_sync_api():
+    assert not issubclass(AsyncContainer, Container)
+    for name in ('get_owner', 'set_owner', 'get_metadata', 'iter_records', 'upload_files', 'download_file'):
+        assert not hasattr(AsyncVm, name), name
+
+def test_get_record_fetches_all_pages():
+    def query(url):
+        page = int(re.search(r'page=(\d+)', url).group(1)) if '&page=' in url else 1
+        return records_page('VMRecord', ['vm%d' % i for i in range((page - 1) * 2, min(page * 2, 5))], page, 2, 5)
+    ctx, transport = context({('GET', r'/query\?type=vm'): query})
+    vdc = AsyncOrgVdc('vdc1', ctx)
+    vdc.href = 'https://h/api/vdc/1'
+    records = asyncio.run(vdc.get_record('vm', 'VMRecord', show=False))
+    assert [record['name'] for record in records] == ['vm0', 'vm1', 'vm2', 'vm3', 'vm4']
+    assert len(transport.calls) == 3
+
+def test_power_on_waits_for_the_task():
+    task = ('<Task xmlns="%s" href="https://h/api/task/1" type="application/vnd.vmware.vcloud.task+xml" status="%%s" operationName="vappDeploy"><Owner name="vm1"/></Task>' % NS)
+    statuses = ['running', 'success']
+    ctx, transport = context({('POST', r'/power/action/powerOn'): AsyncResponse(202, (task % 'queued').encode(), {}),
+        ('GET', r'/task/1'): lambda url: (task % statuses.pop(0)).encode()})
+    initial_delay = Container.task_poll_initial_delay
+    Container.task_poll_initial_delay = 0.001
+    try:
+        vm = AsyncVm('vm1', AsyncContainer('vapp1', ctx))
+        vm.href = 'https://h/api/vApp/vm-1'
+        r = asyncio.run(vm.power_on())
+    finally:
+        Container.task_poll_initial_delay = initial_delay
+    assert r.status_code == 202
+    assert statuses == []
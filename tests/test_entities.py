@@ -0,0 +1,36 @@
+# offline tests of entity hydration with a fake transport
+import re
+from yapyvcloud.yapyvcloud import Container, ClientContext, ApiError
+
+class Response(object):
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+class FakeTransport(object):
+    # GET of an href containing 'missing' returns 404, any other href its own url
+    def request(self, method, url, **kwargs):
+        return Response(404, b'not found') if 'missing' in url else Response(200, url.encode())
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+def container():
+    return Container('c', ClientContext('https://h/api', {}, 'org1', FakeTransport()))
+
+def test_get_entities_keeps_order():
+    hrefs = ['https://h/api/vApp/vm-%d' % i for i in range(20)]
+    assert container().get_entities(hrefs, workers=4) == [href.encode() for href in hrefs]
+
+def test_get_entities_raises_after_the_batch():
+    try:
+        container().get_entities(['https://h/api/vApp/vm-1', 'https://h/api/vApp/missing'])
+        assert False
+    except ApiError:
+        pass
+
+def test_get_entities_return_exceptions():
+    entities = container().get_entities(['https://h/api/vApp/vm-1', 'https://h/api/vApp/missing'], return_exceptions=True)
+    assert entities[0] == b'https://h/api/vApp/vm-1'
+    assert isinstance(entities[1], ApiError)
@@ -0,0 +1,50 @@
+# offline tests of the queued logging setup and the lazy yaml rendering of records
+import logging, threading
+from yapyvcloud import yapyvcloud
+from yapyvcloud.yapyvcloud import Container, RecordYaml, configure_logging, stop_logging
+
+class ListHandler(logging.Handler):
+    # keeps the formatted messages it emits
+    messages = []
+
+    def emit(self, record):
+        ListHandler.messages.append(self.format(record))
+
+def config(level):
+    return {'version':1,
+        'handlers':{'list':{'()':ListHandler, 'level':level}},
+        'root':{'handlers':('list',), 'level':'INFO'}}
+
+def setup_function(function):
+    ListHandler.messages = []
+    function.convertXml2Yaml = Container.convertXml2Yaml
+    function.threads = []
+    def convertXml2Yaml(in_xml):
+        function.threads.append(threading.current_thread().name)
+        return 'yaml'
+    Container.convertXml2Yaml = staticmethod(convertXml2Yaml)
+
+def teardown_function(function):
+    stop_logging()
+    Container.convertXml2Yaml = staticmethod(function.convertXml2Yaml)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(logging.WARNING)
+
+def test_records_below_every_handler_level_are_never_rendered():
+    configure_logging(config('WARNING'))
+    for i in range(3):
+        yapyvcloud.logger.info("record[%d]:\n%s", i, RecordYaml('<Record/>'))
+    stop_logging()
+    assert test_records_below_every_handler_level_are_never_rendered.threads == []
+    assert ListHandler.messages == []
+
+def test_records_are_rendered_on_the_listener_thread():
+    configure_logging(config('INFO'))
+    for i in range(3):
+        yapyvcloud.logger.info("record[%d]:\n%s", i, RecordYaml('<Record/>'))
+    stop_logging()
+    threads = test_records_are_rendered_on_the_listener_thread.threads
+    assert len(threads) == 3 and threading.current_thread().name not in threads
+    assert ListHandler.messages == ['record[%d]:\nyaml' % i for i in range(3)]
@@ -0,0 +1,92 @@
+# offline tests of the operation names the api primitives take from @operation_tag
+import os, tempfile
+import pytest
+from yapyvcloud.yapyvcloud import Container, ClientContext, Vm, Metrics, ApiError, operation_tag
+
+class Response(object):
+    def __init__(self, status_code, content=b''):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+class StatusTransport(object):
+    # answers every request with status_code
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def post(self, url, **kwargs):
+        return Response(self.status_code)
+
+    def delete(self, url, **kwargs):
+        return Response(self.status_code)
+
+    def put(self, url, **kwargs):
+        return Response(self.status_code)
+
+    def get(self, url, **kwargs):
+        return Response(200, b'<VAppTemplate xmlns="http://www.vmware.com/vcloud/v1.5"/>')
+
+class Fleet(Container):
+    @operation_tag
+    def power_on_all(self, vms):
+        return [vm.power_on() for vm in vms]
+
+    @operation_tag
+    def del_entry(self, href):
+        return self.api_delete(href)
+
+    @operation_tag
+    def get_all(self, hrefs):
+        return self.get_entities(hrefs, workers=2)
+
+    @operation_tag
+    def add_media(self, file_path):
+        return self.upload_file('https://h/api/media/1', 'https://t/transfer/1/media.iso', file_path, streams=2, part_size=10)
+
+def vm(status_code):
+    context = ClientContext('https://h/api', {}, 'o', StatusTransport(status_code))
+    return Vm('vm1', Container('vapp1', context), href='https://h/api/vApp/vm-1')
+
+def teardown_function(function):
+    Container.metrics = None
+
+def test_primitive_errors_name_the_operation():
+    with pytest.raises(ApiError) as error:
+        vm(500).power_on()
+    assert error.value.args[0] == 'vm1 power_on'
+    with pytest.raises(ApiError) as error:
+        vm(500).api_delete('https://h/api/vApp/vm-1/metadata/k', target_name='k')
+    assert error.value.args[0] == 'vm1  k'
+
+def test_nested_operations_keep_the_outermost():
+    with pytest.raises(ApiError) as error:
+        Fleet('fleet', ClientContext()).power_on_all([vm(500)])
+    assert error.value.args[0] == 'vm1 power_on_all'
+    assert Metrics.operation() == ''
+
+def test_metrics_label_the_primitive_with_the_operation():
+    Container.metrics = Metrics()
+    Fleet('fleet', ClientContext('https://h/api', {}, 'o', StatusTransport(204))).del_entry('https://h/api/entry/1')
+    labels = [sample['labels'] for sample in Container.metrics.snapshot()['yapyvcloud_operation_seconds']]
+    assert labels == [{'operation':'del_entry', 'method':'DELETE'}]
+
+def test_pool_workers_keep_the_operation():
+    Container.metrics = Metrics()
+    Fleet('fleet', ClientContext('https://h/api', {}, 'o', StatusTransport(200))).get_all(['https://h/api/entry/%d' % i for i in range(4)])
+    labels = [sample['labels'] for sample in Container.metrics.snapshot()['yapyvcloud_operation_seconds']]
+    assert labels == [{'operation':'get_all', 'method':'GET'}]
+    assert Metrics.operation() == ''
+
+def test_upload_streams_keep_the_operation():
+    retry_backoff = Container.retry_backoff
+    Container.retry_backoff = 0
+    file = tempfile.NamedTemporaryFile(delete=False)
+    file.write(b'x' * 40)
+    file.close()
+    try:
+        with pytest.raises(ApiError) as error:
+            Fleet('fleet', ClientContext('https://h/api', {}, 'o', StatusTransport(500))).add_media(file.name)
+    finally:
+        Container.retry_backoff = retry_backoff
+        os.remove(file.name)
+    assert error.value.args[0] == 'add_media ' + file.name
@@ -0,0 +1,98 @@
+# offline tests of the edge gateway and vApp network payloads edited on the lxml tree
+from lxml import etree
+from yapyvcloud.yapyvcloud import Container, ClientContext, EdgeGateway, Vapp
+
+NS = 'http://www.vmware.com/vcloud/v1.5'
+
+EDGE_GATEWAY = ('<EdgeGateway xmlns="%s" name="edge"><Configuration><EdgeGatewayServiceConfiguration>'
+    '<GatewayDhcpService><IsEnabled>true</IsEnabled>'
+    '<Pool><IsEnabled>true</IsEnabled><LowIpAddress>10.0.0.10</LowIpAddress><HighIpAddress>10.0.0.19</HighIpAddress></Pool>'
+    '<Pool><IsEnabled>true</IsEnabled><LowIpAddress>10.0.1.10</LowIpAddress><HighIpAddress>10.0.1.19</HighIpAddress></Pool>'
+    '</GatewayDhcpService>'
+    '<FirewallService><IsEnabled>true</IsEnabled><DefaultAction>drop</DefaultAction><LogDefaultAction>false</LogDefaultAction></FirewallService>'
+    '</EdgeGatewayServiceConfiguration></Configuration></EdgeGateway>' % NS).encode()
+
+NETWORK_CONFIG_SECTION = ('<NetworkConfigSection xmlns="%s"><NetworkConfig networkName="net1"><Configuration>'
+    '<IpScopes><IpScope><IpRanges><IpRange><StartAddress>10.0.0.10</StartAddress><EndAddress>10.0.0.19</EndAddress></IpRange></IpRanges></IpScope></IpScopes>'
+    '<FenceMode>natRouted</FenceMode><Features><FirewallService><IsEnabled>true</IsEnabled>'
+    '<FirewallRule><Description>first</Description></FirewallRule></FirewallService></Features>'
+    '</Configuration></NetworkConfig></NetworkConfigSection>' % NS).encode()
+
+class Response(object):
+    def __init__(self, status_code, content=b''):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+class EntityTransport(object):
+    # serves content on every GET, records the bodies POSTed or PUT
+    def __init__(self, content):
+        self.content = content
+        self.bodies = []
+
+    def get(self, url, **kwargs):
+        return Response(200, self.content)
+
+    def post(self, url, **kwargs):
+        self.bodies.append(etree.fromstring(kwargs['data']))
+        return Response(202)
+
+    def put(self, url, **kwargs):
+        self.bodies.append(etree.fromstring(kwargs['data']))
+        return Response(202)
+
+def edge_gateway():
+    transport = EntityTransport(EDGE_GATEWAY)
+    context = ClientContext('https://h/api', {}, 'org1', transport)
+    return EdgeGateway('edge', Container('vdc1', context), href='https://h/api/admin/edgeGateway/1'), transport
+
+def vapp():
+    transport = EntityTransport(NETWORK_CONFIG_SECTION)
+    return Vapp('vapp1', ClientContext('https://h/api', {}, 'org1', transport), href='https://h/api/vApp/vapp-1'), transport
+
+def texts(body, path):
+    return [element.text for element in body.iterfind('/'.join('{%s}%s' % (NS, step) for step in path.split('/')))]
+
+def test_set_nat_adds_an_enabled_service():
+    gateway, transport = edge_gateway()
+    gateway.set_nat(True)
+    body, = transport.bodies
+    assert body.tag == '{%s}EdgeGatewayServiceConfiguration' % NS
+    assert texts(body, 'NatService/IsEnabled') == ['true']
+
+def test_del_dhcp_pool_keeps_the_others():
+    gateway, transport = edge_gateway()
+    gateway.del_dhcp_pool(0)
+    body, = transport.bodies
+    assert texts(body, 'GatewayDhcpService/Pool/LowIpAddress') == ['10.0.1.10']
+
+def test_set_firewall_edits_only_given_options():
+    gateway, transport = edge_gateway()
+    gateway.set_firewall(default_action='allow', log_default_action=True)
+    body, = transport.bodies
+    assert texts(body, 'FirewallService/IsEnabled') == ['true']
+    assert texts(body, 'FirewallService/DefaultAction') == ['allow']
+    assert texts(body, 'FirewallService/LogDefaultAction') == ['true']
+
+def test_add_network_firewall_rule_inserts_at_index():
+    vapp1, transport = vapp()
+    vapp1.add_network_firewall_rule('net1', 0, rule_name='new', dest_port='22', dest_ip='Any', source_port='Any', source_ip='Any')
+    body, = transport.bodies
+    rules = 'NetworkConfig/Configuration/Features/FirewallService/FirewallRule'
+    assert texts(body, rules + '/Description') == ['new', 'first']
+    assert texts(body, rules + '/Protocols/Tcp') == ['true']
+
+def test_set_network_dhcp_creates_the_service():
+    vapp1, transport = vapp()
+    vapp1.set_network_dhcp('net1', iprange_start='10.0.0.20', iprange_end='10.0.0.29')
+    body, = transport.bodies
+    dhcp = 'NetworkConfig/Configuration/Features/DhcpService'
+    assert texts(body, dhcp + '/IsEnabled') == ['true']
+    assert texts(body, dhcp + '/IpRange/StartAddress') == ['10.0.0.20']
+    assert texts(body, 'NetworkConfig/Configuration/IpScopes/IpScope/IpRanges/IpRange/StartAddress') == ['10.0.0.10']
+
+def test_add_network_static_route_creates_the_service():
+    vapp1, transport = vapp()
+    vapp1.add_network_static_route('net1', subnet='192.168.0.0/24', next_hop_ip='10.0.0.1')
+    body, = transport.bodies
+    assert texts(body, 'NetworkConfig/Configuration/Features/StaticRoutingService/StaticRoute/NextHopIp') == ['10.0.0.1']
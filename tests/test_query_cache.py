@@ -0,0 +1,106 @@
+# offline tests of the query cache and its invalidation rules
+import re
+from yapyvcloud.yapyvcloud import Container, ClientContext, QueryCache, XmlResponse
+
+NS = 'http://www.vmware.com/vcloud/v1.5'
+
+class Response(object):
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+class FakeTransport(object):
+    # query GETs return one VMRecord of vApp vapp-1, DELETE returns a task
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        if method == 'DELETE':
+            return Response(202, ('<Task xmlns="%s" href="https://h/api/task/1" type="application/vnd.vmware.vcloud.task+xml" status="running"/>' % NS).encode())
+        return Response(200, ('<QueryResultRecords xmlns="%s" total="1" pageSize="25" page="1">'
+            '<VMRecord name="vm1" href="https://h/api/vApp/vm-1" container="https://h/api/vApp/vapp-1"/></QueryResultRecords>' % NS).encode())
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+def records(*hrefs):
+    content = '<QueryResultRecords xmlns="%s">%s</QueryResultRecords>' % (NS, ''.join('<VMRecord name="vm" href="%s"/>' % href for href in hrefs))
+    return XmlResponse(content.encode()).records('VMRecord')
+
+def setup_cache(**kwargs):
+    Container.query_cache = QueryCache(**kwargs)
+    return Container.query_cache
+
+def teardown_function(function):
+    Container.query_cache = None
+
+def test_entity_path():
+    assert QueryCache.entity_path('https://h/api/vApp/vm-1') == '/vApp/vm-1'
+    assert QueryCache.entity_path('https://h/api/admin/vdc/1/action/x') == '/vdc/1'
+    assert QueryCache.entity_path('https://h/api/admin/extension/providervdc/2') == '/providervdc/2'
+    assert QueryCache.entity_path('https://h/other') == 'https://h/other'
+
+def test_ttl_per_record_type_and_lru():
+    cache = setup_cache(max_entries=2, ttl=60, ttls={'task':0})
+    cache.put(('task', 'TaskRecord', ''), records('https://h/api/task/1'))
+    assert cache.get(('task', 'TaskRecord', '')) == None
+    cache.put(('vm', 'VMRecord', 'a'), records())
+    cache.put(('vm', 'VMRecord', 'b'), records())
+    cache.get(('vm', 'VMRecord', 'a'))
+    cache.put(('vm', 'VMRecord', 'c'), records())
+    assert cache.get(('vm', 'VMRecord', 'b')) == None
+    assert cache.get(('vm', 'VMRecord', 'a')) == []
+    assert cache.stats()['evictions'] == 1
+
+def test_invalidate_rules():
+    cache = setup_cache(ttl=60)
+    cache.put(('vm', 'VMRecord', 'container==https://h/api/vApp/vapp-1'), records('https://h/api/vApp/vm-1'))
+    cache.put(('vm', 'VMRecord', 'name==other'), records('https://h/api/vApp/vm-2'))
+    cache.put(('vm', 'VMRecord', 'name==vm3'), records('https://h/api/vApp/vm-3'))
+    cache.put(('vm', 'VMRecord', 'name==vm4'), records('https://h/api/vApp/vm-4/section'))
+    cache.put(('vm', 'VMRecord', ''), records('https://h/api/vApp/vm-2'))
+    cache.put(('vm', 'VMRecord', 'name==missing'), records())
+    # filter mentions the entity, unfiltered and empty results go, unrelated filtered results stay
+    cache.invalidate('https://h/api/admin/vApp/vapp-1/action/x')
+    assert cache.get(('vm', 'VMRecord', 'container==https://h/api/vApp/vapp-1')) == None
+    assert cache.get(('vm', 'VMRecord', '')) == None
+    assert cache.get(('vm', 'VMRecord', 'name==missing')) == None
+    assert len(cache.get(('vm', 'VMRecord', 'name==other'))) == 1
+    # records referencing the entity, or one of its sub-resources, go
+    cache.invalidate('https://h/api/vApp/vm-3')
+    cache.invalidate('https://h/api/vApp/vm-4')
+    assert cache.get(('vm', 'VMRecord', 'name==vm3')) == None
+    assert cache.get(('vm', 'VMRecord', 'name==vm4')) == None
+    assert len(cache.get(('vm', 'VMRecord', 'name==other'))) == 1
+
+def test_get_record_hits_across_equal_contexts():
+    cache = setup_cache(ttl=60)
+    transport = FakeTransport()
+    context = ClientContext('https://h/api', {'Accept':'application/*+xml;version=27.0'}, 'org1', transport)
+    for i in range(2):
+        # a fresh but equal context per call, as role_template_org() derives one
+        container = Container('c', context.with_headers({'Accept':'application/*+xml;version=9.0'}))
+        assert container.get_record('vm', 'VMRecord', 'name==vm1', show=False)[0]['name'] == 'vm1'
+    assert len(transport.calls) == 1
+    assert cache.stats()['hits'] == 1
+    other = Container('c', context.with_headers({'x-vcloud-authorization':'other'}))
+    other.get_record('vm', 'VMRecord', 'name==vm1', show=False)
+    assert len(transport.calls) == 2
+
+def test_wait_false_invalidates_again_when_the_task_is_done():
+    cache = setup_cache(ttl=60)
+    transport = FakeTransport()
+    container = Container('c', ClientContext('https://h/api', {}, 'org1', transport))
+    key = ('vm', 'VMRecord', 'container==https://h/api/vApp/vapp-1', False, container.context)
+    cache.put(key, records('https://h/api/vApp/vm-1'))
+    future = container.api_delete('https://h/api/vApp/vapp-1', 'del_vapp', 'vapp1', wait=False)
+    assert cache.get(key) == None
+    # a query while the task runs caches the entity as it was
+    cache.put(key, records('https://h/api/vApp/vm-1'))
+    future.update('success')
+    assert cache.get(key) == None
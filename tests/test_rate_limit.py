@@ -0,0 +1,119 @@
+# offline tests of TokenBucket, RateLimiter and the slots taken by the sync and asyncio clients
+import asyncio, os, tempfile, threading, time
+from concurrent import futures
+import pytest
+from yapyvcloud.yapyvcloud import Container, ClientContext, TokenBucket, RateLimiter
+from yapyvcloud.aio import AsyncResponse, AsyncContainer
+
+class Response(object):
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.content = b''
+        self.headers = {}
+
+class InFlightTransport(object):
+    # answers every request with status_code and records the limiter's in-flight counts while it is sent
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.in_flight = []
+
+    def record(self):
+        self.in_flight.append(dict((key, value) for key, value in Container.rate_limiter.stats().items() if key.startswith('in_flight')))
+
+    def put(self, url, **kwargs):
+        self.record()
+        return Response(self.status_code)
+
+    async def get(self, url, **kwargs):
+        self.record()
+        return AsyncResponse(self.status_code, b'', {})
+
+def teardown_function(function):
+    Container.rate_limiter = None
+
+def test_token_bucket_bursts_then_spaces_tokens():
+    bucket = TokenBucket(10, 3)
+    assert [bucket.reserve() for i in range(3)] == [0, 0, 0]
+    assert 0.09 < bucket.reserve() <= 0.1
+    assert 0.19 < bucket.reserve() <= 0.2
+
+def test_configure_most_specific_wins():
+    limiter = RateLimiter()
+    limiter.configure('read', org='o', concurrency=2)
+    limiter.configure('read', host='h', org='o', concurrency=1)
+    assert limiter.limit('h', 'o', 'read').concurrency == 1
+    assert limiter.limit('x', 'o', 'read').concurrency == 2
+    assert limiter.limit('x', 'p', 'read').concurrency == Container.read_concurrency
+    assert limiter.limit('x', 'p', 'transfer').concurrency == Container.transfer_concurrency
+    with pytest.raises(ValueError):
+        limiter.configure('write', concurrency=1)
+
+def test_concurrency_cap_waits_for_release():
+    limiter = RateLimiter()
+    limiter.configure('read', rate=0, concurrency=1)
+    slot = limiter.acquire('https://h/api/vApp/1', 'o', 'read')
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(limiter.acquire('https://h/api/vApp/2', 'o', 'read')))
+    waiter.start()
+    waiter.join(0.2)
+    assert acquired == []
+    slot.release()
+    waiter.join(5)
+    assert len(acquired) == 1
+    assert limiter.stats()['read_concurrency_waits'] >= 1
+    acquired[0].release()
+    assert limiter.stats()['in_flight h o read'] == 0
+
+def test_held_slot_is_released_with_its_future():
+    limiter = RateLimiter()
+    future = futures.Future()
+    with limiter.acquire('https://h/api/vApp/1', 'o', 'task') as slot:
+        slot.hold(future)
+    assert limiter.stats()['in_flight h o task'] == 1
+    future.set_result(None)
+    assert limiter.stats()['in_flight h o task'] == 0
+
+def test_upload_part_takes_a_transfer_slot():
+    Container.rate_limiter = RateLimiter()
+    transport = InFlightTransport()
+    container = Container('c', ClientContext('https://h/api', {}, 'o', transport))
+    file = tempfile.NamedTemporaryFile(delete=False)
+    file.write(b'x' * 100)
+    file.close()
+    try:
+        container.upload_part('https://t/transfer/1/disk.vmdk', file.name, 0, 100, 100)
+    finally:
+        os.remove(file.name)
+    assert transport.in_flight == [{'in_flight t o transfer': 1}]
+    assert Container.rate_limiter.stats()['in_flight t o transfer'] == 0
+
+def test_async_get_waits_for_a_sync_slot():
+    Container.rate_limiter = RateLimiter()
+    Container.rate_limiter.configure('read', rate=0, concurrency=1)
+    transport = InFlightTransport()
+    container = AsyncContainer('c', ClientContext('https://h/api', {}, 'o', transport))
+    slot = Container.rate_limiter.acquire('https://h/api/vApp/1', 'o', 'read')
+    async def get():
+        asyncio.get_event_loop().call_later(0.2, slot.release)
+        start = time.time()
+        await container.api_get('https://h/api/vApp/2')
+        return time.time() - start
+    assert asyncio.run(get()) >= 0.2
+    assert transport.in_flight == [{'in_flight h o read': 1}]
+    assert Container.rate_limiter.stats()['read_concurrency_waits'] == 1
+    assert Container.rate_limiter.stats()['in_flight h o read'] == 0
+
+def test_async_task_slot_is_held_by_its_asyncio_future():
+    Container.rate_limiter = RateLimiter()
+    container = AsyncContainer('c', ClientContext('https://h/api', {}, 'o', InFlightTransport()))
+    async def post():
+        slot = await container.request_slot('https://h/api/vApp/1/power/action/powerOn', 'task')
+        future = asyncio.get_event_loop().create_future()
+        with slot:
+            slot.hold(future)
+        held = Container.rate_limiter.stats()['in_flight h o task']
+        future.set_result(None)
+        await asyncio.sleep(0)
+        return held
+    assert asyncio.run(post()) == 1
+    assert Container.rate_limiter.stats()['in_flight h o task'] == 0
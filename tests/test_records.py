@@ -0,0 +1,46 @@
+# offline tests of compact query records
+import pickle
+from lxml import etree
+from yapyvcloud.yapyvcloud import Container, Record, XmlResponse
+
+NS = 'http://www.vmware.com/vcloud/v1.5'
+
+def records(tag, rows):
+    content = '<QueryResultRecords xmlns="%s">%s</QueryResultRecords>' % (NS,
+        ''.join('<%s %s/>' % (tag, ' '.join('%s="%s"' % item for item in sorted(row.items()))) for row in rows))
+    return XmlResponse(content.encode()).records(tag, compact=True)
+
+def test_known_tag_keeps_schema_fields():
+    record = records('VMRecord', [{'name':'vm1', 'href':'https://h/api/vApp/vm-1', 'unlisted':'x'}])[0]
+    assert record['name'] == 'vm1'
+    assert record.get('unlisted') == None
+    assert set(record.__slots__) == set(Container.record_fields['VMRecord'])
+
+def test_unknown_tag_empty_page_does_not_fix_schema():
+    assert records('VirtualCenterRecord', []) == []
+    record = records('VirtualCenterRecord', [{'name':'vc1', 'href':'https://h/api/admin/extension/vimServer/1'}])[0]
+    assert record['href'] == 'https://h/api/admin/extension/vimServer/1'
+
+def test_unknown_tag_keeps_attributes_of_later_pages():
+    first = records('VMWProviderVdcRecord', [{'name':'pvdc1', 'href':'https://h/pvdc/1'}])[0]
+    later = records('VMWProviderVdcRecord', [{'name':'pvdc2', 'href':'https://h/pvdc/2', 'description':'gold'}])[0]
+    assert first['name'] == 'pvdc1' and first.get('description') == None
+    assert later['description'] == 'gold'
+
+def test_records_are_read_only_and_picklable():
+    record = records('VMWProviderVdcRecord', [{'name':'pvdc1', 'status':'READY'}])[0]
+    try:
+        record.name = 'other'
+        assert False
+    except AttributeError:
+        pass
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert record.attrs == {'name':'pvdc1', 'status':'READY'}
+
+def test_missing_field_raises_key_error():
+    record = records('VMWProviderVdcRecord', [{'name':'pvdc1'}])[0]
+    try:
+        record['href']
+        assert False
+    except KeyError:
+        pass
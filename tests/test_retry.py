@@ -0,0 +1,121 @@
+# offline tests of the retry policy, circuit breaker and transport retries with a fake session
+import time
+import requests
+from email.utils import formatdate
+from yapyvcloud.yapyvcloud import CircuitBreaker, RetryPolicy, Transport, ApiError
+
+class Response(object):
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b''
+
+    def close(self):
+        pass
+
+class FakeSession(object):
+    # answers requests from a script of status codes or exceptions
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Response(outcome)
+
+def policy(**kwargs):
+    settings = dict(retries=3, backoff=0.001, max_backoff=0.004, jitter=0, max_retry_after=0.01, breaker_threshold=0, breaker_reset_timeout=0.05)
+    settings.update(kwargs)
+    return RetryPolicy(**settings)
+
+def transport(script, **kwargs):
+    t = Transport(retry_policy=policy(**kwargs))
+    t.session = FakeSession(script)
+    return t
+
+def test_backoff_doubles_up_to_max():
+    p = policy()
+    assert [p.retry_delay('GET', attempt) for attempt in range(3)] == [0.001, 0.002, 0.004]
+    assert p.retry_delay('GET', 3) == None
+    assert policy(max_backoff=0.002).retry_delay('GET', 2) == 0.002
+
+def test_statuses_and_methods():
+    p = policy()
+    assert p.retry_delay('GET', 0, Response(503)) != None
+    assert p.retry_delay('GET', 0, Response(404)) == None
+    assert p.retry_delay('POST', 0, Response(503)) == None
+    assert p.retry_delay('POST', 0, Response(429)) != None
+    assert p.retry_delay('POST', 0) == None
+    assert p.retry_delay('GET', 0, Response(503), replayable=False) == None
+
+def test_retry_after():
+    p = policy(max_retry_after=30)
+    assert p.retry_delay('GET', 0, Response(429, {'Retry-After':'7'})) == 7
+    assert 0 <= p.retry_delay('GET', 0, Response(503, {'Retry-After':formatdate(time.time() + 5, usegmt=True)})) <= 5
+    assert policy(max_retry_after=2).retry_delay('GET', 0, Response(429, {'Retry-After':'60'})) == 2
+    assert p.stats()['retry_after'] == 2
+
+def test_replayable():
+    assert RetryPolicy.replayable(None) and RetryPolicy.replayable(b'<x/>') and RetryPolicy.replayable({'a':1})
+    assert not RetryPolicy.replayable(iter([b'x']))
+
+def test_transport_retries_get_until_success():
+    t = transport([503, 502, 200])
+    assert t.get('https://h/api/vApp/vm-1').status_code == 200
+    assert len(t.session.calls) == 3
+    assert t.retry_policy.stats()['retries'] == 2
+
+def test_transport_does_not_retry_post_or_streamed_bodies():
+    t = transport([503, 200])
+    assert t.post('https://h/api/vApp/vm-1/action/deploy').status_code == 503
+    t = transport([503, 200])
+    assert t.put('https://h/transfer/1', data=iter([b'x'])).status_code == 503
+    assert len(t.session.calls) == 1
+
+def test_transport_connection_errors():
+    t = transport([requests.exceptions.ConnectionError('reset'), 200])
+    assert t.get('https://h/api/org').status_code == 200
+    t = transport([requests.exceptions.ConnectionError('reset')] * 4)
+    try:
+        t.get('https://h/api/org')
+        assert False
+    except requests.exceptions.ConnectionError:
+        pass
+    assert len(t.session.calls) == 4
+    t = transport([requests.exceptions.ConnectionError('reset'), 200])
+    try:
+        t.post('https://h/api/sessions')
+        assert False
+    except requests.exceptions.ConnectionError:
+        pass
+
+def test_breaker_states():
+    breaker = CircuitBreaker(2, 0.05)
+    assert breaker.allow()
+    assert not breaker.failure()
+    assert breaker.failure()            # opens
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()              # half open, one probe
+    assert not breaker.allow()          # others wait for it
+    breaker.success()
+    assert breaker.allow() and breaker.failures == 0
+
+def test_transport_breaker_rejects_while_open():
+    t = transport([503, 503, 200, 200], retries=0, breaker_threshold=2)
+    assert t.get('https://h/api/org').status_code == 503
+    assert t.get('https://h/api/org').status_code == 503
+    try:
+        t.get('https://h/api/org')
+        assert False
+    except ApiError as e:
+        assert e.args[1] == 'circuit open'
+    # other hosts have their own breaker
+    assert t.get('https://other/api/org').status_code == 200
+    time.sleep(0.06)
+    assert t.get('https://h/api/org').status_code == 200
+    assert t.retry_policy.stats()['breaker_opened'] == 1
+    assert t.retry_policy.stats()['breaker_rejected'] == 1
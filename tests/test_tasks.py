@@ -0,0 +1,172 @@
+# offline tests of TaskFuture and TaskMonitor with a fake transport
+import re, time
+from concurrent import futures
+import pytest
+from yapyvcloud.yapyvcloud import Container, ClientContext, TaskFuture, TaskPoller, TaskMonitor, ApiError
+
+NS = 'http://www.vmware.com/vcloud/v1.5'
+
+class Response(object):
+    def __init__(self, status_code, content=b''):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+class TaskTransport(object):
+    # serves tasks by href, each GET or task query moves a task to its next queued status, cancel moves it to canceled
+    # the task query only returns the hrefs in visible, None shows all
+    def __init__(self, statuses, visible=None):
+        self.statuses = statuses
+        self.visible = visible
+        self.gets = []
+        self.queries = []
+
+    def status(self, task_href):
+        statuses = self.statuses[task_href]
+        return statuses.pop(0) if len(statuses) > 1 else statuses[0]
+
+    def task(self, task_href):
+        return ('<Task xmlns="%s" href="%s" status="%s" operationName="vappDeploy"><Owner name="vm1"/></Task>' % (NS, task_href, self.status(task_href))).encode()
+
+    def query(self, url):
+        task_hrefs = [task_href for task_href in re.findall(r'href==([^,)]+)', url) if self.visible == None or task_href in self.visible]
+        self.queries.append(task_hrefs)
+        records = ''.join('<TaskRecord href="%s" status="%s" name="vappDeploy" objectName="vm1"/>' % (task_href, self.status(task_href)) for task_href in task_hrefs)
+        return ('<QueryResultRecords xmlns="%s">%s</QueryResultRecords>' % (NS, records)).encode()
+
+    def get(self, url, **kwargs):
+        if '/query?type=task' in url:
+            return Response(200, self.query(url))
+        self.gets.append(url)
+        return Response(200, self.task(url))
+
+    def post(self, url, **kwargs):
+        task_href = re.sub('/action/cancel$', '', url)
+        self.statuses[task_href] = ['canceled']
+        return Response(204)
+
+def task_future(statuses, visible=None, host='h'):
+    transport = TaskTransport(dict(('https://%s/api/task/%d' % (host, i), task_statuses) for i, task_statuses in enumerate(statuses)), visible)
+    container = Container('vm1', ClientContext('https://%s/api' % host, {}, 'org1', transport))
+    response = Response(202)
+    return [TaskFuture(container, 'https://%s/api/task/%d' % (host, i), response, 'power_on') for i in range(len(statuses))], transport, response
+
+def setup_function(function):
+    Container.task_poll_initial_delay = 0.001
+
+def teardown_function(function):
+    Container.task_poll_initial_delay = 0.5
+    Container.task_monitor = None
+
+def test_success_returns_the_response():
+    (future,), transport, response = task_future([['queued', 'running', 'success']])
+    assert future.result() is response
+    assert future.done() and not future.running()
+    assert len(transport.gets) == 3
+
+def test_error_status_raises():
+    (future,), transport, response = task_future([['running', 'error']])
+    with pytest.raises(ApiError) as error:
+        future.result()
+    assert error.value.args[:2] == ('vappDeploy vm1', 'error')
+
+def test_task_without_href_is_done():
+    container = Container('vm1', ClientContext('https://h/api', {}, 'org1', TaskTransport({})))
+    future = TaskFuture(container, None, Response(204), 'power_on')
+    assert future.done() and future.result().status_code == 204
+
+def test_cancelled_future_is_done_for_wait_all():
+    (future, other), transport, response = task_future([['running'], ['running', 'success']])
+    assert future.cancel()
+    assert future.cancelled()
+    done, not_done = TaskFuture.wait_all([future, other], timeout=5)
+    assert done == set([future, other]) and not_done == set()
+    assert futures.wait([future], 0).done == set([future])
+
+def test_canceled_status_is_done_for_wait_all():
+    (future,), transport, response = task_future([['running', 'canceled']])
+    done, not_done = TaskFuture.wait_all([future], timeout=5)
+    assert done == set([future]) and future.cancelled()
+
+def test_wait_all_times_out_on_pending_tasks():
+    (future,), transport, response = task_future([['running']])
+    done, not_done = TaskFuture.wait_all([future], poller=TaskPoller(initial_delay=0.01, jitter=0, timeout=0.1))
+    assert done == set() and not_done == set([future])
+
+def test_callbacks_fire_once_done():
+    (succeeded, failed, cancelled), transport, response = task_future([['success'], ['error'], ['running']])
+    calls = []
+    for future in (succeeded, failed, cancelled):
+        future.add_done_callback(calls.append)
+    cancelled.cancel()
+    TaskFuture.wait_all([succeeded, failed, cancelled], timeout=5)
+    assert sorted(calls, key=id) == sorted([succeeded, failed, cancelled], key=id)
+
+def watched(monitor, task_futures):
+    # watches futures created without a monitor, all before its first poll
+    with monitor.lock:
+        for task_future in task_futures:
+            task_future.monitor = monitor
+            monitor.watched[task_future.task_href] = task_future
+    monitor.watch(task_futures[0])
+    return task_futures
+
+def test_monitor_queries_tasks_in_batches():
+    monitor = TaskMonitor(interval=0.01, batch_size=2)
+    task_futures, transport, response = task_future([['success']] * 5)
+    done, not_done = TaskFuture.wait_all(watched(monitor, task_futures), timeout=5)
+    assert len(done) == 5 and all(future.result() is response for future in done)
+    assert [len(task_hrefs) for task_hrefs in transport.queries] == [2, 2, 1]
+    assert transport.gets == []
+    assert monitor.watched == {}
+
+def test_monitor_queries_each_context_apart():
+    monitor = TaskMonitor(interval=0.01, batch_size=10)
+    first, first_transport, response = task_future([['success']] * 2, host='h1')
+    second, second_transport, response = task_future([['success']] * 2, host='h2')
+    done, not_done = TaskFuture.wait_all(watched(monitor, first + second), timeout=5)
+    assert len(done) == 4
+    assert [len(task_hrefs) for task_hrefs in first_transport.queries] == [2]
+    assert [len(task_hrefs) for task_hrefs in second_transport.queries] == [2]
+
+def test_monitor_refreshes_tasks_missing_from_the_query():
+    monitor = TaskMonitor(interval=0.01)
+    task_futures, transport, response = task_future([['success'], ['running', 'success']], visible=['https://h/api/task/0'])
+    done, not_done = TaskFuture.wait_all(watched(monitor, task_futures), timeout=5)
+    assert len(done) == 2
+    assert transport.queries[0] == ['https://h/api/task/0']
+    assert transport.gets == ['https://h/api/task/1'] * 2
+
+def test_monitor_drops_completed_futures():
+    monitor = TaskMonitor(interval=0.01)
+    (finished, pending), transport, response = task_future([['success'], ['running']])
+    watched(monitor, [finished, pending])
+    finished.result(timeout=5)
+    time.sleep(0.05)
+    assert list(monitor.watched) == ['https://h/api/task/1']
+    assert all(task_hrefs == ['https://h/api/task/1'] for task_hrefs in transport.queries[1:])
+    monitor.close()
+
+def test_monitor_thread_exits_and_restarts():
+    monitor = TaskMonitor(interval=0.01)
+    Container.task_monitor = monitor
+    (first,), transport, response = task_future([['success']])
+    thread = monitor.thread
+    first.result(timeout=5)
+    thread.join(5)
+    assert not thread.is_alive() and monitor.thread == None
+    (second,), transport, response = task_future([['running', 'success']])
+    assert monitor.thread != None and monitor.thread is not thread
+    assert second.result(timeout=5) is response
+    monitor.close()
+    with pytest.raises(RuntimeError):
+        monitor.watch(second)
+
+def test_closed_monitor_hands_futures_back():
+    monitor = TaskMonitor(interval=60)
+    Container.task_monitor = monitor
+    (future,), transport, response = task_future([['running', 'success']])
+    assert future.monitor is monitor
+    monitor.close()
+    assert future.monitor == None
+    assert future.result(timeout=5) is response
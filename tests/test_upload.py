@@ -0,0 +1,241 @@
+# offline upload tests against a local http server
+import os, re, tempfile, threading, time, json
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+import pytest
+import requests
+from yapyvcloud.yapyvcloud import Container, ClientContext, Transport, FileSlice, TransferJournal, ApiError
+
+class TransferHandler(BaseHTTPRequestHandler):
+    # stores PUT bodies by path and Content-Range, failing a range with the statuses queued in server.failures,
+    # None drops the connection instead and 'slow' drops it after server.delay seconds
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        key = (self.path, self.headers.get('Content-Range'))
+        with self.server.lock:
+            self.server.puts.append(key)
+            failures = self.server.failures.get(key)
+            failure = failures.pop(0) if failures else 200
+            if failure == 200:
+                self.server.received[key] = body
+        if failure == 'slow':
+            time.sleep(self.server.delay)
+        if failure in (None, 'slow'):
+            self.close_connection = True
+            return
+        self.send_response(failure)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        # serves server.files, honouring Range: bytes=N-, and breaks off after server.cut bytes once
+        # a callable file is called for its content
+        content = self.server.files[self.path]
+        content = content() if callable(content) else content
+        start = int(re.match(r'bytes=(\d+)-', self.headers['Range']).group(1)) if 'Range' in self.headers else 0
+        if 'Range' in self.headers and self.server.range_start != None:
+            start = self.server.range_start
+        with self.server.lock:
+            self.server.ranges.append(self.headers.get('Range'))
+            cut, self.server.cut = self.server.cut, None
+        self.send_response(206 if 'Range' in self.headers else 200)
+        self.send_header('Content-Length', str(len(content) - start))
+        if 'Range' in self.headers:
+            self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, len(content) - 1, len(content)))
+        self.end_headers()
+        self.wfile.write(content[start:start + cut] if cut != None else content[start:])
+
+    def log_message(self, *args):
+        pass
+
+class TransferServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), TransferHandler)
+        self.lock = threading.Lock()
+        self.received = {}
+        self.puts = []
+        self.failures = {}
+        self.files = {}
+        self.ranges = []
+        self.cut = None
+        self.range_start = None
+        self.delay = 1
+        self.url = 'http://127.0.0.1:%d' % self.server_address[1]
+        threading.Thread(target=self.serve_forever).start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def source_file(size):
+    file = tempfile.NamedTemporaryFile(delete=False)
+    file.write(os.urandom(size))
+    file.close()
+    return file.name
+
+def put_slices(mapped):
+    upload_mmap = Container.upload_mmap
+    Container.upload_mmap = mapped
+    server = TransferServer()
+    file_path = source_file(300000)
+    try:
+        data = open(file_path, 'rb').read()
+        for start, end in ((0, 300000), (1000, 250001), (299999, 300000)):
+            r = requests.put(server.url + '/slice', data=FileSlice(file_path, start, end, chunksize=4096))
+            assert r.status_code == 200
+            assert server.received[('/slice', None)] == data[start:end]
+    finally:
+        Container.upload_mmap = upload_mmap
+        server.stop()
+        os.remove(file_path)
+
+def test_put_file_slice_mmap():
+    put_slices(True)
+
+def test_put_file_slice_readinto():
+    put_slices(False)
+
+def journaled_container(journal_path):
+    Container.journal_path = journal_path
+    Container.journal_interval = 100000
+    TransferJournal.journals.clear()
+    return Container('c', ClientContext('http://127.0.0.1', {}, 'org1', Transport(retry_policy=None)))
+
+def download_setup():
+    server = TransferServer()
+    server.files['/disk.vmdk'] = os.urandom(1000000)
+    directory = tempfile.mkdtemp()
+    return server, directory, os.path.join(directory, 'disk.vmdk'), os.path.join(directory, 'journal.json')
+
+def download_teardown(server, directory):
+    Container.journal_path = None
+    Container.journal_interval = 64*1024*1024
+    TransferJournal.journals.clear()
+    server.stop()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+def test_download_resumes_after_restart():
+    server, directory, file_path, journal_path = download_setup()
+    try:
+        server.cut = 700000
+        container = journaled_container(journal_path)
+        assert not container.download_file(server.url + '/disk.vmdk', file_path)
+        ranges = list(json.load(open(journal_path)).values())[0]['ranges']
+        assert ranges[-1][1] <= 700000
+        # a new process: the journal is read back from disk
+        container = journaled_container(journal_path)
+        assert container.download_file(server.url + '/disk.vmdk', file_path)
+        assert server.ranges == [None, 'bytes=%d-' % ranges[-1][1]]
+        assert open(file_path, 'rb').read() == server.files['/disk.vmdk']
+        assert not os.path.exists(journal_path)
+    finally:
+        download_teardown(server, directory)
+
+def test_download_drops_a_corrupt_last_range():
+    server, directory, file_path, journal_path = download_setup()
+    try:
+        server.cut = 700000
+        container = journaled_container(journal_path)
+        container.download_file(server.url + '/disk.vmdk', file_path)
+        ranges = list(json.load(open(journal_path)).values())[0]['ranges']
+        with open(file_path, 'r+b') as file:
+            file.seek(ranges[-1][1] - 1)
+            file.write(b'x')
+        container = journaled_container(journal_path)
+        assert container.download_file(server.url + '/disk.vmdk', file_path)
+        assert server.ranges[-1] == 'bytes=%d-' % ranges[-1][0]
+        assert open(file_path, 'rb').read() == server.files['/disk.vmdk']
+    finally:
+        download_teardown(server, directory)
+
+def test_download_restarts_on_another_range():
+    server, directory, file_path, journal_path = download_setup()
+    try:
+        server.cut = 700000
+        container = journaled_container(journal_path)
+        container.download_file(server.url + '/disk.vmdk', file_path)
+        server.range_start = 1000
+        container = journaled_container(journal_path)
+        assert container.download_file(server.url + '/disk.vmdk', file_path)
+        assert server.ranges[1].startswith('bytes=') and server.ranges[2] == None
+        assert open(file_path, 'rb').read() == server.files['/disk.vmdk']
+    finally:
+        download_teardown(server, directory)
+
+def upload_setup(size):
+    # a local transfer server whose entity reports the bytes received for /disk.vmdk
+    server = TransferServer()
+    def entity():
+        with server.lock:
+            transferred = server.bytes_transferred if server.bytes_transferred != None else sum(len(body) for (path, content_range), body in server.received.items() if path == '/disk.vmdk')
+        return ('<VAppTemplate xmlns="http://www.vmware.com/vcloud/v1.5"><Files><File name="disk.vmdk" size="%d" bytesTransferred="%d">'
+            '<Link rel="upload:default" href="%s/disk.vmdk"/></File></Files></VAppTemplate>' % (size, transferred, server.url)).encode()
+    server.bytes_transferred = None
+    server.files['/vAppTemplate/1'] = entity
+    retry_backoff = Container.retry_backoff
+    Container.retry_backoff = 0
+    container = Container('c', ClientContext('http://127.0.0.1', {}, 'org1', Transport(retry_policy=None)))
+    return server, container, source_file(size), retry_backoff
+
+def upload_teardown(server, file_path, retry_backoff):
+    Container.retry_backoff = retry_backoff
+    server.stop()
+    os.remove(file_path)
+
+def test_upload_splits_files_in_ranges():
+    server, container, file_path, retry_backoff = upload_setup(250000)
+    try:
+        assert container.upload_file(server.url + '/vAppTemplate/1', server.url + '/disk.vmdk', file_path, streams=3, part_size=100000)
+        data = open(file_path, 'rb').read()
+        assert sorted(server.received) == [('/disk.vmdk', 'bytes 0-99999/250000'), ('/disk.vmdk', 'bytes 100000-199999/250000'), ('/disk.vmdk', 'bytes 200000-249999/250000')]
+        assert b''.join(server.received[key] for key in sorted(server.received)) == data
+        assert len(server.puts) == 3
+    finally:
+        upload_teardown(server, file_path, retry_backoff)
+
+def test_upload_retries_only_the_failed_range():
+    server, container, file_path, retry_backoff = upload_setup(250000)
+    try:
+        server.failures[('/disk.vmdk', 'bytes 100000-199999/250000')] = [500, None, 'slow']
+        # a read timeout shorter than server.delay
+        container = Container('c', ClientContext('http://127.0.0.1', {}, 'org1', Transport(retry_policy=None, timeout=0.2)))
+        assert container.upload_file(server.url + '/vAppTemplate/1', server.url + '/disk.vmdk', file_path, streams=2, part_size=100000)
+        assert [key[1] for key in server.puts].count('bytes 100000-199999/250000') == 4
+        assert [key[1] for key in server.puts].count('bytes 0-99999/250000') == 1
+        assert b''.join(server.received[key] for key in sorted(server.received)) == open(file_path, 'rb').read()
+    finally:
+        upload_teardown(server, file_path, retry_backoff)
+
+def test_upload_raises_once_a_range_runs_out_of_retries():
+    server, container, file_path, retry_backoff = upload_setup(250000)
+    try:
+        server.failures[('/disk.vmdk', 'bytes 0-99999/250000')] = [500, 500]
+        with pytest.raises(ApiError) as error:
+            container.upload_part(server.url + '/disk.vmdk', file_path, 0, 100000, 250000, retries=1)
+        assert error.value.args[1] == 500
+        assert len(server.puts) == 2
+        # a new transport: the failures above count towards its circuit breaker
+        container = Container('c', ClientContext('http://127.0.0.1', {}, 'org1', Transport()))
+        server.failures[('/disk.vmdk', 'bytes 0-99999/250000')] = [500] * (Container.upload_part_retries + 1)
+        with pytest.raises(ApiError):
+            container.upload_file(server.url + '/vAppTemplate/1', server.url + '/disk.vmdk', file_path, streams=1, part_size=100000)
+        # the other ranges still went up
+        assert ('/disk.vmdk', 'bytes 200000-249999/250000') in server.received
+    finally:
+        upload_teardown(server, file_path, retry_backoff)
+
+def test_upload_fails_when_vcd_reports_other_bytes():
+    server, container, file_path, retry_backoff = upload_setup(250000)
+    try:
+        server.bytes_transferred = 100000
+        assert not container.upload_file(server.url + '/vAppTemplate/1', server.url + '/disk.vmdk', file_path, part_size=100000)
+    finally:
+        upload_teardown(server, file_path, retry_backoff)
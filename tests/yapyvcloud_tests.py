@@ -2,6 +2,7 @@ from nose.tools import *
 from yapyvcloud.yapyvcloud import *
 
 def test_session():
+    configure_logging()
     #session = Session('vcdsys')
     session = Session('vcdorg')
 
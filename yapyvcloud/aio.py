@@ -0,0 +1,520 @@
+# asyncio variants of the Container request primitives and of Session, Org, OrgVdc, Vapp and Vm
+# python 3.5+ only, needs aiohttp: pip install yapyvcloud[aio]
+import asyncio, time
+
+from .yapyvcloud import requests, yaml, Metrics, Container, ClientContext, XmlResponse, TaskPoller, RetryPolicy, RateLimiter, RateSlot, ApiError, logger
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+class AsyncResponse(object):
+    # fully read response, with the attributes the sync code uses on requests responses
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+class AsyncTransport(object):
+    # aiohttp connection pool, one per session, shared by all async containers
+    def __init__(self, pool_size=100, keep_alive=True, timeout=None, retry_policy=None):
+        if aiohttp == None:
+            raise ImportError("aiohttp is required for yapyvcloud.aio, install yapyvcloud[aio]")
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.retry_policy = RetryPolicy() if retry_policy == None else retry_policy
+        self.session = None
+
+    def client_session(self):
+        # created on first use so it binds to the running loop
+        if self.session == None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, force_close=not self.keep_alive)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self.session
+
+    async def request(self, method, url, headers=None, data=None, auth=None, timeout=None):
+        # same retry policy and circuit breakers as Transport
+        kwargs = {}
+        if auth != None:
+            kwargs['auth'] = aiohttp.BasicAuth(auth.username, auth.password)
+        if timeout != None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        policy = self.retry_policy
+        breaker = policy.breaker(url)
+        replayable = RetryPolicy.replayable(data)
+        # http metrics only, the thread-local operation tag does not apply to interleaved coroutines
+        metrics = Container.metrics
+        attempt = 0
+        while True:
+            policy.check(breaker, url)
+            start = time.time()
+            try:
+                async with self.client_session().request(method, url, headers=headers, data=data, **kwargs) as r:
+                    response = AsyncResponse(r.status, await r.read(), r.headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if metrics != None:
+                    metrics.request(method, 'error', time.time() - start, Metrics.body_size(data), 0)
+                policy.record(breaker)
+                delay = policy.retry_delay(method, attempt, None, replayable)
+                if delay == None:
+                    raise
+                logger.warning("%s %s failed: %r, retry %d in %.1fs" % (method, url, e, attempt + 1, delay))
+            else:
+                if metrics != None:
+                    metrics.request(method, response.status_code, time.time() - start, Metrics.body_size(data), len(response.content))
+                policy.record(breaker, response.status_code)
+                delay = policy.retry_delay(method, attempt, response, replayable)
+                if delay == None:
+                    return response
+                logger.warning("%s %s returned %d, retry %d in %.1fs" % (method, url, response.status_code, attempt + 1, delay))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request('PUT', url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request('DELETE', url, **kwargs)
+
+    async def close(self):
+        if self.session != None:
+            await self.session.close()
+            self.session = None
+
+class AsyncContainer(object):
+    # objects are resolved by awaiting them: vdc = await AsyncOrgVdc('vdc1')
+    # not a Container: only its static payload and rendering helpers are shared, none of the sync api
+    # methods pass their operation name to the primitives, the thread-local of @operation_tag does not follow coroutines
+    default_context = ClientContext() # context of the last connected async session
+    slot_poll_interval = 0.05 # seconds between checks for a free slot of Container.rate_limiter
+
+    def __init__(self, name, context=None):
+        self.name = name
+        self.href = None
+        self.context = AsyncContainer.default_context if context == None else context
+
+    def __await__(self):
+        return self.resolve().__await__()
+
+    async def resolve(self):
+        if self.href == None:
+            self.href = await self.get_href()
+        return self
+
+    async def request_slot(self, api_url, kind):
+        # Container.request_slot without blocking the event loop: shares the limits of Container.rate_limiter
+        # with the sync clients, waiting for a free slot is polled every AsyncContainer.slot_poll_interval
+        limiter = Container.rate_limiter
+        if limiter == None:
+            return RateSlot(None)
+        start = time.time()
+        limit = limiter.limit(requests.utils.urlparse(api_url).netloc, self.context.org_name, kind)
+        delay = limiter.rate_delay(limit, kind)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        slot = RateSlot(limit)
+        waited = False
+        while True:
+            with limit.condition:
+                if RateLimiter.admit(limit, slot):
+                    break
+            if not waited:
+                waited = True
+                limiter.count(kind + '_concurrency_waits')
+            await asyncio.sleep(AsyncContainer.slot_poll_interval)
+        if Container.metrics != None:
+            Container.metrics.observe('yapyvcloud_slot_wait_seconds', (('kind', kind),), time.time() - start)
+        return slot
+
+    async def api_get(self, api_url, headers=None, timeout=None):
+        headers = self.context.api_headers if headers is None else headers
+        with await self.request_slot(api_url, 'read'):
+            r = await self.context.transport.get(api_url, headers=headers, timeout=timeout)
+        if r.status_code == requests.codes.ok:
+            return r
+        else:
+            raise ApiError(self.name, r.status_code, r.content)
+
+    async def api_delete(self, api_url, caller, target_name=None, wait=True):
+        target_name = '' if target_name == None else target_name
+        # the task slot is held until the task completed
+        with await self.request_slot(api_url, 'task') as slot:
+            r = await self.context.transport.delete(api_url, headers=self.context.api_headers)
+            if r.status_code == requests.codes.accepted:
+                return await self.task_result(r, caller + ' ' + target_name, wait, slot)
+            elif r.status_code == requests.codes.no_content:
+                logger.info("%s %s %s succeeded" % (self.name, caller, target_name))
+                return r
+            else:
+                raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
+
+    async def api_post(self, api_url, expected_r_code, caller, auth=None, headers=None, wait=True):
+        headers = self.context.api_headers if headers is None else headers
+        with await self.request_slot(api_url, 'task') as slot:
+            r = await self.context.transport.post(api_url, auth=auth, headers=headers)
+            if r.status_code == expected_r_code:
+                return await self.task_result(r, caller, wait, slot)
+            else:
+                raise ApiError(self.name + ' ' + caller, r.status_code, r.content)
+
+    async def api_post_params(self, params_type, api_url, params, expected_r_code, caller, target_name, wait=True):
+        api_headers = self.context.api_headers
+        api_headers['Content-Type'] = 'application/vnd.vmware.'+ params_type + '+xml'
+        with await self.request_slot(api_url, 'task') as slot:
+            r = await self.context.transport.post(api_url, headers=api_headers, data=params)
+            if r.status_code == expected_r_code:
+                return await self.task_result(r, caller + ' ' + target_name, wait, slot)
+            else:
+                raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
+
+    async def api_put_params(self, params_type, api_url, params, expected_r_code, caller, target_name, wait=True):
+        api_headers = self.context.api_headers
+        api_headers['Content-Type'] = 'application/vnd.vmware.'+ params_type + '+xml'
+        with await self.request_slot(api_url, 'task') as slot:
+            r = await self.context.transport.put(api_url, headers=api_headers, data=params)
+            if r.status_code == expected_r_code:
+                return await self.task_result(r, caller + ' ' + target_name, wait, slot)
+            else:
+                raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
+
+    async def task_result(self, r, caller, wait=True, slot=None):
+        # with wait=False the task is followed by an asyncio task, cancelling it cancels the vcd task
+        # and the task slot, if any, is held until that asyncio task is done
+        task_href = XmlResponse(r.content).task_href()
+        if not wait:
+            future = asyncio.ensure_future(self.task_result(r, caller))
+            return future if slot == None else slot.hold(future)
+        try:
+            task_success = await self.get_task_progress(task_href) if task_href != None else True
+        except asyncio.CancelledError:
+            await self.del_task(task_href)
+            raise
+        if task_success:
+            logger.info("%s %s succeeded" % (self.name, caller))
+            return r
+        else:
+            logger.info("%s %s failed" % (self.name, caller))
+            return None
+
+    async def get_task_progress(self, task_href, show_progress=True, wait=True, poller=None):
+        if not wait:
+            return True
+        poller = TaskPoller() if poller == None else poller
+        delays = poller.delays()
+        while True:
+            r = await self.api_get(task_href)
+            task_status, task_operation_name, task_owner, progress = XmlResponse(r.content).task()
+            if progress != None and show_progress:
+                logger.info("task %s %s progress: %s%%" % (task_operation_name, task_owner, progress))
+            if task_status not in TaskPoller.pending_statuses:
+                if task_status != 'error':
+                    logger.info("task %s %s completed successfully" % (task_operation_name, task_owner))
+                    return True
+                else:
+                    raise ApiError(task_operation_name + ' ' + task_owner, r.status_code, r.content)
+            delay = next(delays, None)
+            if delay == None:
+                raise ApiError(task_operation_name + ' ' + task_owner, 'timeout', task_href)
+            await asyncio.sleep(delay)
+
+    async def del_task(self, task_href):
+        # a read slot: task slots may all be held by the tasks being cancelled
+        with await self.request_slot(task_href, 'read'):
+            r = await self.context.transport.post(task_href + '/action/cancel', headers=self.context.api_headers)
+        if r.status_code == requests.codes.no_content:
+            logger.info("task %s cancelled" % (task_href))
+            return True
+        logger.warning("task %s cancel failed: %s" % (task_href, r.status_code))
+        return False
+
+    async def get_record(self, record_type, tag, record_filter=None, detailed=False, show=None, compact=False):
+        # pages 2..n are fetched concurrently, at most Container.page_workers at a time
+        api_url = self.context.api_url_prefix + '/query?type=' + record_type + '&format=records'
+        api_url += '&filter=(' + record_filter + ')' if record_filter != None and record_filter != '' else ''
+        page = XmlResponse((await self.api_get(api_url)).content)
+        records = page.records(tag, compact)
+        page_size = int(page['pageSize'])
+        total = int(page['total'])
+        page_count = (total + page_size - 1) // page_size if page_size > 0 else 1
+        if page_count > 1:
+            semaphore = asyncio.Semaphore(max(1, Container.page_workers))
+            async def get_record_page(page_number):
+                async with semaphore:
+                    r = await self.api_get(api_url + '&page=' + str(page_number) + '&pageSize=' + str(page_size))
+                return XmlResponse(r.content).records(tag, compact)
+            for page_records in await asyncio.gather(*[get_record_page(i) for i in range(2, page_count + 1)]):
+                records += page_records
+        if detailed:
+            records = await self.get_entities([record.get('href') for record in records])
+        if Container.showing(show):
+            Container.show_records(record_type, records)
+        return records
+
+    async def get_entity(self, entity_href, timeout=None):
+        r = await self.api_get(entity_href, timeout=timeout)
+        return r.content
+
+    async def get_entities(self, entity_hrefs, workers=None, timeout=None, return_exceptions=False):
+        # results keep entity_hrefs order, the first error is raised once all are done
+        # or with return_exceptions a failed entity is returned as its exception
+        semaphore = asyncio.Semaphore(max(1, Container.hydration_workers if workers == None else workers))
+        timeout = Container.hydration_timeout if timeout == None else timeout
+        async def get_entity(entity_href):
+            async with semaphore:
+                try:
+                    return await self.get_entity(entity_href, timeout)
+                except Exception as e:
+                    logger.warning("%s get_entity %s failed: %s" % (self.name, entity_href, e))
+                    return e
+        entities = list(await asyncio.gather(*[get_entity(entity_href) for entity_href in entity_hrefs]))
+        if not return_exceptions:
+            for entity in entities:
+                if isinstance(entity, Exception):
+                    raise entity
+        return entities
+
+    async def get_href(self, record_type, tag):
+        links = await self.get_record(record_type, tag, 'name==' + self.name, show=False)
+        if len(links) == 0:
+            logger.info("%s does not exist" % (self.name))
+            return None
+        elif len(links) > 1:
+            logger.info("more than one %s found" % (self.name))
+            return None
+        else:
+            return links[0]['href']
+
+    async def get_section(self, section, show=None):
+        r = await self.api_get(self.href + section)
+        if Container.showing(show):
+            Container.show_records(section, [r.content])
+        return r.content
+
+    async def start(self, power_on=True, wait=True):
+        params = Container.deploy_params(power_on)
+        return await self.api_post_params('vcloud.deployVAppParams', self.href + '/action/deploy', params, requests.codes.accepted, 'start', self.name, wait)
+
+    async def stop(self, power_action='default', wait=True):
+        if power_action not in Container.undeploy_power_actions:
+            logger.info("%s not in %s" % (power_action,Container.undeploy_power_actions))
+            return
+        params = Container.undeploy_params(power_action)
+        return await self.api_post_params('vcloud.undeployVAppParams', self.href + '/action/undeploy', params, requests.codes.accepted, 'stop', self.name, wait)
+
+    async def power_on(self, wait=True):
+        return await self.api_post(self.href + '/power/action/powerOn', requests.codes.accepted, 'power_on', wait=wait)
+
+    async def power_off(self, wait=True):
+        return await self.api_post(self.href + '/power/action/powerOff', requests.codes.accepted, 'power_off', wait=wait)
+
+    async def reset(self, wait=True):
+        return await self.api_post(self.href + '/power/action/reset', requests.codes.accepted, 'reset', wait=wait)
+
+    async def suspend(self, wait=True):
+        return await self.api_post(self.href + '/power/action/suspend', requests.codes.accepted, 'suspend', wait=wait)
+
+    async def discard_suspend(self, wait=True):
+        return await self.api_post(self.href + '/action/discardSuspendedState', requests.codes.accepted, 'discard_suspend', wait=wait)
+
+    async def shutdown(self, wait=True):
+        return await self.api_post(self.href + '/power/action/shutdown', requests.codes.accepted, 'shutdown', wait=wait)
+
+    async def reboot(self, wait=True):
+        return await self.api_post(self.href + '/power/action/reboot', requests.codes.accepted, 'reboot', wait=wait)
+
+class AsyncSession(AsyncContainer):
+    # session = await AsyncSession('vcdorg'), credentials and tokens are shared with Session
+
+    def __init__(self, alias, transport=None, pool_size=None, keep_alive=True, retry_policy=None):
+        with open(Container.conf_path, 'r') as conf_file:
+            credentials = yaml.safe_load(conf_file)['credentials']
+        for credential in credentials:
+            if credential['credential']['alias'] == alias:
+                break
+        else:
+            raise ValueError("%s does not exist" % (alias))
+        self.hostname = credential['credential']['host']
+        self.org_name = credential['credential']['org']
+        self.username = credential['credential']['user']
+        self.password = credential['credential']['pass']
+        pool_size = Container.pool_size if pool_size == None else pool_size
+        transport = AsyncTransport(pool_size, keep_alive, retry_policy=retry_policy) if transport == None else transport
+        AsyncContainer.__init__(self, self.username + '@' + self.org_name + '@' + self.hostname,
+            ClientContext("https://" + self.hostname + "/api", (), self.org_name, transport))
+        self.token = None
+
+    async def resolve(self):
+        if self.href == None:
+            self.href = await self.connect()
+            AsyncContainer.default_context = self.context
+        return self
+
+    def load_sessions(self):
+        open(Container.session_file_path, "a").close() # touch
+        with open(Container.session_file_path, "r") as session_file:
+            sessions = yaml.safe_load(session_file)
+        return [] if sessions is None else sessions
+
+    def save_sessions(self, sessions):
+        with open(Container.session_file_path, "w") as session_file:
+            session_file.write(yaml.safe_dump(sessions,default_flow_style=False))
+
+    async def connect(self):
+        logger.debug("set api_vesion to highest supported")
+        r = await self.api_get(self.context.api_url_prefix + "/versions")
+        versions = [float(version.text) for version in XmlResponse(r.content).find_all('Version')]
+        self.context = self.context.replace(headers={'Accept':'application/*+xml;version=' + str(max(versions)),'Accept-Encoding':'gzip'})
+
+        logger.debug("try reuse existing session")
+        sessions = self.load_sessions()
+        api_user = self.username + "@" + self.org_name
+        for session in sessions:
+            if session['session']['host'] == self.hostname and session['session']['user'] == api_user:
+                api_headers = self.context.api_headers
+                api_headers.update({'x-vcloud-authorization':session['session']['token']})
+                with await self.request_slot(self.context.api_url_prefix + "/session/", 'read'):
+                    r = await self.context.transport.get(self.context.api_url_prefix + "/session/", headers=api_headers)
+                if r.status_code == requests.codes.ok:
+                    self.token = session['session']['token']
+                    self.context = self.context.with_headers({'x-vcloud-authorization':self.token})
+                    logger.info("%s reconnect succeeded" % (self.name))
+                    return XmlResponse(r.content)['href']
+                else:
+                    sessions.remove(session)
+
+        logger.debug("create new session")
+        api_auth = requests.auth.HTTPBasicAuth(api_user, self.password)
+        r = await self.api_post(self.context.api_url_prefix + "/sessions", requests.codes.ok, 'connect', auth=api_auth)
+        self.token = r.headers.get('x-vcloud-authorization')
+        self.context = self.context.with_headers({'x-vcloud-authorization':self.token})
+        sessions.append({'session':{'host':self.hostname,'user':api_user,'token':self.token}})
+        self.save_sessions(sessions)
+        return XmlResponse(r.content)['href']
+
+    async def disconnect(self):
+        logger.debug("disconnect and delete session")
+        await self.api_delete(self.href, 'disconnect')
+        self.save_sessions([session for session in self.load_sessions() if session['session']['token'] != self.token])
+        await self.context.transport.close()
+
+class AsyncOrg(AsyncContainer):
+
+    def __init__(self, name=None, context=None):
+        context = AsyncContainer.default_context if context == None else context
+        AsyncContainer.__init__(self, context.org_name if name == None else name, context)
+        self.admin_href = None
+
+    async def resolve(self):
+        if self.href == None:
+            self.href = await self.get_href()
+            self.admin_href = self.href.replace('/api','/api/admin')
+        return self
+
+    async def get_href(self):
+        r = await self.api_get(self.context.api_url_prefix + '/org')
+        return XmlResponse(r.content).find('Org')['href']
+
+    async def get_orgvdc(self, name=None, detailed=False, show=None):
+        record_filter = 'name==' + name if name != None else ''
+        return await self.get_record('orgVdc', 'OrgVdcRecord', record_filter, detailed=detailed, show=show)
+
+    async def get_network(self, name=None, detailed=False, show=None):
+        record_filter = 'org==' + self.href
+        record_filter += ';name==' + name if name != None else ''
+        return await self.get_record('orgNetwork', 'OrgNetworkRecord', record_filter, detailed=detailed, show=show)
+
+    async def get_catalog(self, name=None, detailed=False, show=None):
+        record_filter = 'name==' + name if name != None else ''
+        return await self.get_record('catalog', 'CatalogRecord', record_filter, detailed=detailed, show=show)
+
+    async def get_task(self, status=None, detailed=False, show=None):
+        if status not in Container.task_statuses:
+            logger.info("%s not in %s" % (status,Container.task_statuses))
+            return
+        record_filter = 'status==' + status if status != None else ''
+        return await self.get_record('task', 'TaskRecord', record_filter, detailed=detailed, show=show)
+
+    async def get_event(self, detailed=False, show=None):
+        return await self.get_record('event', 'EventRecord', detailed=detailed, show=show)
+
+class AsyncOrgVdc(AsyncContainer):
+
+    def __init__(self, name, context=None):
+        AsyncContainer.__init__(self, name, context)
+        self.admin_href = None
+
+    async def resolve(self):
+        if self.href == None:
+            self.href = await self.get_href()
+            self.admin_href = self.href.replace('/api', '/api/admin')
+        return self
+
+    async def get_href(self):
+        return await super(AsyncOrgVdc, self).get_href('orgVdc', 'OrgVdcRecord')
+
+    async def get_vapp(self, name=None, detailed=False, show=None):
+        record_filter = 'vdc==' + self.href
+        record_filter += ';name==' + name if name != None else ''
+        return await self.get_record('vApp', 'VAppRecord', record_filter, detailed=detailed, show=show)
+
+    async def get_vapp_template(self, name=None, detailed=False, show=None):
+        record_filter = 'vdc==' + self.href
+        record_filter += ';name==' + name if name != None else ''
+        return await self.get_record('vAppTemplate', 'VAppTemplateRecord', record_filter, detailed=detailed, show=show)
+
+    async def get_storage_profile(self, name=None, detailed=False, show=None):
+        record_filter = 'vdc==' + self.href
+        record_filter += ';name==' + name if name != None else ''
+        if self.context.org_name.lower() == 'system':
+            return await self.get_record('adminOrgVdcStorageProfile', 'AdminOrgVdcStorageProfileRecord', record_filter, detailed=detailed, show=show)
+        else:
+            return await self.get_record('orgVdcStorageProfile', 'OrgVdcStorageProfileRecord', record_filter, detailed=detailed, show=show)
+
+    async def del_vapp(self, vapp_name, wait=True):
+        vapp_record = await self.get_record('vApp', 'VAppRecord', 'vdcName==' + self.name + ';name==' + vapp_name, show=False)
+        if len(vapp_record) == 0:
+            logger.info("%s does not exist in %s" % (vapp_name, self.name))
+            logger.info("%s del_vapp %s failed" % (self.name, vapp_name))
+            return
+        return await self.api_delete(vapp_record[0]['href'], 'del_vapp', vapp_name, wait)
+
+class AsyncVapp(AsyncContainer):
+
+    async def get_href(self):
+        return await super(AsyncVapp, self).get_href('vApp', 'VAppRecord')
+
+    async def get_vm(self, name=None, detailed=False, show=None):
+        record_filter = 'container==' + self.href
+        record_filter += ';name==' + name if name != None else ''
+        return await self.get_record('vm', 'VMRecord', record_filter, detailed=detailed, show=show)
+
+class AsyncVm(AsyncContainer):
+
+    def __init__(self, name, parent, context=None):
+        AsyncContainer.__init__(self, name, parent.context if context == None else context)
+        self.parent = parent
+
+    async def get_href(self):
+        vm_record = await self.get_record('vm', 'VMRecord', 'name==' + self.name + ';container==' + self.parent.href, show=False)
+        if len(vm_record) == 0:
+            logger.info("%s not in %s" % (self.name, self.parent.name))
+            logger.info("%s get_href %s failed" % (self.name, self.parent.name))
+            return None
+        return vm_record[0]['href']
+
+    async def del_snapshot(self, wait=True):
+        return await self.api_post(self.href + '/action/removeAllSnapshots', requests.codes.accepted, 'del_snapshot', wait=wait)
+
+    async def revert_snapshot(self, wait=True):
+        return await self.api_post(self.href + '/action/revertToCurrentSnapshot', requests.codes.accepted, 'revert_snapshot', wait=wait)
+
+    async def consolidate_snapshot(self, wait=True):
+        return await self.api_post(self.href + '/action/consolidate', requests.codes.accepted, 'consolidate_snapshot', wait=wait)
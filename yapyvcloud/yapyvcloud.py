@@ -1,8 +1,49 @@
-import requests, sys, time, inspect, re, yaml, os, tarfile, netaddr, logging, logging.config
-from random import randint
+import sys, time, re, os, logging, collections, itertools, threading, copy, importlib, atexit, functools, mmap, json, zlib
+from random import randint, uniform
+from concurrent import futures
 from datetime import datetime
-from bs4 import builder, BeautifulSoup, Tag, NavigableString
 from lxml import etree
+from lxml.builder import ElementMaker
+
+class LazyImport(object):
+    # module, or module attribute, imported on first use to keep heavy dependencies out of import time
+    # lxml and concurrent.futures stay eager, classes below subclass their types
+    def __init__(self, module_name, attr=None):
+        self.module_name = module_name
+        self.attr = attr
+        self.target = None
+
+    def resolve(self):
+        if self.target is None:
+            target = importlib.import_module(self.module_name)
+            self.target = getattr(target, self.attr) if self.attr != None else target
+        return self.target
+
+    def __getattr__(self, name):
+        if name in ('module_name', 'attr', 'target'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __instancecheck__(self, obj):
+        # nothing can be an instance of a class whose module was never imported
+        if self.target is None and self.module_name not in sys.modules:
+            return False
+        return isinstance(obj, self.resolve())
+
+requests = LazyImport('requests')
+yaml = LazyImport('yaml')
+tarfile = LazyImport('tarfile')
+netaddr = LazyImport('netaddr')
+builder = LazyImport('bs4.builder')
+BeautifulSoup = LazyImport('bs4', 'BeautifulSoup')
+Tag = LazyImport('bs4', 'Tag')
+NavigableString = LazyImport('bs4', 'NavigableString')
+parsedate_tz = LazyImport('email.utils', 'parsedate_tz')
+mktime_tz = LazyImport('email.utils', 'mktime_tz')
+quoteattr = LazyImport('xml.sax.saxutils', 'quoteattr') # pulls in urllib.request
 
 LOG_CONFIG = {'version':1,
     'formatters':{
@@ -28,19 +69,1227 @@ LOG_CONFIG = {'version':1,
         'level':'DEBUG'
     }
 }
-logging.config.dictConfig(LOG_CONFIG)
+log_listener = None
+
+try:
+    from logging.handlers import QueueHandler
+
+    class RecordQueueHandler(QueueHandler):
+        # enqueues the record as logged, the stock prepare() formats it on the calling thread
+        # the listener then formats it only in the handlers that pass their level check
+        def prepare(self, record):
+            return record
+except ImportError:
+    RecordQueueHandler = None # python 2
+
+def configure_logging(config=None, queued=True):
+    # opt-in logging setup, LOG_CONFIG (console and ~/yapyvcloud.log at DEBUG) unless a dictConfig dict is given
+    # queued=True moves the root handlers behind a QueueHandler, they run on a listener thread so logging never blocks a call
+    global log_listener
+    import logging.config
+    if log_listener != None:
+        log_listener.stop()
+        log_listener = None
+    # keep the module loggers created at import time enabled
+    config = dict(LOG_CONFIG if config == None else config)
+    config.setdefault('disable_existing_loggers', False)
+    logging.config.dictConfig(config)
+    try:
+        from logging.handlers import QueueListener
+        from queue import Queue
+    except ImportError:
+        return None # python 2, handlers stay synchronous
+    if not queued:
+        return None
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+    queue = Queue(-1)
+    queue_handler = RecordQueueHandler(queue)
+    # records no handler would emit are dropped before they are queued
+    queue_handler.setLevel(min([handler.level for handler in handlers] or [logging.NOTSET]))
+    root.addHandler(queue_handler)
+    log_listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    log_listener.start()
+    return log_listener
+
+@atexit.register
+def stop_logging():
+    # flush the queued records on exit
+    global log_listener
+    if log_listener != None:
+        log_listener.stop()
+        log_listener = None
+
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+class CircuitBreaker(object):
+    # per host: opens after threshold consecutive failures and rejects requests for reset_timeout seconds,
+    # then lets one probe through, a success closes it again
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at == None:
+                return True
+            if time.time() - self.opened_at >= self.reset_timeout:
+                self.opened_at = time.time() # half open, the others wait for this probe
+                return True
+            return False
 
-class IterableToFileAdapter(object):
-    def __init__(self, iterable):
-        self.iterator = iter(iterable)
-        self.length = len(iterable)
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def failure(self):
+        # returns True when this failure opened the breaker
+        with self.lock:
+            self.failures += 1
+            if self.threshold > 0 and self.failures >= self.threshold and self.opened_at == None:
+                self.opened_at = time.time()
+                return True
+            return False
 
-    def read(self, size=-1):
-        return next(self.iterator, b'')
+class RetryPolicy(object):
+    # which transient vcd errors to retry, how long to wait, and a circuit breaker per host
+    # counters tells how often retries, Retry-After waits and the breakers fired
+    methods = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE') # idempotent, POST creates tasks
+    statuses = (429, 500, 502, 503, 504)
+    post_statuses = (429,) # throttled before anything was done
+    breaker_statuses = (500, 502, 503, 504)
+
+    def __init__(self, retries=None, backoff=None, max_backoff=None, jitter=None, max_retry_after=None,
+            breaker_threshold=None, breaker_reset_timeout=None):
+        self.retries = Container.retries if retries == None else retries
+        self.backoff = Container.retry_backoff if backoff == None else backoff
+        self.max_backoff = Container.retry_max_backoff if max_backoff == None else max_backoff
+        self.jitter = Container.retry_jitter if jitter == None else jitter
+        self.max_retry_after = Container.retry_max_retry_after if max_retry_after == None else max_retry_after
+        self.breaker_threshold = Container.breaker_threshold if breaker_threshold == None else breaker_threshold
+        self.breaker_reset_timeout = Container.breaker_reset_timeout if breaker_reset_timeout == None else breaker_reset_timeout
+        self.breakers = {}
+        self.counters = collections.Counter()
+        self.lock = threading.Lock()
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+    def breaker(self, url):
+        host = requests.utils.urlparse(url).netloc
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset_timeout)
+            return self.breakers[host]
+
+    def check(self, breaker, url):
+        if not breaker.allow():
+            self.count('breaker_rejected')
+            raise ApiError(requests.utils.urlparse(url).netloc, 'circuit open', url)
+
+    def record(self, breaker, status_code=None):
+        # status_code None is a connection error
+        if status_code == None or status_code in self.breaker_statuses:
+            if breaker.failure():
+                self.count('breaker_opened')
+                logger.warning("circuit opened after %d failures" % (breaker.failures))
+        else:
+            breaker.success()
 
-    def __len__(self):
-        return self.length
+    @staticmethod
+    def replayable(data):
+        # files and generators are consumed by the first attempt
+        return data == None or isinstance(data, (bytes, type(u''), dict, list, tuple))
+
+    def retry_delay(self, method, attempt, response=None, replayable=True):
+        # seconds to wait before retrying, None when the request must not be retried
+        if not replayable or attempt >= self.retries:
+            return None
+        if response == None:
+            if method.upper() not in self.methods:
+                return None
+            self.count('connection_errors')
+        else:
+            statuses = self.statuses if method.upper() in self.methods else self.post_statuses
+            if response.status_code not in statuses:
+                return None
+            self.count('status_%d' % response.status_code)
+            retry_after = RetryPolicy.retry_after(response)
+            if retry_after != None:
+                self.count('retry_after')
+                self.count('retries')
+                return min(retry_after, self.max_retry_after)
+        self.count('retries')
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return delay * uniform(1 - self.jitter, 1 + self.jitter)
+
+    @staticmethod
+    def retry_after(response):
+        # Retry-After is either seconds or an http date
+        value = response.headers.get('Retry-After') if response.headers != None else None
+        if value == None:
+            return None
+        try:
+            return max(0, float(value))
+        except ValueError:
+            date = parsedate_tz(value)
+            return max(0, mktime_tz(date) - time.time()) if date != None else None
+
+class Transport(object):
+    # pooled keep-alive http transport, one per session, shared by all containers
+    # any object with request/get/post/put/delete/close can be plugged in instead
+    def __init__(self, pool_size=10, keep_alive=True, timeout=None, retry_policy=None):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.retry_policy = RetryPolicy() if retry_policy == None else retry_policy
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def request(self, method, url, **kwargs):
+        if self.timeout != None:
+            kwargs.setdefault('timeout', self.timeout)
+        policy = self.retry_policy
+        breaker = policy.breaker(url)
+        replayable = RetryPolicy.replayable(kwargs.get('data'))
+        metrics = Container.metrics
+        attempt = 0
+        while True:
+            policy.check(breaker, url)
+            start = time.time()
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if metrics != None:
+                    metrics.request(method, 'error', time.time() - start, Metrics.body_size(kwargs.get('data')), 0)
+                policy.record(breaker)
+                delay = policy.retry_delay(method, attempt, None, replayable)
+                if delay == None:
+                    raise
+                logger.warning("%s %s failed: %s, retry %d in %.1fs" % (method, url, e, attempt + 1, delay))
+            else:
+                if metrics != None:
+                    metrics.request(method, r.status_code, time.time() - start, Metrics.body_size(kwargs.get('data')), Metrics.response_size(r, kwargs.get('stream')))
+                policy.record(breaker, r.status_code)
+                delay = policy.retry_delay(method, attempt, r, replayable)
+                if delay == None:
+                    return r
+                logger.warning("%s %s returned %d, retry %d in %.1fs" % (method, url, r.status_code, attempt + 1, delay))
+                r.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+class ClientContext(object):
+    # immutable per-session state carried by every container: api url, request headers, org and transport
+    # derive a modified context with replace()/with_headers() instead of mutating a shared one
+    __slots__ = ('api_url_prefix', 'headers', 'org_name', 'transport')
+
+    def __init__(self, api_url_prefix=None, headers=(), org_name=None, transport=None):
+        headers = headers.items() if isinstance(headers, dict) else headers
+        object.__setattr__(self, 'api_url_prefix', api_url_prefix)
+        object.__setattr__(self, 'headers', tuple(sorted(headers)))
+        object.__setattr__(self, 'org_name', org_name)
+        object.__setattr__(self, 'transport', transport)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is immutable" % (self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("%s is immutable" % (self.__class__.__name__))
+
+    def __repr__(self):
+        return "<ClientContext %s %s>" % (self.org_name, self.api_url_prefix)
+
+    def __eq__(self, other):
+        # by value, so contexts derived alike (e.g. by role_template_org) share cache entries
+        return isinstance(other, ClientContext) and all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.api_url_prefix, self.headers, self.org_name, id(self.transport)))
+
+    @property
+    def api_headers(self):
+        # a fresh dict per request, callers may add Content-Type etc.
+        return dict(self.headers)
+
+    def replace(self, **changes):
+        values = dict((name, getattr(self, name)) for name in self.__slots__)
+        values.update(changes)
+        return ClientContext(**values)
+
+    def with_headers(self, headers):
+        api_headers = self.api_headers
+        api_headers.update(headers)
+        return self.replace(headers=api_headers)
+
+class XmlElement(etree.ElementBase):
+    # lxml element with the bs4 Tag accessors used on records: record['href'], has_attr, string
+    def __getitem__(self, key):
+        if isinstance(key, (str, type(u''))):
+            if ':' in key:
+                prefix, name = key.split(':', 1)
+                if prefix in self.nsmap:
+                    key = '{' + self.nsmap[prefix] + '}' + name
+            return self.attrib[key]
+        return etree.ElementBase.__getitem__(self, key)
+
+    def __bool__(self):
+        return True
+    __nonzero__ = __bool__
+
+    def __str__(self):
+        return etree.tostring(self, encoding='unicode')
+
+    def has_attr(self, key):
+        return key in self.attrib
+
+    @property
+    def attrs(self):
+        return dict(self.attrib)
+
+    @property
+    def string(self):
+        return self.text
+
+class XmlResponse(object):
+    # parses a response body once with lxml, all accessors share the same tree
+    # tags match in any namespace like BeautifulSoup(content,'xml')
+    local = threading.local()
+    paths = {}
+
+    def __init__(self, content):
+        self.root = etree.fromstring(content, XmlResponse.parser()) if content else None
+
+    @staticmethod
+    def parser():
+        # lxml parsers are not thread-safe, keep one per thread
+        parser = getattr(XmlResponse.local, 'parser', None)
+        if parser == None:
+            parser = etree.XMLParser(remove_blank_text=True, huge_tree=True)
+            parser.set_element_class_lookup(etree.ElementDefaultClassLookup(element=XmlElement))
+            XmlResponse.local.parser = parser
+        return parser
+
+    @staticmethod
+    def path(path):
+        # 'Files/File' -> '{*}Files/{*}File', compiled once and cached by lxml
+        try:
+            return XmlResponse.paths[path]
+        except KeyError:
+            XmlResponse.paths[path] = '/'.join(step if step in ('.', '..', '') or step.startswith('{') else '{*}' + step for step in path.split('/'))
+            return XmlResponse.paths[path]
+
+    def __getitem__(self, key):
+        return self.root[key]
+
+    def get(self, key, default=None):
+        return self.root.get(key, default) if self.root is not None else default
+
+    def find(self, tag, **attrs):
+        for element in self.find_all(tag, **attrs):
+            return element
+        return None
+
+    def find_all(self, tag, **attrs):
+        if self.root is None:
+            return []
+        elements = self.root.iter(XmlResponse.path(tag))
+        if attrs:
+            return [element for element in elements if all(element.get(k) == v for k, v in attrs.items())]
+        return list(elements)
+
+    def findtext(self, path):
+        return self.root.findtext(XmlResponse.path(path)) if self.root is not None else None
+
+    def records(self, tag, compact=False):
+        # query records are direct children of QueryResultRecords
+        elements = self.root.findall(XmlResponse.path(tag)) if self.root is not None else []
+        return Record.compact(tag, elements) if compact else elements
+
+    def link(self, rel):
+        for link in self.root.iterfind(XmlResponse.path('Link')):
+            if link.get('rel') == rel:
+                return link.get('href')
+        return None
+
+    def task(self):
+        # status, operationName, owner name and progress of a Task body
+        owner = self.root.find(XmlResponse.path('Owner'))
+        return (self.root.get('status'), self.root.get('operationName'),
+            owner.get('name', '') if owner is not None else '', self.root.findtext(XmlResponse.path('Progress')))
+
+    def task_href(self):
+        task = self.find('Task', type='application/vnd.vmware.vcloud.task+xml')
+        return task.get('href') if task is not None else None
+
+class TaskPoller(object):
+    # task polling schedule: first poll right away, then exponential backoff with jitter
+    # up to max_delay, until timeout seconds (None waits forever)
+    pending_statuses = ('queued', 'preRunning', 'running')
+
+    def __init__(self, initial_delay=None, factor=None, max_delay=None, jitter=None, timeout=None):
+        self.initial_delay = Container.task_poll_initial_delay if initial_delay == None else initial_delay
+        self.factor = Container.task_poll_factor if factor == None else factor
+        self.max_delay = Container.task_poll_max_delay if max_delay == None else max_delay
+        self.jitter = Container.task_poll_jitter if jitter == None else jitter
+        self.timeout = Container.task_poll_timeout if timeout == None else timeout
+
+    def delays(self):
+        # yields the sleep before the next poll, stops once timeout is used up
+        deadline = time.time() + self.timeout if self.timeout != None else None
+        delay = self.initial_delay
+        while True:
+            sleep = min(delay, self.max_delay) * uniform(1 - self.jitter, 1 + self.jitter)
+            if deadline != None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return
+                sleep = min(sleep, remaining)
+            yield max(sleep, 0)
+            delay = min(delay * self.factor, self.max_delay)
+
+class TaskFuture(futures.Future):
+    # handle on a vCD task started by a mutating call with wait=False
+    # result() returns the response of the call once the task succeeded and raises ApiError if it failed,
+    # cancel() cancels the task through del_task, add_done_callback works as for any future
+    def __init__(self, container, task_href, response, caller=''):
+        futures.Future.__init__(self)
+        self.container = container
+        self.task_href = task_href
+        self.response = response
+        self.caller = caller
+        self.status = None
+        self.monitor = None
+        self.lock = threading.Lock()
+        self.add_done_callback(TaskFuture.log_result)
+        if task_href == None:
+            self.update('success')
+        elif Container.task_monitor != None:
+            Container.task_monitor.watch(self)
+
+    def __repr__(self):
+        return "<TaskFuture %s %s %s>" % (self.container.name, self.caller, self.status)
+
+    @staticmethod
+    def log_result(future):
+        if future.cancelled():
+            logger.info("%s %s cancelled" % (future.container.name, future.caller))
+        elif futures.Future.exception(future, 0) != None:
+            logger.info("%s %s failed" % (future.container.name, future.caller))
+        else:
+            logger.info("%s %s succeeded" % (future.container.name, future.caller))
+
+    def update(self, status, operation_name='', owner='', content=None):
+        # record a task status, completes the future once the task left the pending statuses
+        with self.lock:
+            if futures.Future.done(self):
+                return True
+            self.status = status
+            if status in TaskPoller.pending_statuses:
+                return False
+            if status == 'success':
+                self.set_result(self.response)
+            elif status == 'canceled':
+                # CANCELLED_AND_NOTIFIED, or concurrent.futures.wait never counts it as done
+                futures.Future.cancel(self)
+                self.set_running_or_notify_cancel()
+            else:
+                self.set_exception(ApiError(operation_name + ' ' + owner, status, content if content != None else self.task_href))
+            return True
+
+    def refresh(self):
+        # one GET of the task
+        if futures.Future.done(self):
+            return True
+        r = self.container.api_get(self.task_href)
+        task_status, task_operation_name, task_owner, progress = XmlResponse(r.content).task()
+        return self.update(task_status, task_operation_name, task_owner, r.content)
+
+    def done(self):
+        if futures.Future.done(self) or self.monitor != None:
+            return futures.Future.done(self)
+        return self.refresh()
+
+    def running(self):
+        return not futures.Future.done(self) and self.status in TaskPoller.pending_statuses
+
+    def cancel(self):
+        with self.lock:
+            if futures.Future.done(self):
+                return futures.Future.cancelled(self)
+            if not self.container.del_task(self.task_href):
+                return False
+            self.status = 'canceled'
+            futures.Future.cancel(self)
+            self.set_running_or_notify_cancel()
+            return True
+
+    def result(self, timeout=None):
+        self.wait(timeout)
+        return futures.Future.result(self, 0)
+
+    def exception(self, timeout=None):
+        self.wait(timeout)
+        return futures.Future.exception(self, 0)
+
+    def wait(self, timeout=None):
+        if not futures.Future.done(self):
+            TaskFuture.wait_all([self], timeout)
+
+    @staticmethod
+    def wait_all(task_futures, timeout=None, return_when=futures.ALL_COMPLETED, poller=None):
+        # wait on many task futures from one thread, polling the unmonitored ones with backoff
+        # returns (done, not_done) like concurrent.futures.wait
+        task_futures = set(task_futures)
+        if all(task_future.monitor != None for task_future in task_futures if isinstance(task_future, TaskFuture)):
+            return futures.wait(task_futures, timeout, return_when)
+        poller = TaskPoller(timeout=timeout) if poller == None else poller
+        delays = poller.delays()
+        while True:
+            for task_future in task_futures:
+                if isinstance(task_future, TaskFuture) and task_future.monitor == None:
+                    task_future.refresh()
+            done, not_done = futures.wait(task_futures, 0, return_when)
+            if not not_done or return_when == futures.FIRST_COMPLETED and done or \
+                    return_when == futures.FIRST_EXCEPTION and any(not f.cancelled() and f.exception(0) != None for f in done):
+                return done, not_done
+            delay = next(delays, None)
+            if delay == None:
+                return done, not_done
+            time.sleep(delay)
+
+class TaskMonitor(object):
+    # refreshes any number of watched task futures from one background thread
+    # each poll cycle is one task query per batch of hrefs instead of one GET per task
+    def __init__(self, interval=None, batch_size=None):
+        self.interval = Container.task_monitor_interval if interval == None else interval
+        self.batch_size = Container.task_monitor_batch_size if batch_size == None else batch_size
+        self.watched = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.closed = False
+
+    def watch(self, task_future):
+        with self.lock:
+            if self.closed:
+                raise RuntimeError('TaskMonitor is closed')
+            task_future.monitor = self
+            self.watched[task_future.task_href] = task_future
+            if self.thread == None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='TaskMonitor')
+                self.thread.daemon = True
+                self.thread.start()
+        return task_future
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            watched = list(self.watched.values())
+            self.watched.clear()
+        self.wakeup.set()
+        # hand the remaining futures back to their own polling
+        for task_future in watched:
+            task_future.monitor = None
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            with self.lock:
+                if self.closed or not self.watched:
+                    self.thread = None
+                    return
+                # one query per session, futures of different sessions cannot share it
+                by_context = collections.OrderedDict()
+                for task_href, task_future in self.watched.items():
+                    by_context.setdefault(task_future.container.context, (task_future.container, []))[1].append(task_href)
+            for container, task_hrefs in by_context.values():
+                for i in range(0, len(task_hrefs), self.batch_size):
+                    self.poll(container, task_hrefs[i:i + self.batch_size])
+
+    def poll(self, container, task_hrefs):
+        try:
+            api_url = container.context.api_url_prefix + '/query?type=task&format=records&pageSize=' + str(len(task_hrefs))
+            api_url += '&filter=(' + ','.join('href==' + task_href for task_href in task_hrefs) + ')'
+            task_records = XmlResponse(container.api_get(api_url).content).records('TaskRecord')
+            statuses = dict((task_record['href'], task_record) for task_record in task_records)
+        except Exception as e:
+            logger.warning("TaskMonitor poll of %d tasks failed: %r" % (len(task_hrefs), e))
+            return
+        for task_href in task_hrefs:
+            task_future = self.watched.get(task_href)
+            if task_future == None:
+                continue
+            try:
+                if task_href in statuses:
+                    task_record = statuses[task_href]
+                    completed = task_future.update(task_record['status'], task_record.get('name', ''), task_record.get('objectName', ''))
+                else:
+                    # not visible to the task query (e.g. another org), fall back to the task itself
+                    completed = task_future.refresh()
+            except Exception as e:
+                logger.warning("TaskMonitor refresh of %s failed: %r" % (task_href, e))
+                continue
+            if completed:
+                with self.lock:
+                    self.watched.pop(task_href, None)
+
+class TokenBucket(object):
+    # rate tokens per second, bursts up to capacity
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.last = time.time()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        # takes a token and returns how long to wait for it, tokens go negative for queued callers
+        with self.lock:
+            now = time.time()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+class RateLimit(object):
+    # token bucket and in-flight cap for one (host, org, kind)
+    def __init__(self, rate, burst, concurrency):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.holders = set()
+        self.condition = threading.Condition()
+
+class RateSlot(object):
+    # one admitted request, released when the request (or the task it started) is done
+    # with limit None it is a no-op
+    def __init__(self, limit):
+        self.limit = limit
+        self.future = None
+        self.released = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if self.future == None:
+            self.release()
+
+    def hold(self, task_future):
+        # keep the slot until the task future completes
+        self.future = task_future
+        task_future.add_done_callback(lambda future: self.release())
+        return task_future
+
+    def release(self):
+        if self.limit == None:
+            return
+        with self.limit.condition:
+            if self.released:
+                return
+            self.released = True
+            self.limit.in_flight -= 1
+            self.limit.holders.discard(self)
+            self.limit.condition.notify()
+
+class RateLimiter(object):
+    # client side throttling per (host, org, kind), kind is 'read' for queries and gets,
+    # 'task' for mutating calls whose slot is held until their task completed, 'transfer' for file uploads and downloads
+    # limits are looked up from the most specific configure() call, defaults come from Container
+    kinds = ('read', 'task', 'transfer')
+
+    def __init__(self):
+        self.config = {
+            ('read', None, None):{'rate':Container.read_rate, 'burst':Container.read_burst, 'concurrency':Container.read_concurrency},
+            ('task', None, None):{'rate':Container.task_rate, 'burst':Container.task_burst, 'concurrency':Container.task_concurrency},
+            ('transfer', None, None):{'rate':Container.transfer_rate, 'burst':Container.transfer_burst, 'concurrency':Container.transfer_concurrency}}
+        self.limits = {}
+        self.counters = collections.Counter()
+        self.lock = threading.Lock()
+
+    def configure(self, kind, host=None, org=None, rate=None, burst=None, concurrency=None):
+        # rate/burst/concurrency 0 disables that limit, None inherits the less specific setting
+        if kind not in RateLimiter.kinds:
+            raise ValueError("%s not in %s" % (kind, RateLimiter.kinds))
+        with self.lock:
+            settings = dict((name, value) for name, value in (('rate', rate), ('burst', burst), ('concurrency', concurrency)) if value != None)
+            self.config.setdefault((kind, host, org), {}).update(settings)
+            self.limits.clear()
+
+    def settings(self, kind, host, org):
+        settings = {}
+        for key in ((kind, None, None), (kind, None, org), (kind, host, None), (kind, host, org)):
+            settings.update(self.config.get(key, {}))
+        return settings
+
+    def limit(self, host, org, kind):
+        with self.lock:
+            key = (host, org, kind)
+            if key not in self.limits:
+                settings = self.settings(kind, host, org)
+                self.limits[key] = RateLimit(settings.get('rate'), settings.get('burst') or 1, settings.get('concurrency'))
+            return self.limits[key]
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            for (host, org, kind), limit in self.limits.items():
+                stats['in_flight %s %s %s' % (host, org, kind)] = limit.in_flight
+            return stats
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    def rate_delay(self, limit, kind):
+        # takes a token, returns the seconds to wait for it
+        if limit.bucket == None:
+            return 0
+        delay = limit.bucket.reserve()
+        if delay > 0:
+            self.count(kind + '_rate_waits')
+        return delay
+
+    @staticmethod
+    def admit(limit, slot):
+        # takes an in-flight place for slot when one is free, called with limit.condition held
+        if limit.concurrency and limit.in_flight >= limit.concurrency:
+            return False
+        limit.in_flight += 1
+        limit.holders.add(slot)
+        return True
+
+    def acquire(self, url, org, kind):
+        limit = self.limit(requests.utils.urlparse(url).netloc, org, kind)
+        delay = self.rate_delay(limit, kind)
+        if delay > 0:
+            time.sleep(delay)
+        slot = RateSlot(limit)
+        while True:
+            with limit.condition:
+                if RateLimiter.admit(limit, slot):
+                    return slot
+                # slots held by unmonitored task futures are only freed when someone polls them
+                # (slots of asyncio clients are released by their own futures)
+                pending = [holder.future for holder in limit.holders if isinstance(holder.future, TaskFuture) and holder.future.monitor == None]
+                if not pending:
+                    self.count(kind + '_concurrency_waits')
+                    limit.condition.wait(Container.rate_limit_poll_interval)
+                    continue
+            self.count(kind + '_concurrency_waits')
+            if not any([RateLimiter.poll(future) for future in pending]):
+                time.sleep(Container.rate_limit_poll_interval)
+
+    @staticmethod
+    def poll(task_future):
+        try:
+            return task_future.done()
+        except Exception as e:
+            logger.warning("%s refresh failed: %r" % (task_future, e))
+            return False
+
+class QueryCache(object):
+    # opt-in cache of get_record results keyed by (record_type, filter, session), LRU bounded, with a ttl per record type
+    # mutations drop the entries whose filter or records mention the mutated entity, unfiltered and empty results
+    def __init__(self, max_entries=None, ttl=None, ttls=None):
+        self.max_entries = Container.query_cache_max_entries if max_entries == None else max_entries
+        self.ttl = Container.query_cache_ttl if ttl == None else ttl
+        self.ttls = dict(Container.query_cache_ttls)
+        self.ttls.update(ttls if ttls != None else {})
+        self.entries = collections.OrderedDict()
+        self.counters = collections.Counter()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def entity_path(api_url):
+        # https://host/api/admin/vdc/id/action/x -> /vdc/id, the same entity is referenced
+        # under /api, /api/admin or /api/admin/extension depending on who asks
+        match = re.match(r'https?://[^/]+/api(?:/admin)?(?:/extension)?(/[^/?]+/[^/?]+)', api_url)
+        return match.group(1) if match != None else api_url
+
+    @staticmethod
+    def hrefs(records):
+        hrefs = set()
+        for record in records:
+            for value in (record.values() if isinstance(record, Record) else record.attrib.values()):
+                if value != None and '://' in value:
+                    hrefs.add(value)
+        return hrefs
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry == None or entry[0] < time.time():
+                self.counters['misses'] += 1
+                return None
+            self.entries.pop(key)
+            self.entries[key] = entry
+            self.counters['hits'] += 1
+            return list(entry[1])
+
+    def put(self, key, records):
+        ttl = self.ttls.get(key[0], self.ttl)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        entry = (time.time() + ttl, list(records), QueryCache.hrefs(records))
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def invalidate(self, api_url):
+        path = QueryCache.entity_path(api_url)
+        with self.lock:
+            for key, (expires, records, hrefs) in list(self.entries.items()):
+                record_filter = key[2]
+                if not records or not record_filter or path in record_filter or \
+                        any(value.endswith(path) or path + '/' in value for value in hrefs):
+                    del self.entries[key]
+                    self.counters['invalidations'] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self.entries)
+            return stats
+
+class HrefResolver(object):
+    # shared name -> hrefs lookups per session, found names are kept for ttl, missing names for negative_ttl
+    # prewarm() loads a whole scope with one query, names missing from a prewarmed scope resolve without a query
+    def __init__(self, ttl=None, negative_ttl=None):
+        self.ttl = Container.resolver_ttl if ttl == None else ttl
+        self.negative_ttl = Container.resolver_negative_ttl if negative_ttl == None else negative_ttl
+        self.entries = {}
+        self.scopes = {}
+        self.counters = collections.Counter()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def record_filter(name, scope):
+        return 'name==' + name + (';' + scope if scope else '')
+
+    def cached(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry != None and entry[0] >= now:
+                self.counters['hits' if entry[1] else 'negative_hits'] += 1
+                return list(entry[1])
+            if self.scopes.get(key[:3], 0) >= now:
+                self.counters['negative_hits'] += 1
+                return []
+            self.counters['misses'] += 1
+            return None
+
+    def store(self, key, hrefs):
+        ttl = self.ttl if hrefs else self.negative_ttl
+        if ttl > 0:
+            with self.lock:
+                self.entries[key] = (time.time() + ttl, tuple(hrefs))
+
+    def resolve(self, container, record_type, tag, name, scope=''):
+        # hrefs of the records named name in scope (an extra query filter), usually zero or one
+        key = (container.context, record_type, scope, name)
+        hrefs = self.cached(key)
+        if hrefs == None:
+            records = container.get_record(record_type, tag, HrefResolver.record_filter(name, scope), show=False)
+            hrefs = [record['href'] for record in records]
+            self.store(key, hrefs)
+        return hrefs
+
+    def prewarm(self, container, record_type, tag, scope=''):
+        # one query for every record of a type in scope, e.g. all roles or all storage profiles of a vdc
+        records = container.get_record(record_type, tag, scope, show=False)
+        names = collections.defaultdict(list)
+        for record in records:
+            names[record['name']].append(record['href'])
+        for name, hrefs in names.items():
+            self.store((container.context, record_type, scope, name), hrefs)
+        if self.negative_ttl > 0:
+            with self.lock:
+                self.scopes[(container.context, record_type, scope)] = time.time() + min(self.ttl, self.negative_ttl)
+        return len(records)
+
+    def invalidate(self, api_url):
+        # a mutation may rename or delete the entity, or create any name: drop its hrefs and all negatives
+        path = QueryCache.entity_path(api_url)
+        with self.lock:
+            self.scopes.clear()
+            for key, (expires, hrefs) in list(self.entries.items()):
+                if not hrefs or any(href.endswith(path) for href in hrefs):
+                    del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.scopes.clear()
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self.entries)
+            return stats
+
+class Metrics(object):
+    # in-process counters and latency histograms for the api layer, exported as a dict or prometheus text
+    # enabled by setting Container.metrics = Metrics(), every hook is a no-op while it is None
+    local = threading.local()
+    buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+    help = {
+        'yapyvcloud_http_requests_total':'HTTP round trips, retries included, by operation, verb and status',
+        'yapyvcloud_http_request_seconds':'HTTP round trip latency by verb',
+        'yapyvcloud_http_sent_bytes_total':'request body bytes by verb',
+        'yapyvcloud_http_received_bytes_total':'response body bytes by verb',
+        'yapyvcloud_operation_seconds':'Container primitive latency, task wait included, by operation and verb',
+        'yapyvcloud_operation_errors_total':'Container primitives that raised, by operation and verb',
+        'yapyvcloud_task_wait_seconds':'time from task submission to its completion by operation',
+        'yapyvcloud_task_errors_total':'tasks that did not succeed by operation',
+        'yapyvcloud_slot_wait_seconds':'time spent waiting for a rate limiter slot by kind'}
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(sorted(Metrics.buckets if buckets == None else buckets))
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def operation():
+        # operation the current thread is in, '' outside of any timed call
+        return getattr(Metrics.local, 'operation', None) or ''
+
+    @staticmethod
+    def carry(fn):
+        # fn wrapped to run under the current thread's operation, for work handed to a pool worker
+        operation = getattr(Metrics.local, 'operation', None)
+        def carried(*args, **kwargs):
+            local = Metrics.local
+            outer = getattr(local, 'operation', None)
+            local.operation = operation
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                local.operation = outer
+        return carried
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, seconds):
+        key = (name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram == None:
+                histogram = self.histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[0][i] += 1
+                    break
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def request(self, method, status, seconds, sent, received):
+        # one http round trip, status is 'error' when no response came back
+        self.inc('yapyvcloud_http_requests_total', (('operation', Metrics.operation()), ('method', method), ('status', str(status))))
+        self.observe('yapyvcloud_http_request_seconds', (('method', method),), seconds)
+        if sent:
+            self.inc('yapyvcloud_http_sent_bytes_total', (('method', method),), sent)
+        if received:
+            self.inc('yapyvcloud_http_received_bytes_total', (('method', method),), received)
+
+    @staticmethod
+    def body_size(data):
+        try:
+            return len(data) if data != None else 0
+        except TypeError:
+            return 0
+
+    @staticmethod
+    def response_size(response, stream=False):
+        # streamed bodies are not read here, their size is only known from Content-Length
+        length = response.headers.get('Content-Length') if response.headers != None else None
+        if length != None:
+            return int(length)
+        return 0 if stream or response.content == None else len(response.content)
+
+    def task(self, operation, seconds, success):
+        self.observe('yapyvcloud_task_wait_seconds', (('operation', operation),), seconds)
+        if not success:
+            self.inc('yapyvcloud_task_errors_total', (('operation', operation),))
+
+    def snapshot(self):
+        # {name: [{'labels':{...}, 'value':n}]} for counters,
+        # {name: [{'labels':{...}, 'count':n, 'sum':s, 'buckets':[(le, cumulative count), ...]}]} for histograms
+        snapshot = {}
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                snapshot.setdefault(name, []).append({'labels':dict(labels), 'value':value})
+            for (name, labels), (counts, total, count) in sorted(self.histograms.items()):
+                cumulative, running = [], 0
+                for bucket_count in counts:
+                    running += bucket_count
+                    cumulative.append(running)
+                snapshot.setdefault(name, []).append({'labels':dict(labels), 'count':count, 'sum':total,
+                    'buckets':list(zip(self.buckets, cumulative)) + [(float('inf'), count)]})
+        return snapshot
+
+    @staticmethod
+    def label_text(labels, extra=()):
+        labels = tuple(labels) + tuple(extra)
+        if not labels:
+            return ''
+        escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return '{' + ','.join('%s="%s"' % (name, escape(value)) for name, value in labels) + '}'
+
+    def prometheus(self):
+        # text exposition format 0.0.4
+        lines = []
+        for name, samples in sorted(self.snapshot().items()):
+            histogram = 'buckets' in samples[0]
+            lines.append('# HELP %s %s' % (name, Metrics.help.get(name, name)))
+            lines.append('# TYPE %s %s' % (name, 'histogram' if histogram else 'counter'))
+            for sample in samples:
+                labels = sorted(sample['labels'].items())
+                if not histogram:
+                    lines.append('%s%s %s' % (name, Metrics.label_text(labels), sample['value']))
+                    continue
+                for bound, count in sample['buckets']:
+                    lines.append('%s_bucket%s %d' % (name, Metrics.label_text(labels, (('le', '+Inf' if bound == float('inf') else repr(bound)),)), count))
+                lines.append('%s_sum%s %r' % (name, Metrics.label_text(labels), sample['sum']))
+                lines.append('%s_count%s %d' % (name, Metrics.label_text(labels), sample['count']))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+class OperationTimer(object):
+    # times a Container primitive and tags the http requests made meanwhile with its operation
+    # nested timers keep the outermost operation as the request tag
+    __slots__ = ('metrics', 'operation', 'method', 'outer', 'start')
+
+    def __init__(self, metrics, operation, method):
+        self.metrics = metrics
+        self.operation = operation
+        self.method = method
+
+    def __enter__(self):
+        if self.metrics != None:
+            self.outer = getattr(Metrics.local, 'operation', None)
+            if self.operation == None:
+                self.operation = self.outer or self.method.lower()
+            if not self.outer:
+                Metrics.local.operation = self.operation
+            self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if self.metrics != None:
+            labels = (('operation', self.operation), ('method', self.method))
+            self.metrics.observe('yapyvcloud_operation_seconds', labels, time.time() - self.start)
+            if exc_type != None:
+                self.metrics.inc('yapyvcloud_operation_errors_total', labels)
+            Metrics.local.operation = self.outer
+        return False
+
+def operation_tag(method):
+    # declares a method as an operation named after it, without stack introspection:
+    # while it runs, http requests and metrics are tagged with the outermost operation
+    # and yapyvcloud log records carry it as %(operation)s
+    name = method.__name__
+    @functools.wraps(method)
+    def tagged(*args, **kwargs):
+        local = Metrics.local
+        outer = getattr(local, 'operation', None)
+        if outer:
+            return method(*args, **kwargs)
+        local.operation = name
+        try:
+            return method(*args, **kwargs)
+        finally:
+            local.operation = outer
+    tagged.operation = name
+    return tagged
+
+class OperationFilter(logging.Filter):
+    # sets record.operation in the logging thread; on handlers it only defaults it to '' for other loggers' records
+    def filter(self, record):
+        if not hasattr(record, 'operation'):
+            record.operation = Metrics.operation()
+        return True
+
+logger.addFilter(OperationFilter())
+
+class Payload(object):
+    # request bodies built directly as lxml trees, serialized once without a str/reparse round-trip
+    vcloud_ns = 'http://www.vmware.com/vcloud/v1.5'
+    ovf_ns = 'http://schemas.dmtf.org/ovf/envelope/1'
+    E = ElementMaker(namespace=vcloud_ns, nsmap={None: vcloud_ns})
+    E_ovf = ElementMaker(namespace=vcloud_ns, nsmap={None: vcloud_ns, 'ovf': ovf_ns})
+
+    @staticmethod
+    def serialize(params):
+        # lxml element, BeautifulSoup document/tag or an already serialized body
+        if etree.iselement(params):
+            return etree.tostring(params, xml_declaration=True, encoding='UTF-8')
+        if isinstance(params, bytes):
+            return params
+        if isinstance(params, Tag):
+            return params.encode()
+        return params.encode('utf-8')
+
+    @staticmethod
+    def text(value):
+        return str(value).lower() if isinstance(value, bool) else str(value)
+
+    @staticmethod
+    def child(parent, *tags):
+        # parent's tags child, each missing one appended empty in the vcloud namespace
+        for tag in tags:
+            element = parent.find('{*}' + tag)
+            if element is None:
+                element = getattr(Payload.E, tag)()
+                parent.append(element)
+            parent = element
+        return parent
+
+class Record(object):
+    # compact immutable query record keeping only the fields of its record type schema
+    # one __slots__ subclass per record tag and field set, see Container.record_fields
+    __slots__ = ()
+    record_tag = None
+    classes = {}
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, field, value):
+        raise AttributeError("%s is read-only" % (self.record_tag))
+
+    def __delattr__(self, field):
+        raise AttributeError("%s is read-only" % (self.record_tag))
+
+    def __getitem__(self, field):
+        value = getattr(self, field, None) if field in self.__slots__ else None
+        if value == None:
+            raise KeyError(field)
+        return value
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.values() == other.values()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.values())
+
+    def __reduce__(self):
+        return (Record.make, (self.record_tag, self.__slots__, self.values()))
+
+    def __repr__(self):
+        return "%s(%s)" % (self.record_tag, ', '.join('%s=%r' % item for item in self.items()))
+
+    def __str__(self):
+        return '<%s %s/>' % (self.record_tag, ' '.join('%s=%s' % (field, quoteattr(value)) for field, value in self.items()))
+
+    def get(self, field, default=None):
+        value = getattr(self, field, None) if field in self.__slots__ else None
+        return default if value == None else value
+
+    def has_attr(self, field):
+        return self.get(field) != None
+
+    def values(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def items(self):
+        return [(field, value) for field, value in zip(self.__slots__, self.values()) if value != None]
+
+    @property
+    def attrs(self):
+        return dict(self.items())
+
+    @staticmethod
+    def record_class(tag, fields):
+        key = (tag, tuple(fields))
+        try:
+            return Record.classes[key]
+        except KeyError:
+            return Record.classes.setdefault(key, type(tag, (Record,), {'__slots__':key[1], 'record_tag':tag}))
+
+    @staticmethod
+    def make(tag, fields, values):
+        return Record.record_class(tag, fields)(*values)
+
+    @staticmethod
+    def compact(tag, elements):
+        # record types missing from Container.record_fields take their schema from the attributes of these elements
+        fields = Container.record_fields.get(tag)
+        if fields == None:
+            fields = sorted(set(key for element in elements for key in element.attrib.keys() if not key.startswith('{')))
+        record_class = Record.record_class(tag, fields)
+        shared = {}
+        records = []
+        for element in elements:
+            get = element.get
+            # repeated values (status, vdc, container hrefs) share one string object
+            records.append(record_class(*[shared.setdefault(value, value) if value != None else None for value in [get(field) for field in fields]]))
+        return records
+
+class RecordYaml(object):
+    # lazy yaml rendering of a record, formatted only when a log handler emits it
+    __slots__ = ('record',)
+
+    def __init__(self, record):
+        self.record = record
+
+    def __str__(self):
+        return Container.convertXml2Yaml(self.record)
 
 class ApiError(Exception):
     def __init__(self, *args):
@@ -50,16 +1299,62 @@ class ApiWarning(Exception):
     def __init__(self, *args):
         self.args = args
 
-class Container(yaml.YAMLObject):
+class Container(object):
 
     conf_path = os.path.expanduser('~') + '/yapyvcloud_cred.yaml'
     session_file_path = os.path.expanduser('~') + '/yapyvcloud_token.yaml'
-    api_url_prefix = None
-    api_headers = None
-    session_org_name = None
+    default_context = ClientContext() # context of the last connected session, used when none is given
 
     chunk_size = 128*1024
     max_chunk_size = 1024*1024
+    upload_streams = 4 # concurrent upload PUTs, files of a template or ranges of a file
+    upload_part_size = 0 # bytes per range PUT, 0 uploads each file as a single PUT
+    upload_part_retries = 3 # attempts per range after the first
+    upload_mmap = True # stream upload bodies as mmap slices, False reads them into a reused buffer
+    progress_interval = 1.0 # seconds between progress callbacks of a file
+    journal_path = None # json file of transfer checkpoints to resume from, e.g. ~/yapyvcloud_transfers.json
+    journal_interval = 64*1024*1024 # bytes between download checkpoints
+    pool_size = 10
+    page_workers = 4
+    read_ahead = 2
+    hydration_workers = 8
+    hydration_timeout = None
+    show_default = True # show=None getters follow this, set to False for library use
+    show_stream = None # file object or path records are rendered to instead of the log
+    task_poll_initial_delay = 0.5
+    task_poll_factor = 1.5
+    task_poll_max_delay = 15
+    task_poll_jitter = 0.1
+    task_poll_timeout = None
+    task_monitor = None
+    task_monitor_interval = 2
+    task_monitor_batch_size = 50
+    retries = 3
+    retry_backoff = 0.5
+    retry_max_backoff = 30
+    retry_jitter = 0.2
+    retry_max_retry_after = 120
+    breaker_threshold = 5
+    breaker_reset_timeout = 30
+    rate_limiter = None
+    metrics = None # Metrics() to collect latency histograms and counters
+    read_rate = 50
+    read_burst = 100
+    read_concurrency = 32
+    task_rate = 5
+    task_burst = 10
+    task_concurrency = 8
+    transfer_rate = 0 # upload and download requests to transfer urls, 0 is unlimited
+    transfer_burst = 1
+    transfer_concurrency = 16
+    rate_limit_poll_interval = 1
+    query_cache = None
+    query_cache_max_entries = 1024
+    query_cache_ttl = 60
+    query_cache_ttls = {'task':0, 'event':0, 'adminTask':0, 'adminEvent':0}
+    href_resolver = None # HrefResolver() caches name -> href lookups, None queries every time
+    resolver_ttl = 300
+    resolver_negative_ttl = 30
     identity_provider_types = ['INTEGRATED','SAML']
     hardware_vers = ['vmx-7','vmx-8','vmx-9','vmx-10','vmx-11','vmx-12','vmx-13']
     allocation_models = [ 'AllocationVApp', 'AllocationPool', 'ReservationPool' ]
@@ -192,135 +1487,553 @@ class Container(yaml.YAMLObject):
     load_balancer_healthchecks = {'HTTP':'HTTP','HTTPS':'SSL','TCP':'TCP'}
     load_balancer_persistences = {'HTTP':'COOKIE','HTTPS':'SSL_SESSION_ID','TCP':None}
     load_balancer_cookie_modes = ['INSERT','PREFIX','APP']
-
-    def __init__(self, name):
+    # fields kept by get_record(compact=True), per query record tag
+    record_fields = {'VMRecord':('name','href','status','vdc','container','containerName','catalogName','guestOs',
+            'hardwareVersion','isVAppTemplate','isDeployed','isDeleted','isPublished','isInMaintenanceMode','isVdcEnabled',
+            'memoryMB','numberOfCpus','networkName','storageProfileName','vmToolsVersion','taskStatus','taskStatusName','task'),
+        'AdminVMRecord':('name','href','status','org','vdc','vdcName','container','containerName','catalogName','guestOs',
+            'hardwareVersion','isVAppTemplate','isDeployed','isDeleted','isPublished','isInMaintenanceMode','isVdcEnabled',
+            'memoryMB','numberOfCpus','networkName','storageProfileName','datastoreName','hostName','moref','vc','vmToolsVersion',
+            'taskStatus','taskStatusName','task'),
+        'VAppRecord':('name','href','status','vdc','vdcName','ownerName','creationDate','isBusy','isDeployed','isEnabled',
+            'isExpired','isInMaintenanceMode','isPublic','numberOfVMs','numberOfCpus','memoryAllocationMB','storageKB',
+            'cpuAllocationMhz','taskStatus','taskStatusName','task'),
+        'AdminVAppRecord':('name','href','status','org','vdc','vdcName','ownerName','creationDate','isBusy','isDeployed',
+            'isEnabled','isExpired','isInMaintenanceMode','numberOfVMs','numberOfCpus','memoryAllocationMB','storageKB',
+            'cpuAllocationMhz','taskStatus','taskStatusName','task'),
+        'VAppTemplateRecord':('name','href','status','org','vdc','vdcName','catalogName','ownerName','creationDate','isBusy',
+            'isDeployed','isEnabled','isExpired','isGoldMaster','isPublished','storageProfileName','storageKB','taskStatus',
+            'taskStatusName','task'),
+        'OrgVdcRecord':('name','href','status','orgName','description','isBusy','isEnabled','isSystemVdc','allocationModel',
+            'cpuAllocationMhz','cpuLimitMhz','cpuUsedMhz','memoryAllocationMB','memoryLimitMB','memoryUsedMB','storageLimitMB',
+            'storageUsedMB','numberOfVApps','numberOfVAppTemplates','numberOfMedia','numberOfDisks','numberOfStorageProfiles',
+            'providerVdcName','networkPoolUniversalId'),
+        'OrgVdcStorageProfileRecord':('name','href','vdc','vdcName','isDefaultStorageProfile','isEnabled','storageLimitMB',
+            'storageUsedMB'),
+        'AdminOrgVdcStorageProfileRecord':('name','href','org','vdc','vdcName','isDefaultStorageProfile','isEnabled',
+            'isVdcBusy','storageLimitMB','storageUsedMB'),
+        'OrgVdcNetworkRecord':('name','href','vdc','vdcName','connectedTo','defaultGateway','netmask','dns1','dns2',
+            'dnsSuffix','isBusy','isShared','linkType','isIpScopeInherited'),
+        'VAppNetworkRecord':('name','href','vApp','vAppName','gateway','netmask','dns1','dns2','dnsSuffix','isBusy',
+            'isIpScopeInherited','linkNetworkName'),
+        'EdgeGatewayRecord':('name','href','vdc','gatewayStatus','haStatus','isBusy','numberOfExtNetworks',
+            'numberOfOrgNetworks','isSyslogServerSettingInSync','advancedNetworkingEnabled','taskStatus','taskOperation','task'),
+        'CatalogRecord':('name','href','description','orgName','ownerName','createdOn','isPublished','isShared',
+            'numberOfMedia','numberOfVAppTemplates'),
+        'CatalogItemRecord':('name','href','catalog','catalogName','entity','entityName','entityType','vdc','vdcName',
+            'owner','ownerName','status','creationDate','isExpired','isPublished','isVdcEnabled'),
+        'MediaRecord':('name','href','status','org','vdc','vdcName','catalog','catalogName','catalogItem','owner','ownerName',
+            'creationDate','isBusy','isPublished','storageB','storageProfileName','taskStatus','taskStatusName','task'),
+        'DiskRecord':('name','href','status','vdc','vdcName','ownerName','description','busType','busSubType','sizeB',
+            'sizeMb','isAttached','datastore','datastoreName','storageProfile','storageProfileName','task'),
+        'UserRecord':('name','href','fullName','identityProviderType','isEnabled','isLdapUser','deployedVMQuota',
+            'storedVMQuota'),
+        'GroupRecord':('name','href','identityProviderType','isReadOnly','roleName'),
+        'RoleRecord':('name','href','isReadOnly'),
+        'RightRecord':('name','href','category','description'),
+        'OrgRecord':('name','href','displayName','isEnabled','isReadOnly','canPublishCatalogs','deployedVMQuota',
+            'storedVMQuota','numberOfCatalogs','numberOfVApps','numberOfVdcs','numberOfGroups','numberOfDisks'),
+        'TaskRecord':('name','href','status','object','objectName','objectType','ownerName','org','orgName','startDate',
+            'endDate','serviceNamespace'),
+        'EventRecord':('entity','entityName','entityType','eventStatus','eventType','actorName','org','orgName',
+            'productVersion','serviceNamespace','timeStamp')}
+
+    def __init__(self, name, context=None):
         self.name = name
         self.href = None
         self.sections = None
-
-    def api_get(self, api_url, headers=None):
+        self.context = Container.default_context if context == None else context
+
+    def request_slot(self, api_url, kind):
+        # blocks until Container.rate_limiter lets a 'read', 'task' or 'transfer' request to this host and org through
+        limiter = Container.rate_limiter
+        if limiter == None:
+            return RateSlot(None)
+        start = time.time()
+        slot = limiter.acquire(api_url, self.context.org_name, kind)
+        if Container.metrics != None:
+            Container.metrics.observe('yapyvcloud_slot_wait_seconds', (('kind', kind),), time.time() - start)
+        return slot
+
+    def timer(self, operation, method):
+        # times a primitive in Container.metrics, operation None keeps the one of the calling primitive
+        return OperationTimer(Container.metrics, operation, method)
+
+    def wait_task(self, operation, task_href):
+        # get_task_progress of a wait=True call, its wait and failure recorded in Container.metrics
+        if task_href == None:
+            return True
+        metrics = Container.metrics
+        if metrics == None:
+            return self.get_task_progress(task_href)
+        start = time.time()
+        success = False
         try:
-            headers = Container.api_headers if headers is None else headers
-            r = requests.get(api_url, headers=headers)
-            if r.status_code == requests.codes.ok:
-                return r
-            else:
-                raise ApiError(self.name, r.status_code, r.content)
+            success = self.get_task_progress(task_href)
+            return success
+        finally:
+            metrics.task(operation, time.time() - start, success)
+
+    def time_task(self, operation, task_future):
+        # task wait of a wait=False call, recorded when its future completes
+        metrics = Container.metrics
+        if metrics != None and task_future.task_href != None:
+            start = time.time()
+            task_future.add_done_callback(lambda future: metrics.task(operation, time.time() - start, not future.cancelled() and future.exception() == None))
+        return task_future
+
+    def api_get(self, api_url, headers=None, timeout=None):
+        try:
+            with self.timer(None, 'GET'):
+                headers = self.context.api_headers if headers is None else headers
+                with self.request_slot(api_url, 'read'):
+                    r = self.context.transport.get(api_url, headers=headers) if timeout == None else self.context.transport.get(api_url, headers=headers, timeout=timeout)
+                if r.status_code == requests.codes.ok:
+                    return r
+                else:
+                    raise ApiError(self.name, r.status_code, r.content)
         except:
             raise
 
-    def api_delete(self, api_url, caller, target_name=None, wait=True):
+    def api_delete(self, api_url, caller=None, target_name=None, wait=True):
+        # caller None names the call after the current @operation_tag operation
         try:
-            target_name = '' if target_name == None else target_name
-            r = requests.delete(api_url, headers = Container.api_headers)
-            if r.status_code == requests.codes.accepted:
-                task = BeautifulSoup(r.content,'xml').find('Task',attrs={'type':'application/vnd.vmware.vcloud.task+xml'})
-                task_success = self.get_task_progress(task['href'],wait) if task != None else True
-                if task_success:
+            with self.timer(caller, 'DELETE'):
+                caller = Metrics.operation() if caller == None else caller
+                target_name = '' if target_name == None else target_name
+                # the task slot is held until the task completed
+                with self.request_slot(api_url, 'task') as slot:
+                    r = self.context.transport.delete(api_url, headers = self.context.api_headers)
+                    self.invalidate_cache(api_url)
+                    if r.status_code == requests.codes.accepted:
+                        task_href = XmlResponse(r.content).task_href()
+                        if not wait:
+                            return slot.hold(self.time_task(caller, self.invalidate_on_done(TaskFuture(self, task_href, r, caller + ' ' + target_name), api_url)))
+                        task_success = self.wait_task(caller, task_href)
+                        self.invalidate_cache(api_url)
+                        if task_success:
+                                logger.info("%s %s %s succeeded" % (self.name, caller, target_name))
+                        else:
+                            logger.warning("%s %s %s failed" % (self.name, caller, target_name))
+                    elif r.status_code == requests.codes.no_content:
+                        if not wait:
+                            return TaskFuture(self, None, r, caller + ' ' + target_name)
                         logger.info("%s %s %s succeeded" % (self.name, caller, target_name))
-                else:
-                    logger.warning("%s %s %s failed" % (self.name, caller, target_name))
-            elif r.status_code == requests.codes.no_content:
-                logger.info("%s %s %s succeeded" % (self.name, caller, target_name))
-            else:
-                raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
-            return r
+                    else:
+                        raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
+                    return r
         except:
             raise
 
-    def api_post(self, api_url, expected_r_code, caller, auth=None, headers=None, wait=True):
+    def api_post(self, api_url, expected_r_code, caller=None, auth=None, headers=None, wait=True):
         try:
-            headers = Container.api_headers if headers is None else headers
-            r = requests.post(api_url, auth=auth, headers=headers) # href
-            if r.status_code == expected_r_code:
-                task = BeautifulSoup(r.content,'xml').find('Task',attrs={'type':'application/vnd.vmware.vcloud.task+xml'})
-                task_success = self.get_task_progress(task['href'],wait) if task != None else True
-                if task_success:
-                    logger.info("%s %s succeeded" % (self.name, caller))
-                    return r
-                else:
-                    logger.info("%s %s failed" % (self.name, caller))
-                    return None
-            else:
-                raise ApiError(self.name + ' ' + caller, r.status_code, r.content)
+            with self.timer(caller, 'POST'):
+                caller = Metrics.operation() if caller == None else caller
+                headers = self.context.api_headers if headers is None else headers
+                with self.request_slot(api_url, 'task') as slot:
+                    r = self.context.transport.post(api_url, auth=auth, headers=headers) # href
+                    self.invalidate_cache(api_url)
+                    if r.status_code == expected_r_code:
+                        task_href = XmlResponse(r.content).task_href()
+                        if not wait:
+                            return slot.hold(self.time_task(caller, self.invalidate_on_done(TaskFuture(self, task_href, r, caller), api_url)))
+                        task_success = self.wait_task(caller, task_href)
+                        self.invalidate_cache(api_url)
+                        if task_success:
+                            logger.info("%s %s succeeded" % (self.name, caller))
+                            return r
+                        else:
+                            logger.info("%s %s failed" % (self.name, caller))
+                            return None
+                    else:
+                        raise ApiError(self.name + ' ' + caller, r.status_code, r.content)
         except:
             raise
 
-    def api_post_params(self, params_type, api_url, params, expected_r_code, caller, target_name, wait=True):
+    def api_post_params(self, params_type, api_url, params, expected_r_code, caller=None, target_name=None, wait=True):
         try:
-            api_headers = Container.api_headers.copy()
-            api_headers['Content-Type'] = 'application/vnd.vmware.'+ params_type + '+xml'
-            r = requests.post(api_url, headers = api_headers, data=params) # href
-            if r.status_code == expected_r_code:
-                task = BeautifulSoup(r.content,'xml').find('Task',attrs={'type':'application/vnd.vmware.vcloud.task+xml'})
-                task_success = self.get_task_progress(task['href'],wait) if task != None else True
-                if task_success:
-                    logger.info("%s %s %s succeeded" % (self.name, caller, target_name))
-                    return r
-                else:
-                    logger.info("%s %s %s failed" % (self.name, caller, target_name))
-                    return None
-            else:
-                raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
-                return None
+            with self.timer(caller, 'POST'):
+                caller = Metrics.operation() if caller == None else caller
+                target_name = '' if target_name == None else target_name
+                api_headers = self.context.api_headers
+                api_headers['Content-Type'] = 'application/vnd.vmware.'+ params_type + '+xml'
+                with self.request_slot(api_url, 'task') as slot:
+                    r = self.context.transport.post(api_url, headers = api_headers, data=params) # href
+                    self.invalidate_cache(api_url)
+                    if r.status_code == expected_r_code:
+                        task_href = XmlResponse(r.content).task_href()
+                        if not wait:
+                            return slot.hold(self.time_task(caller, self.invalidate_on_done(TaskFuture(self, task_href, r, caller + ' ' + target_name), api_url)))
+                        task_success = self.wait_task(caller, task_href)
+                        self.invalidate_cache(api_url)
+                        if task_success:
+                            logger.info("%s %s %s succeeded" % (self.name, caller, target_name))
+                            return r
+                        else:
+                            logger.info("%s %s %s failed" % (self.name, caller, target_name))
+                            return None
+                    else:
+                        raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
+                        return None
         except:
             raise
 
-    def api_put_params(self, params_type, api_url, params, expected_r_code, caller, target_name, wait=True):
+    def api_put_params(self, params_type, api_url, params, expected_r_code, caller=None, target_name=None, wait=True):
         try:
-            api_headers = Container.api_headers.copy()
-            api_headers['Content-Type'] = 'application/vnd.vmware.'+ params_type + '+xml'
-            r = requests.put(api_url, headers = api_headers, data=params) # href
-            if r.status_code == expected_r_code:
-                task = BeautifulSoup(r.content,'xml').find('Task',attrs={'type':'application/vnd.vmware.vcloud.task+xml'})
-                task_success = self.get_task_progress(task['href'],wait) if task != None else True
-                if task_success:
-                    logger.info("%s %s %s succeeded" % (self.name, caller, target_name))
-                    return r
-                else:
-                    logger.info("%s %s %s failed" % (self.name, caller, target_name))
-                    return None
-            else:
-                raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
-                return None
+            with self.timer(caller, 'PUT'):
+                caller = Metrics.operation() if caller == None else caller
+                target_name = '' if target_name == None else target_name
+                api_headers = self.context.api_headers
+                api_headers['Content-Type'] = 'application/vnd.vmware.'+ params_type + '+xml'
+                with self.request_slot(api_url, 'task') as slot:
+                    r = self.context.transport.put(api_url, headers = api_headers, data=params) # href
+                    self.invalidate_cache(api_url)
+                    if r.status_code == expected_r_code:
+                        task_href = XmlResponse(r.content).task_href()
+                        if not wait:
+                            return slot.hold(self.time_task(caller, self.invalidate_on_done(TaskFuture(self, task_href, r, caller + ' ' + target_name), api_url)))
+                        task_success = self.wait_task(caller, task_href)
+                        self.invalidate_cache(api_url)
+                        if task_success:
+                            logger.info("%s %s %s succeeded" % (self.name, caller, target_name))
+                            return r
+                        else:
+                            logger.info("%s %s %s failed" % (self.name, caller, target_name))
+                            return None
+                    else:
+                        raise ApiError(self.name + ' ' + caller + ' ' + target_name, r.status_code, r.content)
+                        return None
         except:
             raise
 
-    def get_record(self, record_type, tag, record_filter=None, detailed=False, show=True):
+    def get_record(self, record_type, tag, record_filter=None, detailed=False, show=None, parallel=False, stream=False, compact=False):
+        # parallel=True (or a worker count) fetches pages 2..n concurrently once total is known
+        # stream=True returns the iter_records generator instead of a list
+        # compact=True returns immutable Record objects instead of xml elements
         try:
-            api_url = Container.api_url_prefix + '/query?type=' + record_type + '&format=records'
+            if stream:
+                return self.iter_records(record_type, tag, record_filter, detailed, compact=compact)
+            api_url = self.context.api_url_prefix + '/query?type=' + record_type + '&format=records'
             api_url += '&filter=(' + record_filter + ')' if record_filter != None and record_filter != '' else ''
-            records = []
-            r = self.api_get(api_url)
-            if r != None:
-                records = BeautifulSoup(r.content,'xml').find_all(tag)
-                page_size = int(BeautifulSoup(r.content,'xml').QueryResultRecords['pageSize'])            
-                total = int(BeautifulSoup(r.content,'xml').QueryResultRecords['total'])
-                for i in range(0, total/page_size):
-                    next_page_href = BeautifulSoup(r.content,'xml').find('Link',attrs={'rel':'nextPage'})['href']
-                    r = self.api_get(next_page_href)
-                    records += BeautifulSoup(r.content,'xml').find_all(tag)
+            cache = Container.query_cache
+            cache_key = (record_type, tag, record_filter or '', compact, self.context)
+            records = cache.get(cache_key) if cache != None else None
+            if records == None:
+                records = self.query_records(api_url, tag, parallel, compact)
+                if cache != None:
+                    cache.put(cache_key, records)
             if detailed:
-                entities = []
-                for record in records:
-                    entities.append(self.get_entity(record['href']))
-                records = entities
-            if show:
+                records = self.get_entities([record.get('href') for record in records])
+            if Container.showing(show):
                 Container.show_records(record_type,records)
             return records
         except:
             raise
 
-    def get_entity(self, entity_href):
+    def query_records(self, api_url, tag, parallel=False, compact=False):
+        records = []
+        r = self.api_get(api_url)
+        if r != None:
+            page = XmlResponse(r.content)
+            records = page.records(tag, compact)
+            page_size = int(page['pageSize'])
+            total = int(page['total'])
+            page_count = (total + page_size - 1) // page_size if page_size > 0 else 1
+            if parallel and page_count > 1:
+                workers = Container.page_workers if parallel is True else int(parallel)
+                records += self.get_record_pages(api_url, tag, page_size, range(2, page_count + 1), workers, compact)
+            else:
+                for i in range(1, page_count):
+                    next_page_href = page.link('nextPage')
+                    if next_page_href == None:
+                        break
+                    page = XmlResponse(self.api_get(next_page_href).content)
+                    records += page.records(tag, compact)
+        return records
+
+    def invalidate_on_done(self, task_future, api_url):
+        if Container.query_cache != None or Container.href_resolver != None:
+            task_future.add_done_callback(lambda future: self.invalidate_cache(api_url))
+        return task_future
+
+    def invalidate_cache(self, api_url):
+        # drop cached query results and resolved hrefs related to a mutated href
+        if Container.query_cache != None:
+            Container.query_cache.invalidate(api_url)
+        if Container.href_resolver != None:
+            Container.href_resolver.invalidate(api_url)
+
+    def resolve_hrefs(self, record_type, tag, name, scope=''):
+        # hrefs of the records named name, through Container.href_resolver when there is one
+        if Container.href_resolver != None:
+            return Container.href_resolver.resolve(self, record_type, tag, name, scope)
+        return [record['href'] for record in self.get_record(record_type, tag, HrefResolver.record_filter(name, scope), show=False)]
+
+    def get_record_pages(self, api_url, tag, page_size, page_numbers, workers, compact=False):
+        records = []
+        with futures.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            # map keeps page order regardless of completion order
+            for page_records in executor.map(Metrics.carry(lambda page_number: self.get_record_page(api_url, tag, page_size, page_number, compact)), page_numbers):
+                records += page_records
+        return records
+
+    def get_record_page(self, api_url, tag, page_size, page_number, compact=False):
+        r = self.api_get(api_url + '&page=' + str(page_number) + '&pageSize=' + str(page_size))
+        return XmlResponse(r.content).records(tag, compact)
+
+    def iter_records(self, record_type, tag, record_filter=None, detailed=False, read_ahead=None, compact=False):
+        # generator version of get_record, yields page by page with at most read_ahead pages in flight
+        api_url = self.context.api_url_prefix + '/query?type=' + record_type + '&format=records'
+        api_url += '&filter=(' + record_filter + ')' if record_filter != None and record_filter != '' else ''
+        read_ahead = Container.read_ahead if read_ahead == None else read_ahead
+        r = self.api_get(api_url)
+        if r == None:
+            return
+        page = XmlResponse(r.content)
+        page_size = int(page['pageSize'])
+        total = int(page['total'])
+        page_count = (total + page_size - 1) // page_size if page_size > 0 else 1
+        page_numbers = iter(range(2, page_count + 1))
+        records = page.records(tag, compact)
+        del page
+        executor = futures.ThreadPoolExecutor(max_workers=max(1, read_ahead))
+        get_record_page = Metrics.carry(self.get_record_page)
+        pending = collections.deque()
         try:
-            r = self.api_get(entity_href)
+            for page_number in itertools.islice(page_numbers, read_ahead):
+                pending.append(executor.submit(get_record_page, api_url, tag, page_size, page_number, compact))
+            while True:
+                if detailed:
+                    records = self.get_entities([record.get('href') for record in records])
+                for record in records:
+                    yield record
+                if read_ahead <= 0:
+                    page_number = next(page_numbers, None)
+                    if page_number == None:
+                        break
+                    records = self.get_record_page(api_url, tag, page_size, page_number, compact)
+                    continue
+                if not pending:
+                    break
+                records = pending.popleft().result()
+                for page_number in itertools.islice(page_numbers, 1):
+                    pending.append(executor.submit(get_record_page, api_url, tag, page_size, page_number, compact))
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def get_entity(self, entity_href, timeout=None):
+        try:
+            r = self.api_get(entity_href, timeout=timeout)
             return r.content if r != None else None
         except:
             raise
 
+    def get_entities(self, entity_hrefs, workers=None, timeout=None, return_exceptions=False):
+        # get entities on a bounded thread pool, results keep entity_hrefs order
+        # one failure does not abort the batch: the first error is raised once all are done,
+        # or with return_exceptions a failed entity is returned as its exception
+        workers = Container.hydration_workers if workers == None else workers
+        timeout = Container.hydration_timeout if timeout == None else timeout
+        def get_entity(entity_href):
+            try:
+                return self.get_entity(entity_href, timeout)
+            except Exception as e:
+                logger.warning("%s get_entity %s failed: %s" % (self.name, entity_href, e))
+                return e
+        with futures.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            entities = list(executor.map(Metrics.carry(get_entity), entity_hrefs))
+        if not return_exceptions:
+            for entity in entities:
+                if isinstance(entity, Exception):
+                    raise entity
+        return entities
+
+    @staticmethod
+    def transfer_file(entity, transfer_href):
+        # File element of an entity's Files section by its transfer link
+        for transfer_file in XmlResponse(entity).find_all('File'):
+            link = transfer_file.find('{*}Link')
+            if link != None and link.get('href') == transfer_href:
+                return transfer_file
+        return None
+
+    def upload_file(self, entity_href, transfer_href, file_path, offset=0, headers=None, streams=None, part_size=None):
+        # uploads one file from offset, see upload_files
+        return self.upload_files(entity_href, [(transfer_href, file_path, offset)], headers, streams, part_size)
+
+    def upload_files(self, entity_href, uploads, headers=None, streams=None, part_size=None):
+        # uploads (transfer_href, file_path, offset) to transfer links of entity_href
+        # files are split in part_size ranges (Container.upload_part_size, 0 for one range per file)
+        # and all ranges go up on streams concurrent PUTs (Container.upload_streams)
+        # each file is verified against bytesTransferred once its last range is done
+        # ranges done are kept in the transfer journal: a file with journaled ranges for the same transfer link
+        # resumes from them, otherwise from offset
+        # returns True when vCD reports all files complete, the first api error is raised once all are done
+        streams = Container.upload_streams if streams == None else streams
+        part_size = Container.upload_part_size if part_size == None else part_size
+        journal = TransferJournal.open()
+        parts = []
+        sent = {}
+        for transfer_href, file_path, offset in uploads:
+            file_size = FileSlice.file_size(file_path)
+            done = journal.resume('upload', file_path, transfer_href, file_size) if journal != None else []
+            gaps = TransferJournal.gaps(done if len(done) > 0 else [(0, offset)], file_size)
+            step = max(1, part_size if part_size > 0 else file_size)
+            file_parts = []
+            for gap_start, gap_end in gaps:
+                file_parts += [(transfer_href, file_path, start, end, file_size) for start, end in FileSlice.ranges(file_path, gap_start, gap_end, step)]
+            parts += file_parts if len(file_parts) > 0 else [(transfer_href, file_path, file_size, file_size, file_size)]
+            sent[file_path] = file_size - sum(end - start for start, end in gaps)
+        streams = max(1, min(streams, len(parts)))
+        progress = ThrottledProgress(TransferProgress() if streams > 1 else TransferProgress.stderr)
+        remaining = collections.Counter(part[1] for part in parts)
+        failed = set()
+        error = None
+        lock = threading.Lock()
+        def advance(file_path, file_size, count):
+            with lock:
+                sent[file_path] += count
+                done = sent[file_path]
+            progress(file_path, done, file_size)
+        upload_part = Metrics.carry(self.upload_part)
+        with futures.ThreadPoolExecutor(max_workers=streams) as executor:
+            pending = dict((executor.submit(upload_part, transfer_href, file_path, start, end, file_size, headers, advance, journal=journal), (transfer_href, file_path))
+                for transfer_href, file_path, start, end, file_size in parts)
+            for future in futures.as_completed(pending):
+                transfer_href, file_path = pending[future]
+                try:
+                    future.result()
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    logger.warning("upload %s interrupted: %s" % (file_path, e))
+                    failed.add(file_path)
+                except Exception as e:
+                    error = e if error == None else error
+                    failed.add(file_path)
+                remaining[file_path] -= 1
+                if remaining[file_path] > 0:
+                    continue
+                transfer_file = Container.transfer_file(self.get_entity(entity_href), transfer_href) if file_path not in failed else None
+                if transfer_file != None and int(transfer_file.get('bytesTransferred')) == FileSlice.file_size(file_path):
+                    logger.info("upload %s succeeded" % (file_path))
+                elif file_path in failed:
+                    logger.info("upload %s failed" % (file_path))
+                    continue
+                else:
+                    # vCD disagrees with the ranges sent, they cannot be resumed from
+                    logger.info("upload %s failed" % (file_path))
+                    failed.add(file_path)
+                if journal != None:
+                    journal.forget('upload', file_path)
+        if error != None:
+            raise error
+        return len(failed) == 0
+
+    @operation_tag
+    def upload_part(self, transfer_href, file_path, start, end, file_size, headers=None, advance=None, retries=None, journal=None):
+        # PUTs bytes [start, end) of file_path as one Content-Range, retried on its own with backoff
+        # advance(file_path, file_size, count) follows the bytes read, a retry takes back its attempt's bytes
+        # the range and its crc32 are added to journal once vCD accepted it
+        if end <= start and file_size > 0:
+            # nothing left to send, the file is only verified
+            return None
+        retries = Container.upload_part_retries if retries == None else retries
+        headers = dict(headers or {})
+        headers['Content-Range'] = 'bytes %d-%d/%d' % (start, end - 1, file_size)
+        on_read = (lambda count: advance(file_path, file_size, count)) if advance != None else None
+        attempt = 0
+        while True:
+            body = FileSlice(file_path, start, end, on_read, checksum=journal != None)
+            try:
+                with self.request_slot(transfer_href, 'transfer'):
+                    r = self.context.transport.put(transfer_href, headers=headers, data=body)
+                if r.status_code == requests.codes.ok:
+                    if journal != None and end > start:
+                        journal.add('upload', file_path, start, end, body.checksum)
+                    return r
+                error = ApiError(Metrics.operation() + ' ' + file_path, r.status_code, r.content)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            if attempt >= retries:
+                raise error
+            if on_read != None:
+                on_read(-body.sent)
+            delay = min(Container.retry_max_backoff, Container.retry_backoff * 2 ** attempt)
+            logger.warning("upload %s bytes %d-%d failed: %s, retry %d in %.1fs" % (file_path, start, end - 1, error, attempt + 1, delay))
+            time.sleep(delay)
+            attempt += 1
+
+    @operation_tag
+    def download_file(self, href, file_path, progress=None):
+        # GETs href into file_path, with a Range request from the end of the ranges in the transfer journal,
+        # of which only the last one written is checked against the file
+        # a range and its crc32 are journaled every Container.journal_interval bytes, once flushed to disk
+        # returns True when the whole file is written, False when the transfer broke off and can be resumed
+        journal = TransferJournal.open()
+        throttled = ThrottledProgress(TransferProgress(direction='download') if progress == None else progress)
+        offset = 0
+        if journal != None:
+            offset = TransferJournal.prefix(journal.resume('download', file_path, href, verify_last=True))
+            size = journal.entry('download', file_path)['size']
+            if offset > 0 and offset == size:
+                logger.info("download %s already complete" % (file_path))
+                journal.forget('download', file_path)
+                return True
+        # the transfer slot is held until the body is read
+        with self.request_slot(href, 'transfer') as slot:
+            r = self.context.transport.get(href, headers={'Range': 'bytes=%d-' % offset} if offset > 0 else {}, stream=True)
+            content_range = r.headers.get('content-range', '')
+            if offset > 0 and r.status_code == requests.codes.partial_content:
+                size = content_range.split('/')[-1]
+                size = int(size) if size.isdigit() else None
+                if not content_range.startswith('bytes %d-' % offset) or size != journal.entry('download', file_path)['size']:
+                    # another range than asked, or the source changed since the ranges were journaled: start over
+                    logger.info("download %s cannot resume at %d, restarting" % (file_path, offset))
+                    r.close()
+                    slot.release()
+                    journal.forget('download', file_path)
+                    return self.download_file(href, file_path, progress)
+                logger.info("resuming download %s at %d" % (file_path, offset))
+            elif r.status_code == requests.codes.ok:
+                offset = 0
+                size = int(r.headers['content-length']) if 'content-length' in r.headers else None
+                if journal != None:
+                    journal.start('download', file_path, href, size)
+            else:
+                raise ApiError(Metrics.operation() + ' ' + file_path, r.status_code, r.content)
+            position = checkpoint = offset
+            checksum = 0
+            try:
+                with open(file_path, 'r+b' if offset > 0 else 'wb') as file:
+                    file.seek(offset)
+                    file.truncate()
+                    for chunk in r.iter_content(Container.chunk_size):
+                        file.write(chunk)
+                        position += len(chunk)
+                        if journal != None:
+                            checksum = zlib.crc32(chunk, checksum) & 0xffffffff
+                            if position - checkpoint >= Container.journal_interval:
+                                file.flush()
+                                os.fsync(file.fileno())
+                                journal.add('download', file_path, checkpoint, position, checksum)
+                                checkpoint, checksum = position, 0
+                        if size != None:
+                            throttled(file_path, position, size)
+            except requests.exceptions.RequestException as e:
+                logger.warning("download %s interrupted at %d: %s" % (file_path, position, e))
+                return False
+        if size != None and position != size:
+            logger.warning("download %s interrupted at %d of %d bytes" % (file_path, position, size))
+            return False
+        if journal != None:
+            journal.forget('download', file_path)
+        logger.info("download %s succeeded" % (file_path))
+        return True
+
     def get_href(self, record_type, tag):
         try:
-            links = self.get_record(record_type, tag, 'name==' + self.name,show=False)
+            links = self.resolve_hrefs(record_type, tag, self.name)
             if len(links) == 0:
                 logger.info("%s does not exist" % (self.name))
                 return None
@@ -328,7 +2041,7 @@ class Container(yaml.YAMLObject):
                 logger.info("more than one %s found" % (self.name))
                 return None
             else:
-                return links[0]['href']
+                return links[0]
         except:
             raise
 
@@ -358,51 +2071,52 @@ class Container(yaml.YAMLObject):
                         actions[link_attrs['href'].split('/')[-1]]=link_attrs['href']
                 return actions
 
-    def get_section(self, section, show=True):
+    def get_section(self, section, show=None):
         try:
             r = self.api_get(self.href + section)
             records = [r.content if r != None else None]
-            if show:
+            if Container.showing(show):
                 self.show_records(section, records)
             return records[0]
         except:
             raise
 
+    @operation_tag
     def set_section(self, section, params):
             if str(section) not in self.sections:
                 logger.info("%s not in %s" % (section, self.sections.keys()))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], section))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), section))
                 return
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('vcloud.' + self.sections[section], self.href + section, params, requests.codes.accepted, inspect.stack()[0][3], section)
+            params = Payload.serialize(params)
+            self.api_put_params('vcloud.' + self.sections[section], self.href + section, params, requests.codes.accepted, target_name=section)
 
-    def get_task_progress(self,task_href,show_progress=True,wait=True):
+    def get_task_progress(self,task_href,show_progress=True,wait=True,poller=None):
         try:
-            while wait:
+            if not wait:
+                return True
+            poller = TaskPoller() if poller == None else poller
+            delays = poller.delays()
+            while True:
                 r = self.api_get(task_href)
-                if r != None:
-                    task_status = BeautifulSoup(r.content,'xml').Task['status']
-                    task_operation_name = BeautifulSoup(r.content,'xml').Task['operationName']
-                    owner = BeautifulSoup(r.content,'xml').find('Owner')
-                    task_owner = owner['name'] if owner.has_attr('name') else ''
-                    progress = BeautifulSoup(r.content,'xml').Task.find('Progress')
-                    if progress != None and show_progress:
-                        logger.info("task %s %s progress: %s%%" % (task_operation_name, task_owner, progress.string))
-                    if task_status != 'running' and task_status != 'queued':
-                        if task_status != 'error':
-                            logger.info("task %s %s completed successfully" % (task_operation_name, task_owner))
-                            return True
-                        else:
-                            raise ApiError(task_operation_name + ' ' + task_owner, r.status_code, r.content)
-                            return False
-                        break
-                else:
+                if r == None:
                     return False
-                time.sleep(1)
-            return True
+                task_status, task_operation_name, task_owner, progress = XmlResponse(r.content).task()
+                if progress != None and show_progress:
+                    logger.info("task %s %s progress: %s%%" % (task_operation_name, task_owner, progress))
+                if task_status not in TaskPoller.pending_statuses:
+                    if task_status != 'error':
+                        logger.info("task %s %s completed successfully" % (task_operation_name, task_owner))
+                        return True
+                    else:
+                        raise ApiError(task_operation_name + ' ' + task_owner, r.status_code, r.content)
+                delay = next(delays, None)
+                if delay == None:
+                    raise ApiError(task_operation_name + ' ' + task_owner, 'timeout', task_href)
+                time.sleep(delay)
         except:
             raise
 
+    @operation_tag
     def set_task(self,task_href,status): 
             r = self.api_get(task_href)
             if r != None:
@@ -411,18 +2125,21 @@ class Container(yaml.YAMLObject):
                     tag.name = 'vcloud:' + tag.name
                 params.find('vcloud:Task')['status'] = status
                 params.find('vcloud:Task')['xmlns:vcloud'] = 'http://www.vmware.com/vcloud/v1.5'
-                params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-                self.api_put_params('vcloud.task', task_href, params, requests.codes.ok, inspect.stack()[0][3], task_href)
+                params = Payload.serialize(params)
+                self.api_put_params('vcloud.task', task_href, params, requests.codes.ok, target_name=task_href)
 
     def del_task(self,task_href): 
             r = self.api_get(task_href)
             if r != None:
-                task_owner = BeautifulSoup(r.content,'xml').find('Owner')['name']
-                task_status = BeautifulSoup(r.content,'xml').Task['status']
-                task_operation_name = BeautifulSoup(r.content,'xml').Task['operationName']
+                task = XmlResponse(r.content)
+                task_owner = task.find('Owner')['name']
+                task_status = task['status']
+                task_operation_name = task['operationName']
             else:
                 return False
-            r = requests.post(task_href + '/action/cancel', headers = Container.api_headers)
+            # a read slot: task slots may all be held by the tasks being cancelled
+            with self.request_slot(task_href, 'read'):
+                r = self.context.transport.post(task_href + '/action/cancel', headers = self.context.api_headers)
             if r.status_code == requests.codes.no_content:
                 self.get_task_progress(task_href,True,False)
                 logger.info("task %s %s cancelled" % (task_operation_name, task_owner))
@@ -431,49 +2148,62 @@ class Container(yaml.YAMLObject):
                 ApiError(task_operation_name + ' ' + task_owner, r.status_code, r.content)
                 return False
 
-    def start(self,power_on=True):
-            params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
-            params.append(Tag(builder=builder.TreeBuilder(),name='DeployVAppParams',attrs={'powerOn':str(power_on).lower(),
-                'xmlns':'http://www.vmware.com/vcloud/v1.5'}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.deployVAppParams', self.href + '/action/deploy', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+    @staticmethod
+    def deploy_params(power_on):
+            E = Payload.E
+            return Payload.serialize(E.DeployVAppParams(powerOn=Payload.text(power_on)))
+
+    @staticmethod
+    def undeploy_params(power_action):
+            E = Payload.E
+            return Payload.serialize(E.UndeployVAppParams(E.UndeployPowerAction(power_action)))
+
+    @operation_tag
+    def start(self,power_on=True,wait=True):
+            params = Container.deploy_params(power_on)
+            return self.api_post_params('vcloud.deployVAppParams', self.href + '/action/deploy', params, requests.codes.accepted, target_name=self.name, wait=wait)
 
-    def stop(self,power_action='default'):
+    @operation_tag
+    def stop(self,power_action='default',wait=True):
             if power_action not in Container.undeploy_power_actions:
                 logger.info("%s not in %s" % (power_action,Container.undeploy_power_actions))
                 return
-            params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
-            params.append(Tag(builder=builder.TreeBuilder(),name='UndeployVAppParams',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5'}))
-            params.UndeployVAppParams.append(Tag(builder=builder.TreeBuilder(),name='UndeployPowerAction'))
-            params.UndeployVAppParams.UndeployPowerAction.string = power_action
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.undeployVAppParams', self.href + '/action/undeploy', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Container.undeploy_params(power_action)
+            return self.api_post_params('vcloud.undeployVAppParams', self.href + '/action/undeploy', params, requests.codes.accepted, target_name=self.name, wait=wait)
 
-    def power_on(self):
-            self.api_post(self.href + '/power/action/powerOn', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def power_on(self, wait=True):
+            return self.api_post(self.href + '/power/action/powerOn', requests.codes.accepted, wait=wait)
 
-    def power_off(self):
-            self.api_post(self.href + '/power/action/powerOff', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def power_off(self, wait=True):
+            return self.api_post(self.href + '/power/action/powerOff', requests.codes.accepted, wait=wait)
 
-    def reset(self):
-            self.api_post(self.href + '/power/action/reset', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def reset(self, wait=True):
+            return self.api_post(self.href + '/power/action/reset', requests.codes.accepted, wait=wait)
 
-    def suspend(self):
-            self.api_post(self.href + '/power/action/suspend', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def suspend(self, wait=True):
+            return self.api_post(self.href + '/power/action/suspend', requests.codes.accepted, wait=wait)
 
-    def discard_suspend(self):
-            self.api_post(self.href + '/action/discardSuspendedState', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def discard_suspend(self, wait=True):
+            return self.api_post(self.href + '/action/discardSuspendedState', requests.codes.accepted, wait=wait)
 
-    def shutdown(self):
-            self.api_post(self.href + '/power/action/shutdown', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def shutdown(self, wait=True):
+            return self.api_post(self.href + '/power/action/shutdown', requests.codes.accepted, wait=wait)
 
-    def reboot(self):
-            self.api_post(self.href + '/power/action/reboot', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def reboot(self, wait=True):
+            return self.api_post(self.href + '/power/action/reboot', requests.codes.accepted, wait=wait)
 
     def get_owner(self):
             r = self.api_get(self.href + '/owner')
             return BeautifulSoup(r.content,'xml').Owner.User if r != None else None
             
+    @operation_tag
     def set_owner(self,user_name):
             user_record = self.get_record('user', 'UserRecord', 'name==' + user_name, show=False)
             if len(user_record) == 0:
@@ -482,14 +2212,15 @@ class Container(yaml.YAMLObject):
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='Owner',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5'}))
             params.Owner.append(Tag(builder=builder.TreeBuilder(),name='User',attrs={'href':user_record[0]['href']}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('vcloud.owner', self.href + '/owner', params, requests.codes.ok, inspect.stack()[0][3], user_name)
+            params = Payload.serialize(params)
+            self.api_put_params('vcloud.owner', self.href + '/owner', params, requests.codes.ok, target_name=user_name)
 
     def get_metadata_entries(self):
         records = BeautifulSoup(self.get_section('/metadata',show=False),'xml').find_all('MetadataEntry')
         self.show_records('metadata_entry',records)
         return records
 
+    @operation_tag
     def add_metadata_entry(self,key,value,value_type='MetadataStringValue',system_domain=False,visibility='READONLY'):
         if len(key) > 256:
             logger.info("%s is too long (>256)" % (key))
@@ -524,11 +2255,12 @@ class Container(yaml.YAMLObject):
         params.Metadata.append(Tag(builder=builder.TreeBuilder(),name='TypedValue',attrs={'xsi:type':value_type}))
         params.Metadata.TypedValue.append(Tag(builder=builder.TreeBuilder(),name='Value'))
         params.Metadata.TypedValue.Value.string = str(value)
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.metadata', self.href + '/metadata', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.metadata', self.href + '/metadata', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def del_metadata_entry(self,key):
-        self.api_delete(self.href + '/metadata/' + key, inspect.stack()[0][3], self.name)
+        self.api_delete(self.href + '/metadata/' + key, target_name=self.name)
 
     def get_metadata_entry_value(self,key,system_domain=False):
         domain = 'SYSTEM/' if system_domain == True else ''
@@ -536,6 +2268,7 @@ class Container(yaml.YAMLObject):
         self.show_records('metadata_value',records)
         return records[0]
 
+    @operation_tag
     def set_metadata_entry_value(self,key,value,value_type='MetadataStringValue',system_domain=False):
         domain = 'SYSTEM/' if system_domain == True else ''
         params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
@@ -544,8 +2277,8 @@ class Container(yaml.YAMLObject):
         params.MetadataValue.append(Tag(builder=builder.TreeBuilder(),name='TypedValue',attrs={'xsi:type':value_type})) 
         params.MetadataValue.TypedValue.append(Tag(builder=builder.TreeBuilder(),name='Value'))
         params.MetadataValue.TypedValue.Value.string = value
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_put_params('vcloud.metadata.value', self.href + '/metadata/' + domain + key, params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_put_params('vcloud.metadata.value', self.href + '/metadata/' + domain + key, params, requests.codes.accepted, target_name=self.name)
 
     @staticmethod
     def is_hostname(name):
@@ -678,9 +2411,12 @@ class Container(yaml.YAMLObject):
     @staticmethod
     def convertXml2Yaml(in_xml):
         try:
+            # records come as lxml elements, bs4 tags, compact Records or raw response bodies
+            if not isinstance(in_xml, (bytes, Tag)) and not etree.iselement(in_xml):
+                in_xml = u'%s' % in_xml
             # replace xmlns to suppress namespace on tag
             # parser recover=True to tolerate undeclared prefix
-            root = etree.fromstring(str(in_xml).replace('xmlns','xmlnamespace'),etree.XMLParser(recover=True,ns_clean=True))
+            root = etree.fromstring(Payload.serialize(in_xml).replace(b'xmlns',b'xmlnamespace'),etree.XMLParser(recover=True,ns_clean=True))
             # Convert the DOM tree into "YAML-able" data structures.
             out = Container.convertXml2YamlAux(root)
             # Ask YAML to dump the data structures to a string.
@@ -719,15 +2455,46 @@ class Container(yaml.YAMLObject):
             return 1
 
     @staticmethod
-    def show_records(record_type,records):
-        try:
-            if records == None:
-                return
-            for i in range(len(records)):
-                logger.info("%s[%d]:" % (record_type,i) + "\n" + Container.convertXml2Yaml(str(records[i])))
-            logger.info("%d %s found" % (len(records),record_type))
-        except:
-            raise
+    def showing(show):
+        return Container.show_default if show == None else show
+
+    @staticmethod
+    def show_records(record_type,records,stream=None):
+        # yaml is rendered lazily by the log handlers and not at all when INFO is disabled
+        # with a stream (or Container.show_stream) records are written there one by one instead
+        if records == None:
+            return
+        stream = Container.show_stream if stream == None else stream
+        if stream != None:
+            return Container.dump_records(record_type, records, stream)
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        count = 0
+        for i, record in enumerate(records):
+            if isinstance(record, Exception):
+                logger.info("%s[%d]: %r", record_type, i, record)
+            else:
+                logger.info("%s[%d]:\n%s", record_type, i, RecordYaml(record))
+            count += 1
+        logger.info("%d %s found", count, record_type)
+
+    @staticmethod
+    def dump_records(record_type,records,stream=None):
+        # streams records as yaml documents to a file object or path, sys.stdout by default
+        # records may be a generator such as get_record(..., stream=True), nothing is kept in memory
+        if isinstance(stream, (str, type(u''))):
+            with open(stream, 'w') as file:
+                return Container.dump_records(record_type, records, file)
+        stream = sys.stdout if stream == None else stream
+        count = 0
+        for i, record in enumerate(records):
+            if isinstance(record, Exception):
+                stream.write("# %s[%d]: %r\n" % (record_type, i, record))
+            else:
+                stream.write("--- # %s[%d]\n%s" % (record_type, i, Container.convertXml2Yaml(record)))
+            count += 1
+        stream.write("# %d %s found\n" % (count, record_type))
+        return count
  
     @staticmethod
     def handle_exception(exc):
@@ -738,32 +2505,339 @@ class Container(yaml.YAMLObject):
         else:
             logger.exception('')
 
-class UploadInChunks(Container):
-    def __init__(self, file_path, offset, chunksize=1 << Container.max_chunk_size):
+class ThrottledProgress(object):
+    # forwards progress(file_path, done, total) at most every interval seconds per file, and always on completion
+    # called from the upload threads of all parts of a file
+    def __init__(self, progress, interval=None):
+        self.progress = progress
+        self.interval = Container.progress_interval if interval == None else interval
+        self.last = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, file_path, done, total):
+        now = time.time()
+        with self.lock:
+            if done < total and now - self.last.get(file_path, 0) < self.interval:
+                return
+            self.last[file_path] = now
+        self.progress(file_path, done, total)
+
+class TransferProgress(object):
+    # progress of concurrent transfers, one log line per file every step percent instead of a shared stderr line
+    def __init__(self, step=10, direction='upload'):
+        self.step = step
+        self.direction = direction
+        self.reported = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, file_path, done, total):
+        percent = int(done * 100 / total) if total else 100
+        with self.lock:
+            last = self.reported.get(file_path)
+            if last != None and percent < last + self.step and (percent < 100 or last == 100):
+                return
+            self.reported[file_path] = percent
+        logger.info("%s %s %d/%d bytes %d%%" % (self.direction, file_path, done, total, percent))
+
+    @staticmethod
+    def stderr(file_path, done, total):
+        # single transfer progress on one stderr line
+        percent = done * 1e2 / total if total else 1e2
+        sys.stderr.write("\rupload {} {} progress:{percent:3.0f}%".format(file_path, done, percent=percent))
+        if done >= total:
+            sys.stderr.write("\n")
+
+class FileSlice(object):
+    # request body of bytes [start, end) of a file, iterated in chunksize pieces without copying:
+    # memoryview slices of mmap windows (Container.upload_mmap), or of one buffer refilled with readinto
+    # reads are positional so concurrent slices of one file never share a file position
+    # file_path may be an OvaMember, whose bytes are read in place from the archive
+    # iterable rather than file-like: http.client would read a file-like body in 8k blocks
+    # a yielded chunk is only valid until the next one is requested
+    window = 64*1024*1024
+
+    def __init__(self, file_path, start, end, on_read=None, chunksize=None, checksum=False):
+        if isinstance(file_path, OvaMember):
+            start, end = file_path.locate(start, end)
+            file_path = file_path.archive_path
         self.file_path = file_path
-        self.chunksize = chunksize
-        self.totalsize = os.path.getsize(file_path)
-        self.readsofar = offset
+        self.start = start
+        self.end = end
+        self.chunksize = Container.chunk_size if chunksize == None else chunksize
+        self.sent = 0
+        self.on_read = on_read
+        self.checksum = 0 if checksum else None # crc32 of the bytes sent
 
     def __iter__(self):
         with open(self.file_path, 'rb') as file:
-            file.seek(self.readsofar)
-            while True:
-                data = file.read(self.chunksize)
-                if not data:
-                    sys.stderr.write("\n")
+            chunks = self.mapped_chunks(file) if Container.upload_mmap and self.end > self.start else self.buffered_chunks(file)
+            for chunk in chunks:
+                self.sent += len(chunk)
+                if self.checksum != None:
+                    self.checksum = zlib.crc32(chunk, self.checksum) & 0xffffffff
+                if self.on_read != None:
+                    self.on_read(len(chunk))
+                yield chunk
+
+    def mapped_chunks(self, file):
+        position = self.start
+        while position < self.end:
+            # mmap offsets must be multiples of the allocation granularity
+            base = position - position % mmap.ALLOCATIONGRANULARITY
+            length = min(self.end, base + max(FileSlice.window, self.chunksize)) - base
+            window = mmap.mmap(file.fileno(), length, access=mmap.ACCESS_READ, offset=base)
+            try:
+                if hasattr(window, 'madvise'):
+                    window.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(window) as view:
+                    while position < base + length:
+                        chunk = view[position - base:min(position - base + self.chunksize, length)]
+                        position += len(chunk)
+                        try:
+                            yield chunk
+                        finally:
+                            chunk.release()
+            finally:
+                window.close()
+
+    def buffered_chunks(self, file):
+        with memoryview(bytearray(self.chunksize)) as buffer:
+            position = self.start
+            while position < self.end:
+                size = min(self.chunksize, self.end - position)
+                if hasattr(os, 'preadv'):
+                    count = os.preadv(file.fileno(), [buffer[:size]], position)
+                else:
+                    file.seek(position)
+                    count = file.readinto(buffer[:size])
+                if not count:
                     break
-                self.readsofar += len(data)
-                percent = self.readsofar * 1e2 / self.totalsize
-                sys.stderr.write("\rupload {} {} progress:{percent:3.0f}%".format(self.file_path,self.readsofar,percent=percent))
-                yield data
+                position += count
+                chunk = buffer[:count]
+                try:
+                    yield chunk
+                finally:
+                    chunk.release()
 
     def __len__(self):
-        return self.totalsize
+        # Content-Length for requests
+        return self.end - self.start
+
+    @staticmethod
+    def file_size(file_path):
+        return file_path.size if isinstance(file_path, OvaMember) else os.path.getsize(file_path)
+
+    @staticmethod
+    def file_mtime(file_path):
+        # None when the file does not exist
+        file_path = file_path.archive_path if isinstance(file_path, OvaMember) else file_path
+        return os.path.getmtime(file_path) if os.path.isfile(file_path) else None
+
+    @staticmethod
+    def ranges(file_path, start, end, step):
+        # [start, end) in ranges of at most step bytes that each lie in one part of an OvaMember
+        bounds = file_path.bounds() if isinstance(file_path, OvaMember) else []
+        ranges = []
+        while start < end:
+            stop = min([start + step, end] + [bound for bound in bounds if bound > start])
+            ranges.append((start, stop))
+            start = stop
+        return ranges
+
+class OvaMember(object):
+    # file of an uncompressed ova uploaded in place: byte ranges of the archive, one per tar member
+    # as a large file may be split in name.000000000, name.000000001, ... members
+    part_suffix = re.compile(r'^(.*)\.(\d{9})$')
+
+    def __init__(self, archive_path, name, segments):
+        self.archive_path = archive_path
+        self.name = name
+        self.segments = segments # [(offset in the archive, size)] in file order
+        self.size = sum(size for offset, size in segments)
+
+    def __str__(self):
+        return os.path.abspath(self.archive_path) + '/' + self.name
+
+    @staticmethod
+    def members(archive_path):
+        # OvaMember of each file of the archive by file name, read from the tar headers only
+        parts = collections.defaultdict(list)
+        with tarfile.open(archive_path, 'r:') as tar:
+            for info in tar.getmembers():
+                if not info.isfile():
+                    continue
+                if info.issparse():
+                    raise ValueError("%s: sparse member %s cannot be read in place" % (archive_path, info.name))
+                match = OvaMember.part_suffix.match(info.name)
+                name, index = (match.group(1), int(match.group(2))) if match else (info.name, 0)
+                parts[os.path.basename(name)].append((index, info.offset_data, info.size))
+        return dict((name, OvaMember(archive_path, name, [(offset, size) for index, offset, size in sorted(segments)]))
+            for name, segments in parts.items())
+
+    def bounds(self):
+        # file offsets where a member ends and the next begins
+        bounds = []
+        position = 0
+        for offset, size in self.segments[:-1]:
+            position += size
+            bounds.append(position)
+        return bounds
+
+    def locate(self, start, end):
+        # archive range of file range [start, end), which must lie in one member
+        position = 0
+        for offset, size in self.segments:
+            if start < position + size:
+                if end > position + size:
+                    raise ValueError("%s bytes %d-%d span two archive members" % (self, start, end - 1))
+                return offset + start - position, offset + end - position
+            position += size
+        return 0, 0
+
+class TransferJournal(object):
+    # checkpoints of uploads and downloads in a local json file, so a transfer broken off,
+    # even by a process restart, resumes after its last verified byte range
+    # an entry per direction and local file: transfer href, size, file mtime and [start, end, crc32] of each range done
+    # entries are dropped once their file completes, or when their href or size no longer match
+    journals = {}
+    journals_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.touched = set()
+        self.entries = self.load()
+
+    @staticmethod
+    def open(path=None):
+        # journal shared by all transfers of the process, None when Container.journal_path is None
+        path = Container.journal_path if path == None else path
+        if not path:
+            return None
+        with TransferJournal.journals_lock:
+            if path not in TransferJournal.journals:
+                TransferJournal.journals[path] = TransferJournal(path)
+            return TransferJournal.journals[path]
+
+    @staticmethod
+    def key(direction, file_path):
+        return direction + ' ' + os.path.abspath(str(file_path))
+
+    @staticmethod
+    def checksum(file_path, start, end):
+        body = FileSlice(file_path, start, end, checksum=True)
+        for chunk in body:
+            pass
+        return body.checksum
+
+    @staticmethod
+    def gaps(ranges, size):
+        # parts of [0, size) not covered by ranges
+        gaps = []
+        position = 0
+        for start, end in sorted(ranges):
+            if start > position:
+                gaps.append((position, start))
+            position = max(position, end)
+        if position < size:
+            gaps.append((position, size))
+        return gaps
+
+    @staticmethod
+    def prefix(ranges):
+        # end of the contiguous ranges from 0
+        position = 0
+        for start, end in sorted(ranges):
+            if start > position:
+                break
+            position = max(position, end)
+        return position
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as file:
+                return json.load(file)
+        except ValueError as e:
+            logger.warning("ignoring unreadable transfer journal %s: %s" % (self.path, e))
+            return {}
+
+    def save(self):
+        # merged into the file as it is now so other processes keep their entries, then replaced atomically
+        entries = self.load()
+        for key in self.touched:
+            if key in self.entries:
+                entries[key] = self.entries[key]
+            else:
+                entries.pop(key, None)
+        if len(entries) == 0:
+            if os.path.isfile(self.path):
+                os.remove(self.path)
+            return
+        temp_path = '%s.%d.tmp' % (self.path, os.getpid())
+        with open(temp_path, 'w') as file:
+            json.dump(entries, file)
+        getattr(os, 'replace', os.rename)(temp_path, self.path)
+
+    def entry(self, direction, file_path):
+        with self.lock:
+            entry = self.entries.get(TransferJournal.key(direction, file_path))
+            return dict(entry) if entry != None else None
+
+    def start(self, direction, file_path, href, size):
+        # new entry without ranges, replacing any other
+        key = TransferJournal.key(direction, file_path)
+        mtime = FileSlice.file_mtime(file_path)
+        with self.lock:
+            self.entries[key] = {'href': href, 'size': size, 'mtime': mtime, 'ranges': []}
+            self.touched.add(key)
+
+    def resume(self, direction, file_path, href, size=None, verify_last=False):
+        # ranges [start, end) of file_path already transferred for href, a size of None matches any
+        # ranges are checked against their crc32 when the file changed since the entry was written,
+        # with verify_last only the range ending last is, for a file that is being written such as a download
+        entry = self.entry(direction, file_path)
+        if entry == None or entry['href'] != href or (size != None and entry['size'] != None and entry['size'] != size):
+            self.start(direction, file_path, href, size)
+            return []
+        ranges = entry['ranges']
+        if FileSlice.file_mtime(file_path) == None:
+            ranges = []
+        elif verify_last:
+            file_size = FileSlice.file_size(file_path)
+            ranges = sorted(r for r in ranges if r[1] <= file_size)
+            if len(ranges) > 0 and TransferJournal.checksum(file_path, ranges[-1][0], ranges[-1][1]) != ranges[-1][2]:
+                ranges = ranges[:-1]
+        elif entry['mtime'] != FileSlice.file_mtime(file_path):
+            file_size = FileSlice.file_size(file_path)
+            ranges = [r for r in ranges if r[1] <= file_size and TransferJournal.checksum(file_path, r[0], r[1]) == r[2]]
+        self.start(direction, file_path, href, entry['size'] if size == None else size)
+        with self.lock:
+            self.entries[TransferJournal.key(direction, file_path)]['ranges'] = ranges
+        return [(start, end) for start, end, checksum in ranges]
+
+    def add(self, direction, file_path, start, end, checksum):
+        # records a range once it is transferred, on disk before returning
+        key = TransferJournal.key(direction, file_path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry == None:
+                return
+            entry['ranges'].append([start, end, checksum])
+            entry['mtime'] = FileSlice.file_mtime(file_path)
+            self.save()
+
+    def forget(self, direction, file_path):
+        key = TransferJournal.key(direction, file_path)
+        with self.lock:
+            if self.entries.pop(key, None) != None:
+                self.touched.add(key)
+                self.save()
 
 class Session(Container):
     
-    def __init__(self, alias):
+    def __init__(self, alias, transport=None, pool_size=None, keep_alive=True, retry_policy=None):
         try:
             logger.debug("get credential from config by alias then connect")
             with open(Container.conf_path, 'r') as conf_file:
@@ -774,27 +2848,30 @@ class Session(Container):
             else:
                 raise ValueError("%s does not exist" % (alias))
             self.hostname = credential['credential']['host']
-            Container.api_url_prefix = "https://" + self.hostname + "/api" 
             self.org_name = credential['credential']['org']
-            Container.session_org_name = self.org_name
             self.username = credential['credential']['user']
             self.password = credential['credential']['pass']
-            Container.__init__(self, self.username + '@' + self.org_name + '@' + self.hostname)
+            pool_size = Container.pool_size if pool_size == None else pool_size
+            transport = Transport(pool_size, keep_alive, retry_policy=retry_policy) if transport == None else transport
+            Container.__init__(self, self.username + '@' + self.org_name + '@' + self.hostname,
+                ClientContext("https://" + self.hostname + "/api", (), self.org_name, transport))
             self.token = None
             self.href = self.connect()
+            Container.default_context = self.context
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def connect(self):
         try:
             logger.debug("set api_vesion to highest supported")
-            api_url = Container.api_url_prefix + "/versions"
+            api_url = self.context.api_url_prefix + "/versions"
             r = self.api_get(api_url)
             tags = BeautifulSoup(r.content,'xml').SupportedVersions.find_all('Version')
             versions = []
             for tag in tags:
                 versions.append(float(tag.string))
-            Container.api_headers = {'Accept':'application/*+xml;version=' + str(max(versions)),'Accept-Encoding':'gzip'}
+            self.context = self.context.replace(headers={'Accept':'application/*+xml;version=' + str(max(versions)),'Accept-Encoding':'gzip'})
 
             logger.debug("try reuse existing session")
             open(Container.session_file_path, "a").close() # touch
@@ -804,24 +2881,25 @@ class Session(Container):
             api_user = self.username + "@" + self.org_name
             for session in sessions:
                 if session['session']['host'] == self.hostname and session['session']['user'] == api_user :
-                    api_url = Container.api_url_prefix + "/session/"  
-                    api_headers = Container.api_headers.copy()
+                    api_url = self.context.api_url_prefix + "/session/"  
+                    api_headers = self.context.api_headers
                     api_headers.update({'x-vcloud-authorization':session['session']['token']})
-                    r = requests.get(api_url, headers=api_headers)
+                    with self.request_slot(api_url, 'read'):
+                        r = self.context.transport.get(api_url, headers=api_headers)
                     if r.status_code == requests.codes.ok:
                         self.token = session['session']['token']
-                        Container.api_headers.update({'x-vcloud-authorization':self.token})
-                        logger.info("%s re%s succeeded" % (self.name, inspect.stack()[0][3]))
+                        self.context = self.context.with_headers({'x-vcloud-authorization':self.token})
+                        logger.info("%s reconnect succeeded" % (self.name))
                         return BeautifulSoup(r.content,'xml').Session['href']
                     else:
                         sessions.remove(session)
 
             logger.debug("create new session")
-            api_url = Container.api_url_prefix + "/sessions"  
+            api_url = self.context.api_url_prefix + "/sessions"  
             api_auth = requests.auth.HTTPBasicAuth(api_user,self.password)
-            r = self.api_post(api_url, requests.codes.ok, inspect.stack()[0][3], auth=api_auth)
+            r = self.api_post(api_url, requests.codes.ok, auth=api_auth)
             self.token = r.headers.get('x-vcloud-authorization')
-            Container.api_headers.update({'x-vcloud-authorization':self.token})
+            self.context = self.context.with_headers({'x-vcloud-authorization':self.token})
             sessions.append({'session':{'host':self.hostname,'user':api_user,'token':self.token}})
             with open(Container.session_file_path, "w") as session_file:
                 session_file.write(yaml.safe_dump(sessions,default_flow_style=False))
@@ -829,10 +2907,11 @@ class Session(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def disconnect(self):
         try:
             logger.debug("disconnect and delete session")
-            r = self.api_delete(self.href, inspect.stack()[0][3])
+            r = self.api_delete(self.href)
             with open(Container.session_file_path, "r+") as session_file:
                 sessions = yaml.load(session_file)
                 sessions = [] if sessions is None else sessions
@@ -841,79 +2920,82 @@ class Session(Container):
                     sessions.remove(session)
             with open(Container.session_file_path, "w") as session_file:
                 session_file.write(yaml.safe_dump(sessions,default_flow_style=False))
+            self.context.transport.close()
         except:
             Container.handle_exception(sys.exc_info())
  
 class Org(Container):
     
-    def __init__(self, name=None):
+    def __init__(self, name=None, context=None, href=None):
+        context = Container.default_context if context == None else context
         if name == None:
-           name = Container.session_org_name
-        Container.__init__(self, name)
-        self.href = self.get_href()
+           name = context.org_name
+        Container.__init__(self, name, context)
+        self.href = self.get_href() if href == None else href
         self.admin_href = self.href.replace('/api','/api/admin')
 
     ### orgadmin,sysadmin ###
 
     def get_href(self):
         try:
-            r = self.api_get(Container.api_url_prefix + '/org')
+            r = self.api_get(self.context.api_url_prefix + '/org')
             return BeautifulSoup(r.content,'xml').find('Org')['href'] if r != None else None
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_settings(self, show=True):
+    def get_settings(self, show=None):
         try:
             r = self.api_get(self.admin_href + '/settings')
             records = [r.content] if r != None else []
-            if show:
+            if Container.showing(show):
                 self.show_records('OrgSettings',records)
             return records
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_settings_ldap(self, show=True):
+    def get_settings_ldap(self, show=None):
         try:
             r = self.api_get(self.admin_href + '/settings/ldap')
             records = [r.content] if r != None else []
-            if show:
+            if Container.showing(show):
                 self.show_records('OrgSettingsLdap',records)
             return records
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_settings_federation(self, show=True):
+    def get_settings_federation(self, show=None):
         try:
             r = self.api_get(self.admin_href + '/settings/federation')
             records = [r.content] if r != None else []
-            if show:
+            if Container.showing(show):
                 self.show_records('OrgSettingsFederation',records)
             return records
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_orgvdc(self,name=None,detailed=False,show=True):
+    def get_orgvdc(self,name=None,detailed=False,show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('orgVdc', 'OrgVdcRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_network(self,name=None,detailed=False,show=True):
+    def get_network(self,name=None,detailed=False,show=None,stream=False):
         try:
             record_filter = 'org==' + self.href
             record_filter += ';name==' +name if name != None else ''
-            return self.get_record('orgNetwork', 'OrgNetworkRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('orgNetwork', 'OrgNetworkRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_catalog(self,name=None,detailed=False,show=True):
+    def get_catalog(self,name=None,detailed=False,show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('catalog', 'CatalogRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_catalog(self,catalog_name):
         try:
             catalog_record = self.get_record('catalog', 'CatalogRecord', 'name==' + catalog_name +';orgName==' + self.name, show=False)
@@ -924,35 +3006,37 @@ class Org(Container):
             params.append(Tag(builder=builder.TreeBuilder(),name='vcloud:AdminCatalog',attrs={'name':catalog_name,
                 'xmlns:vcloud':'http://www.vmware.com/vcloud/v1.5'}))
             params.find('vcloud:AdminCatalog').append(Tag(builder=builder.TreeBuilder(),name='vcloud:Description'))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.catalog', self.admin_href + '/catalogs', params, requests.codes.created, inspect.stack()[0][3], catalog_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.catalog', self.admin_href + '/catalogs', params, requests.codes.created, target_name=catalog_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_catalog(self,catalog_name):
         try:
             catalog_record = self.get_record('catalog', 'CatalogRecord', 'name==' + catalog_name +';orgName==' + self.name, show=False)
             if len(catalog_record) == 0:
                 logger.info("%s does not exist in %s" % (catalog_name,self.name))
                 return
-            self.api_delete(catalog_record[0]['href'].replace('/api','/api/admin'), inspect.stack()[0][3], catalog_name)
+            self.api_delete(catalog_record[0]['href'].replace('/api','/api/admin'), target_name=catalog_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_right(self, name=None, detailed=False, show=True):
+    def get_right(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('right', 'RightRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_role(self, name=None, detailed=False, show=True):
+    def get_role(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('role', 'RoleRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_role(self,role_name,name=None,role_right_names=None):
         try:
             role_record = self.get_record('role', 'RoleRecord', 'name==' + role_name, show=False)
@@ -975,11 +3059,12 @@ class Org(Container):
                     right = Tag(builder=builder.TreeBuilder(),name='RightReference',attrs={'href':right_record[0]['href'],
                         'name':right_record[0]['name']}) 
                     params.Role.RightReferences.append(right)
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.role', role_record[0]['href'], params, requests.codes.ok, inspect.stack()[0][3], role_name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.role', role_record[0]['href'], params, requests.codes.ok, target_name=role_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_role(self,role_name,role_right_names):
         try:
             role_record = self.get_record('role', 'RoleRecord', 'name==' + role_name, show=False)
@@ -1000,28 +3085,30 @@ class Org(Container):
                     right = Tag(builder=builder.TreeBuilder(),name='RightReference',attrs={'href':right_record[0]['href'],
                         'name':right_record[0]['name']}) 
                     params.Role.RightReferences.append(right)
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.role', self.admin_href + '/roles', params, requests.codes.created, inspect.stack()[0][3], role_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.role', self.admin_href + '/roles', params, requests.codes.created, target_name=role_name)
         except:
             Container.handle_exception(sys.exc_info())
  
+    @operation_tag
     def del_role(self,role_name):
         try:
             role_record = self.get_record('role', 'RoleRecord', 'name==' + role_name, show=False)
             if len(role_record) == 0:
                 logger.info("%s does not exist in %s" % (role_name,self.name))
                 return
-            self.api_delete(role_record[0]['href'], inspect.stack()[0][3], role_name)
+            self.api_delete(role_record[0]['href'], target_name=role_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_user(self, name=None, detailed=True, show=True):
+    def get_user(self, name=None, detailed=True, show=None, stream=False):
         try:
             record_filter = 'name==' + name if name != None else ''
-            return self.get_record('user', 'UserRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('user', 'UserRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_user(self,user_name,full_name=None,enable=None,email=None,role_name=None,password=None):
         try:
             user_record = self.get_record('user', 'UserRecord', 'name==' + user_name, show=False)
@@ -1037,21 +3124,22 @@ class Org(Container):
             if email != None:
                 params.User.EmailAddress.string = email 
             if role_name != None:
-                role_record = self.get_record('role', 'RoleRecord' , 'name==' + role_name, show=False)
-                if len(role_record) == 0:
+                role_hrefs = self.resolve_hrefs('role', 'RoleRecord', role_name)
+                if len(role_hrefs) == 0:
                     logger.info("%s does not exist in %s" % (role_name,self.name))
                     return
-                params.User.Role['href'] = role_record[0]['href']
+                params.User.Role['href'] = role_hrefs[0]
             if params.User.IsExternal.string == 'true' and password != None:
                 logger.info("only local user password can be changed")
             if params.User.IsExternal.string == 'false' and password != None:
                 params.User.Role.insert_after(Tag(builder=builder.TreeBuilder(),name='Password'))
                 params.User.Password.string = password 
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.user', user_record[0]['href'], params, requests.codes.ok, inspect.stack()[0][3], user_name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.user', user_record[0]['href'], params, requests.codes.ok, target_name=user_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_user(self,user_name,full_name=None,email=None,enable=True,provider_type=None,external=True,role_name=None,password=None):
         try:
             user_record = self.get_record('user', 'UserRecord', 'name==' + user_name, show=False)
@@ -1081,11 +3169,11 @@ class Org(Container):
                 params.User.append(Tag(builder=builder.TreeBuilder(),name='IsExternal'))
                 params.User.IsExternal.string = str(external).lower() 
             if role_name != None:
-                role_record = self.get_record('role', 'RoleRecord' , 'name==' + role_name, show=False)
-                if len(role_record) == 0:
+                role_hrefs = self.resolve_hrefs('role', 'RoleRecord', role_name)
+                if len(role_hrefs) == 0:
                     logger.info("%s does not exist in %s" % (role_name,self.name))
                     return
-                params.User.append(Tag(builder=builder.TreeBuilder(),name='Role',attrs={'href':role_record[0]['href']}))
+                params.User.append(Tag(builder=builder.TreeBuilder(),name='Role',attrs={'href':role_hrefs[0]}))
             else:
                 logger.info("role_name must be specified")
                 return
@@ -1094,28 +3182,30 @@ class Org(Container):
             if not external and password != None:
                 params.User.Role.insert_after(Tag(builder=builder.TreeBuilder(),name='Password'))
                 params.User.Password.string = password 
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.user', self.admin_href + '/users', params, requests.codes.created, inspect.stack()[0][3], user_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.user', self.admin_href + '/users', params, requests.codes.created, target_name=user_name)
         except:
             Container.handle_exception(sys.exc_info())
   
+    @operation_tag
     def del_user(self,user_name):
         try:
             user_record = self.get_record('user', 'UserRecord', 'name==' + user_name, show=False)
             if len(user_record) == 0:
                 logger.info("%s does not exist in %s" % (user_name,self.name))
                 return
-            self.api_delete(user_record[0]['href'], inspect.stack()[0][3], user_name)
+            self.api_delete(user_record[0]['href'], target_name=user_name)
         except:
             Container.handle_exception(sys.exc_info())
  
-    def get_group(self, name=None, detailed=False, show=True):
+    def get_group(self, name=None, detailed=False, show=None, stream=False):
         try:
             record_filter = 'name==' + name if name != None else ''
-            return self.get_record('group', 'GroupRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('group', 'GroupRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_group(self,group_name,role_name=None):
         try:
             group_record = self.get_record('group', 'GroupRecord', 'name==' + group_name, show=False)
@@ -1125,16 +3215,17 @@ class Org(Container):
             group_entity = self.get_entity(group_record[0]['href'])
             params = BeautifulSoup(group_entity,'xml')
             if role_name != None:
-                role_record = self.get_record('role', 'RoleRecord' , 'name==' + role_name, show=False)
-                if len(role_record) == 0:
+                role_hrefs = self.resolve_hrefs('role', 'RoleRecord', role_name)
+                if len(role_hrefs) == 0:
                     logger.info("%s does not exist in %s" % (role_name,self.name))
                     return
-                params.Group.Role['href'] = role_record[0]['href']
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.group', group_record[0]['href'], params, requests.codes.ok, inspect.stack()[0][3], group_name)
+                params.Group.Role['href'] = role_hrefs[0]
+            params = Payload.serialize(params)
+            self.api_put_params('admin.group', group_record[0]['href'], params, requests.codes.ok, target_name=group_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_group(self,group_name,role_name=None,provider_type=None):
         try:
             group_record = self.get_record('group', 'GroupRecord', 'name==' + group_name, show=False)
@@ -1151,36 +3242,38 @@ class Org(Container):
                 params.Group.append(Tag(builder=builder.TreeBuilder(),name='ProviderType'))
                 params.Group.ProviderType.string = provider_type.upper()
             if role_name != None:
-                role_record = self.get_record('role', 'RoleRecord' , 'name==' + role_name, show=False)
-                if len(role_record) == 0:
+                role_hrefs = self.resolve_hrefs('role', 'RoleRecord', role_name)
+                if len(role_hrefs) == 0:
                     logger.info("%s does not exist in %s" % (role_name,self.name))
                     return
-                params.Group.append(Tag(builder=builder.TreeBuilder(),name='Role',attrs={'href':role_record[0]['href']}))
+                params.Group.append(Tag(builder=builder.TreeBuilder(),name='Role',attrs={'href':role_hrefs[0]}))
             else:
                 logger.info("role_name must be specified")
                 return
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.group', self.admin_href + '/groups', params, requests.codes.created, inspect.stack()[0][3], group_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.group', self.admin_href + '/groups', params, requests.codes.created, target_name=group_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_group(self,group_name):
         try:
             group_record = self.get_record('group', 'GroupRecord', 'name==' + group_name, show=False)
             if len(group_record) == 0:
                 logger.info("%s does not exist in %s" % (group_name,self.name))
                 return
-            self.api_delete(group_record[0]['href'], inspect.stack()[0][3], group_name)
+            self.api_delete(group_record[0]['href'], target_name=group_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_ownership(self,user_name):
         try:
             user_record = self.get_record('user', 'UserRecord', 'name==' + user_name, show=False)
             if len(user_record) == 0:
                 logger.info("%s does not exist in %s" % (user_name,self.name))
                 return
-            self.api_post(user_record[0]['href'] + '/action/takeOwnership', requests.codes.no_content, inspect.stack()[0][3])
+            self.api_post(user_record[0]['href'] + '/action/takeOwnership', requests.codes.no_content)
         except:
             Container.handle_exception(sys.exc_info())
 
@@ -1188,29 +3281,31 @@ class Org(Container):
 
     def get_system_settings(self):
         try:
-            records = [self.get_entity(Container.api_url_prefix + '/admin/extension/settings')]
+            records = [self.get_entity(self.context.api_url_prefix + '/admin/extension/settings')]
             self.show_records('systemSettings',records)
             return records
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_system_settings(self,allow_overlapping_extnet):
         try:
-            system_settings = self.get_entity(Container.api_url_prefix + '/admin/extension/settings')
+            system_settings = self.get_entity(self.context.api_url_prefix + '/admin/extension/settings')
             params = BeautifulSoup(system_settings,'xml')
             params.find('SystemSettings').find('GeneralSettings').find('AllowOverlappingExtNets').string = str(allow_overlapping_extnet).lower()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.systemSettings', Container.api_url_prefix + '/admin/extension/settings', params, requests.codes.ok, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.systemSettings', self.context.api_url_prefix + '/admin/extension/settings', params, requests.codes.ok, target_name=self.name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_org(self, name=None, detailed=False, show=True):
+    def get_org(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('organization', 'OrgRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_org(self,org_name,enable=True):
         try:
             org_record = self.get_record('organization', 'OrgRecord', 'name==' + org_name, show=False)
@@ -1218,12 +3313,13 @@ class Org(Container):
                 logger.info("%s does not exist in %s" % (org_name,self.name))
                 return
             if enable:
-                self.api_post(org_record[0]['href'].replace('/api','/api/admin') + '/action/enable', requests.codes.no_content, inspect.stack()[0][3])
+                self.api_post(org_record[0]['href'].replace('/api','/api/admin') + '/action/enable', requests.codes.no_content)
             else:
-                self.api_post(org_record[0]['href'].replace('/api','/api/admin') + '/action/disable', requests.codes.no_content, inspect.stack()[0][3])
+                self.api_post(org_record[0]['href'].replace('/api','/api/admin') + '/action/disable', requests.codes.no_content)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_org(self,org_name,org_ldap_mode=None,custom_users_ou=None,enable=True):
         try:
             org_record = self.get_record('organization', 'OrgRecord', 'name==' + org_name, show=False)
@@ -1266,35 +3362,37 @@ class Org(Container):
             #params.AdminOrg.Settings.append(Tag(builder=builder.TreeBuilder(),name='OrgOperationLimitsSettings'))
             #params.AdminOrg.Settings.append(Tag(builder=builder.TreeBuilder(),name='OrgFederationSettings'))
             #params.AdminOrg.Settings.append(Tag(builder=builder.TreeBuilder(),name='OrgOAuthSettings'))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
+            params = Payload.serialize(params)
             logger.debug(params)
-            self.api_post_params('admin.organization', Container.api_url_prefix + '/admin/orgs', params, requests.codes.created, inspect.stack()[0][3], org_name)
+            self.api_post_params('admin.organization', self.context.api_url_prefix + '/admin/orgs', params, requests.codes.created, target_name=org_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_org(self,org_name):
         try:
             org_record = self.get_record('organization', 'OrgRecord', 'name==' + org_name, show=False)
             if len(org_record) == 0:
                 logger.info("%s does not exist in %s" % (org_name,self.name))
                 return
-            self.api_delete(org_record[0]['href'].replace('/api','/api/admin'), inspect.stack()[0][3], org_name)
+            self.api_delete(org_record[0]['href'].replace('/api','/api/admin'), target_name=org_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_cell(self, detailed=False, show=True):
+    def get_cell(self, detailed=False, show=None):
         try:
             return self.get_record('cell', 'CellRecord', detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_providervdc(self, name=None, detailed=False, show=True):
+    def get_providervdc(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('providerVdc', 'VMWProviderVdcRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_providervdc(self,providervdc_name,vcenter_name,resource_pool_name,storage_profile_name,enable=True):
         try:
             providervdc_record = self.get_record('providerVdc', 'VMWProviderVdcRecord', 'name==' + providervdc_name, show=False)
@@ -1307,7 +3405,7 @@ class Org(Container):
                 'xmlns:vcloud':'http://www.vmware.com/vcloud/v1.5'}))
             params.VMWProviderVdcParams.append(Tag(builder=builder.TreeBuilder(),name='ResourcePoolRefs'))
             params.VMWProviderVdcParams.ResourcePoolRefs.append(Tag(builder=builder.TreeBuilder(),name='VimObjectRef'))
-            vcenter=Vcenter(vcenter_name)
+            vcenter=Vcenter(vcenter_name, context=self.context)
             params.VMWProviderVdcParams.ResourcePoolRefs.VimObjectRef.append(Tag(builder=builder.TreeBuilder(),name='VimServerRef',attrs={'href':vcenter.href}))
             resource_pool = vcenter.get_resource_pool(resource_pool_name, show=False)
             params.VMWProviderVdcParams.ResourcePoolRefs.VimObjectRef.append(Tag(builder=builder.TreeBuilder(),name='MoRef'))
@@ -1322,22 +3420,23 @@ class Org(Container):
                 logger.info("%s does not exist" % (storage_profile_name))
             params.VMWProviderVdcParams.append(Tag(builder=builder.TreeBuilder(),name='StorageProfile'))
             params.VMWProviderVdcParams.StorageProfile.string = storage_profile_name
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.createProviderVdcParams', Container.api_url_prefix + '/admin/extension/providervdcsparams', params, requests.codes.created, inspect.stack()[0][3], providervdc_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.createProviderVdcParams', self.context.api_url_prefix + '/admin/extension/providervdcsparams', params, requests.codes.created, target_name=providervdc_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_providervdc(self,providervdc_name):
         try:
             providervdc_record = self.get_record('providerVdc', 'VMWProviderVdcRecord', 'name==' + providervdc_name, show=False)
             if len(providervdc_record) == 0:
                 logger.info("%s does not exist in %s" % (providervdc_name,self.name))
                 return
-            self.api_delete(providervdc_record[0]['href'].replace('/api/admin','/api/admin/extension'), inspect.stack()[0][3], providervdc_name)
+            self.api_delete(providervdc_record[0]['href'].replace('/api/admin','/api/admin/extension'), target_name=providervdc_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_adminvdc(self,org_name=None,name=None,detailed=False,show=True):
+    def get_adminvdc(self,org_name=None,name=None,detailed=False,show=None):
         try:
             record_filter = 'orgName==' + org_name if org_name != None and org_name != 'system' else ''
             record_filter += ';name==' + name if name != None else ''
@@ -1345,12 +3444,13 @@ class Org(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_adminvdc(self,org_name,adminvdc_name,allocation_model,cpu_limit_ghz,memory_limit_gb,storage_limit_gb,storage_profile_name,memory_reserve_pc,cpu_reserve_pc,network_pool_name,providervdc_name,adopt_resource_pools=False,enable=True,enable_thin_provision=False,enable_fast_provision=False,allow_overcommit=False,vcpu_in_mhz=2000):
         try:
             if allocation_model not in self.allocation_models:
                 logger.info("%s not in %s" % (allocation_model,self.allocation_models))
                 return
-            org = Org('org_name')
+            org = Org('org_name', context=self.context)
             orgvdc_record = self.get_record('adminOrgVdc', 'AdminVdcRecord', 'name==' + adminvdc_name + ';orgName==' + org.name, show=False)
             if len(orgvdc_record) > 0:
                 logger.info("%s already exist in %s" % (adminvdc_name,org.name))
@@ -1389,7 +3489,7 @@ class Org(Container):
             params.CreateVdcParams.VdcStorageProfile.Limit.string = str(storage_limit_gb*1024) 
             params.CreateVdcParams.VdcStorageProfile.append(Tag(builder=builder.TreeBuilder(),name='Default'))
             params.CreateVdcParams.VdcStorageProfile.Default.string = 'true'
-            providervdc = ProviderVdc(providervdc_name)
+            providervdc = ProviderVdc(providervdc_name, context=self.context)
             storage_profile_href = providervdc.get_storage_profile(storage_profile_name,show=False)[0]['href']
             params.CreateVdcParams.VdcStorageProfile.append(Tag(builder=builder.TreeBuilder(),name='ProviderVdcStorageProfile',attrs={'href':storage_profile_href}))
             if memory_reserve_pc > 1.0 or cpu_reserve_pc > 1.0:
@@ -1407,7 +3507,7 @@ class Org(Container):
             params.CreateVdcParams.append(Tag(builder=builder.TreeBuilder(),name='NetworkPoolReference',attrs={'href':network_pool_href}))
             params.CreateVdcParams.append(Tag(builder=builder.TreeBuilder(),name='ProviderVdcReference',attrs={'href':providervdc.href}))
             if adopt_resource_pools:
-                providervdc=ProviderVdc(providervdc_name)
+                providervdc=ProviderVdc(providervdc_name, context=self.context)
                 adoptable_resource_pools = providervdc.get_resource_pool(discover_adoptable=True, show=False)
                 if len(adoptable_resource_pools) > 0:
                     params.CreateVdcParams.append(Tag(builder=builder.TreeBuilder(),name='ResourcePoolRefs'))
@@ -1423,11 +3523,12 @@ class Org(Container):
             params.CreateVdcParams.UsesFastProvisioning.string = str(enable_fast_provision).lower()
             params.CreateVdcParams.append(Tag(builder=builder.TreeBuilder(),name='OverCommitAllowed'))
             params.CreateVdcParams.OverCommitAllowed.string = str(allow_overcommit).lower()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.createVdcParams', org.href.replace('/api','/api/admin') + '/vdcsparams', params, requests.codes.created, inspect.stack()[0][3], adminvdc_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.createVdcParams', org.href.replace('/api','/api/admin') + '/vdcsparams', params, requests.codes.created, target_name=adminvdc_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_adminvdc(self,adminvdc_name,enable=True):
         try:
             adminvdc_record = self.get_record('adminOrgVdc', 'AdminVdcRecord', 'name==' + adminvdc_name, show=False)
@@ -1437,35 +3538,37 @@ class Org(Container):
             adminvdc_entity = self.get_entity(adminvdc_record[0]['href'])
             params = BeautifulSoup(adminvdc_entity,'xml')
             params.find('AdminVdc').find('IsEnabled').string = str(enable).lower()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.vdc', adminvdc_record[0]['href'], params, requests.codes.accepted, inspect.stack()[0][3], adminvdc_name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.vdc', adminvdc_record[0]['href'], params, requests.codes.accepted, target_name=adminvdc_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_adminvdc(self,adminvdc_name):
         try:
             adminvdc_record = self.get_record('adminOrgVdc', 'AdminVdcRecord', 'name==' + adminvdc_name, show=False)
             if len(adminvdc_record) == 0:
                 logger.info("%s does not exist in %s" % (adminvdc_name,self.name))
                 return
-            self.api_delete(adminvdc_record[0]['href'], inspect.stack()[0][3], adminvdc_name)
+            self.api_delete(adminvdc_record[0]['href'], target_name=adminvdc_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_edge_gateway(self, name=None, detailed=False, show=True):
+    def get_edge_gateway(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('edgeGateway', 'EdgeGatewayRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_externalnet(self, name=None, detailed=False, show=True):
+    def get_externalnet(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('externalNetwork', 'NetworkRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_externalnet(self,externalnet_name,name=None):
         try:
             externalnet_record = self.get_record('externalNetwork', 'NetworkRecord', 'name==' + externalnet_name, show=False)
@@ -1476,11 +3579,12 @@ class Org(Container):
             params = BeautifulSoup(externalnet_entity,'xml')
             if name != None:
                 params.find('VMWExternalNetwork')['name'] = name
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.vmwexternalnet', externalnet_record[0]['href'].replace('/api/network','/api/admin/extension/externalnet'), params, requests.codes.ok, inspect.stack()[0][3], externalnet_name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.vmwexternalnet', externalnet_record[0]['href'].replace('/api/network','/api/admin/extension/externalnet'), params, requests.codes.ok, target_name=externalnet_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_externalnet(self,externalnet_name,ipscope_gateway,ipscope_netmask,iprange_start,iprange_end,vcenter_name,portgroup_name,ipscope_dns1=None,ipscope_dns_suffix=None,):
         try:
             externalnet_record = self.get_record('externalNetwork', 'NetworkRecord', 'name==' + externalnet_name, show=False)
@@ -1516,41 +3620,43 @@ class Org(Container):
             params.find('vmext:VMWExternalNetwork').Configuration.append(Tag(builder=builder.TreeBuilder(),name='FenceMode'))
             params.find('vmext:VMWExternalNetwork').Configuration.FenceMode.string = 'isolated'
             params.find('vmext:VMWExternalNetwork').append(Tag(builder=builder.TreeBuilder(),name='vmext:VimPortGroupRef'))
-            params.find('vmext:VMWExternalNetwork').find('vmext:VimPortGroupRef').append(Tag(builder=builder.TreeBuilder(),name='vmext:VimServerRef',attrs={'href':Vcenter(vcenter_name).href}))
+            params.find('vmext:VMWExternalNetwork').find('vmext:VimPortGroupRef').append(Tag(builder=builder.TreeBuilder(),name='vmext:VimServerRef',attrs={'href':Vcenter(vcenter_name, context=self.context).href}))
             params.find('vmext:VMWExternalNetwork').find('vmext:VimPortGroupRef').append(Tag(builder=builder.TreeBuilder(),name='vmext:MoRef'))
             params.find('vmext:VMWExternalNetwork').find('vmext:VimPortGroupRef').find('vmext:MoRef').string = self.get_portgroup(portgroup_name,show=False)[0]['moref']
             params.find('vmext:VMWExternalNetwork').find('vmext:VimPortGroupRef').append(Tag(builder=builder.TreeBuilder(),name='vmext:VimObjectType'))
             # VimObjectType: HOST,VIRTUAL_MACHINE,VIRTUAL_APP,NETWORK,DV_PORTGROUP,DV_SWITCH,DATASTORE_CLUSTER
             params.find('vmext:VMWExternalNetwork').find('vmext:VimPortGroupRef').find('vmext:VimObjectType').string = 'DV_PORTGROUP'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.vmwexternalnet', Container.api_url_prefix + '/admin/extension/externalnets', params, requests.codes.created, inspect.stack()[0][3], externalnet_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.vmwexternalnet', self.context.api_url_prefix + '/admin/extension/externalnets', params, requests.codes.created, target_name=externalnet_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_externalnet(self,externalnet_name):
         try:
             externalnet_record = self.get_record('externalNetwork', 'NetworkRecord', 'name==' + externalnet_name, show=False)
             if len(externalnet_record) == 0:
                 logger.info("%s does not exist in %s" % (externalnet_name,self.name))
                 return
-            self.api_delete(externalnet_record[0]['href'].replace('/api/network','/api/admin/extension/externalnet'), inspect.stack()[0][3], externalnet_name)
+            self.api_delete(externalnet_record[0]['href'].replace('/api/network','/api/admin/extension/externalnet'), target_name=externalnet_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_network_pool(self, name=None, detailed=False, show=True):
+    def get_network_pool(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('networkPool', 'NetworkPoolRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_vcenter(self, name=None, detailed=False, show=True):
+    def get_vcenter(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('virtualCenter', 'VirtualCenterRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_vcenter(self,vcenter_name,vcenter_username,vcenter_password,vcenter_ip,vsm_name,vsm_ip,vsm_username,vsm_password,enable=True):
         try:
             vcenter_record = self.get_record('virtualCenter', 'VirtualCenterRecord', 'name==' + vcenter_name, show=False)
@@ -1575,35 +3681,37 @@ class Org(Container):
             params.find('vmext:RegisterVimServerParams').find('vmext:ShieldManager').find('vmext:Password').string=vsm_password
             params.find('vmext:RegisterVimServerParams').find('vmext:ShieldManager').append(Tag(builder=builder.TreeBuilder(),name='vmext:Url'))
             params.find('vmext:RegisterVimServerParams').find('vmext:ShieldManager').find('vmext:Url').string='https://' + vsm_ip + ':443' 
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.registerVimServerParams', Container.api_url_prefix + '/admin/extension/action/registervimserver', params, requests.codes.ok, inspect.stack()[0][3], vcenter_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.registerVimServerParams', self.context.api_url_prefix + '/admin/extension/action/registervimserver', params, requests.codes.ok, target_name=vcenter_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_vcenter(self, vcenter_name):
         try:
             vcenter_record = self.get_record('virtualCenter', 'VirtualCenterRecord', 'name==' + vcenter_name, show=False)
             if len(vcenter_record) == 0:
                 logger.info("%s does not exist in %s" % (vcenter_name,self.name))
                 return
-            self.api_post(vcenter_record[0]['href'] + '/action/unregister', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(vcenter_record[0]['href'] + '/action/unregister', requests.codes.accepted)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_resource_pool(self, name=None, detailed=False, show=True):
+    def get_resource_pool(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('resourcePool', 'ResourcePoolRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_host(self, name=None, detailed=False, show=True):
+    def get_host(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('host', 'HostRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_host(self,host_name,enable=True):
         try:
             host_record = self.get_record('host', 'HostRecord', 'name==' + host_name, show=False)
@@ -1612,12 +3720,13 @@ class Org(Container):
                 return
             host_entity = self.get_entity(host_record[0]['href'])
             if enable:
-                self.api_post(host_record[0]['href'] + '/action/enable', requests.codes.accepted, inspect.stack()[0][3])
+                self.api_post(host_record[0]['href'] + '/action/enable', requests.codes.accepted)
             else:
-                self.api_post(host_record[0]['href'] + '/action/disable', requests.codes.accepted, inspect.stack()[0][3])
+                self.api_post(host_record[0]['href'] + '/action/disable', requests.codes.accepted)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_host(self, host_name, username, password):
         try:
             host_record = self.get_record('host', 'HostRecord', 'name==' + host_name, show=False)
@@ -1630,107 +3739,101 @@ class Org(Container):
             params.PrepareHostParams.Username.string = username
             params.PrepareHostParams.append(Tag(builder=builder.TreeBuilder(),name='Password'))
             params.PrepareHostParams.Password.string = password
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.prepareHostParams', host_record[0]['href'] + '/action/prepare', params, requests.codes.accepted, inspect.stack()[0][3], host_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.prepareHostParams', host_record[0]['href'] + '/action/prepare', params, requests.codes.accepted, target_name=host_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_host(self, host_name):
         try:
             host_record = self.get_record('host', 'HostRecord', 'name==' + host_name, show=False)
             if len(host_record) == 0:
                 logger.info("%s does not exist in %s" % (host_name,self.name))
                 return
-            self.api_post(host_record[0]['href'] + '/action/unprepare', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(host_record[0]['href'] + '/action/unprepare', requests.codes.accepted)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_datastore(self, name=None, detailed=False, show=True):
+    def get_datastore(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('datastore', 'DatastoreRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_storage_profile(self, name=None, detailed=False, show=True):
+    def get_storage_profile(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('providerVdcStorageProfile', 'ProviderVdcStorageProfileRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_dvswitch(self, name=None, detailed=False, show=True):
+    def get_dvswitch(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('dvSwitch', 'DvSwitchRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_portgroup(self, name=None, detailed=False, show=True):
+    def get_portgroup(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'name==' + name if name != None else ''
             return self.get_record('portgroup', 'PortgroupRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_task(self, status=None, detailed=False, show=True):
+    def get_task(self, status=None, detailed=False, show=None, stream=False):
         try:
             if status not in Container.task_statuses:
                 logger.info("%s not in %s" % (status,Container.task_statuses))
                 return
             record_filter = 'status==' + status if status != None else ''
-            return self.get_record('task', 'TaskRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('task', 'TaskRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_event(self, detailed=False, show=True):
+    def get_event(self, detailed=False, show=None, stream=False):
         try:
-            return self.get_record('event', 'EventRecord', detailed=detailed, show=show)
+            return self.get_record('event', 'EventRecord', detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_role_template(self, name=None, detailed=True, show=True):
+    def role_template_org(self):
+        # role templates are only exposed up to api version 9.0
+        org = copy.copy(self)
+        org.context = self.context.with_headers({'Accept':'application/*+xml;version=9.0'})
+        return org
+
+    def get_role_template(self, name=None, detailed=True, show=None):
         try:
-            api_headers = Container.api_headers
-            Container.api_headers['Accept'] = 'application/*+xml;version=9.0'
-            role_templates = self.get_role(name, detailed, show)
-            Container.api_headers = api_headers
-            return role_templates
+            return self.role_template_org().get_role(name, detailed, show)
         except:
             Container.handle_exception(sys.exc_info())
 
     def set_role_template(self,role_name,name=None,role_right_names=None):
         try:
-            api_headers = Container.api_headers
-            Container.api_headers['Accept'] = 'application/*+xml;version=9.0'
-            self.set_role(role_name,name,role_right_names)
-            Container.api_headers = api_headers
+            self.role_template_org().set_role(role_name,name,role_right_names)
         except:
             Container.handle_exception(sys.exc_info())
 
     def add_role_template(self,role_name,role_right_names):
         try:
-            api_headers = Container.api_headers
-            Container.api_headers['Accept'] = 'application/*+xml;version=9.0'
-            self.add_role(role_name,role_right_names)
-            Container.api_headers = api_headers
+            self.role_template_org().add_role(role_name,role_right_names)
         except:
             Container.handle_exception(sys.exc_info())
 
     def del_role_template(self,role_name):
         try:
-            api_headers = Container.api_headers
-            Container.api_headers['Accept'] = 'application/*+xml;version=9.0'
-            self.del_role(role_name)
-            Container.api_headers = api_headers
+            self.role_template_org().del_role(role_name)
         except:
             Container.handle_exception(sys.exc_info())
 
 class Vcenter(Container):
 
-    def __init__(self, name):
-        Container.__init__(self, name)
-        self.href = self.get_href()
+    def __init__(self, name, context=None, href=None):
+        Container.__init__(self, name, context)
+        self.href = self.get_href() if href == None else href
 
     def get_href(self):
         try:
@@ -1738,6 +3841,7 @@ class Vcenter(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_vcenter(self,name=None,enable=True):
         try:
             vcenter_entity = self.get_entity(self.href)
@@ -1745,31 +3849,31 @@ class Vcenter(Container):
             if name != None:
                 params.find('VimServer')['name'] = name
             params.find('VimServer').find('IsEnabled').string = str(enable).lower()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.vmwvirtualcenter', self.href, params, requests.codes.accepted, inspect.stack()[0][3], vcenter_name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.vmwvirtualcenter', self.href, params, requests.codes.accepted, target_name=vcenter_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_host(self, show=True):
+    def get_host(self, show=None):
         try:
             return self.get_section('/hostReferences', show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_network(self, show=True):
+    def get_network(self, show=None):
         try:
             return self.get_section('/networks', show)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_resource_pool(self, name=None, show=True):
+    def get_resource_pool(self, name=None, show=None):
         try:
             if name != None:
                 resource_pool = BeautifulSoup(self.get_section('/resourcePoolList', show=False),'xml').find('ResourcePool',attrs={'name':name})
                 if resource_pool == None:
                     logger.info("%s does not exist" % (name))
                 else:
-                    if show:
+                    if Container.showing(show):
                         self.show_records('ResourcePool',[resource_pool])
                     return resource_pool
             else:
@@ -1777,18 +3881,19 @@ class Vcenter(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_storage_profile(self, show=True):
+    @operation_tag
+    def get_storage_profile(self, show=None):
         try:
-            self.api_post(self.href + '/action/refreshStorageProfiles', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(self.href + '/action/refreshStorageProfiles', requests.codes.accepted)
             return self.get_section('/storageProfiles', show)
         except:
             Container.handle_exception(sys.exc_info())
 
 class ProviderVdc(Container):
 
-    def __init__(self, name):
-        Container.__init__(self, name)
-        self.href = self.get_href()
+    def __init__(self, name, context=None, href=None):
+        Container.__init__(self, name, context)
+        self.href = self.get_href() if href == None else href
         self.admin_href = self.href
         self.extension_href = self.href.replace('/api/admin','/api/admin/extension')
 
@@ -1798,12 +3903,13 @@ class ProviderVdc(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_providervdc(self,name=None,hardware_ver=None,enable=True):
         try:
             if enable:
-                self.api_post(self.extension_href + '/action/enable', requests.codes.no_content, inspect.stack()[0][3])
+                self.api_post(self.extension_href + '/action/enable', requests.codes.no_content)
             else:
-                self.api_post(self.extension_href + '/action/disable', requests.codes.no_content, inspect.stack()[0][3])
+                self.api_post(self.extension_href + '/action/disable', requests.codes.no_content)
             providervdc_entity = self.get_entity(self.extension_href)
             params = BeautifulSoup(providervdc_entity,'xml')
             if name != None:
@@ -1813,12 +3919,12 @@ class ProviderVdc(Container):
                     logger.info("%s not in %s, default to highest." % (hardware_ver, self.hardware_vers))
                     hardware_ver = sorted(self.hardware_vers, key=lambda x: int(x.replace('vmx-','')))[-1] # highest supported by vcd system
                 params.find('VMWProviderVdc').find('HighestSupportedHardwareVersion').string = hardware_ver
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.vmwprovidervdc', self.extension_href, params, requests.codes.ok, inspect.stack()[0][3], providervdc_name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.vmwprovidervdc', self.extension_href, params, requests.codes.ok, target_name=providervdc_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_storage_profile(self, name=None, available=None, detailed=False, show=True):
+    def get_storage_profile(self, name=None, available=None, detailed=False, show=None):
         try:
             if available != None:
                 if available:
@@ -1832,6 +3938,7 @@ class ProviderVdc(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_storage_profile(self, storage_profile_name, enable=None):
         try:
             storage_profile_record = self.get_record('providerVdcStorageProfile', 'ProviderVdcStorageProfileRecord', 'name==' + storage_profile_name + ';providerVdc==' + self.href, show=False)
@@ -1841,17 +3948,18 @@ class ProviderVdc(Container):
             params = BeautifulSoup(self.get_entity(storage_profile_record[0]['href'].replace('/api/admin','/api/admin/extension')),'xml')
             if enable != None:
                 params.find('VMWProviderVdcStorageProfile').Enabled.string = str(enable).lower()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.vmwPvdcStorageProfile', storage_profile_record[0]['href'].replace('/api/admin','/api/admin/extension'), params, requests.codes.ok, inspect.stack()[0][3], storage_profile_name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.vmwPvdcStorageProfile', storage_profile_record[0]['href'].replace('/api/admin','/api/admin/extension'), params, requests.codes.ok, target_name=storage_profile_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_storage_profile(self,storage_profile_name):
         try:
             storage_profile_record = self.get_record('providerVdcStorageProfile', 'ProviderVdcStorageProfileRecord', 'name==' + storage_profile_name + ';providerVdc==' + self.href,show=False)
             if len(storage_profile_record) > 0:
                 logger.info("%s already exist in %s" % (storage_profile_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], storage_profile_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), storage_profile_name))
                 return
             availables = BeautifulSoup(self.get_storage_profile(available=True, show=False),'xml')
             if availables.find('VMWStorageProfile',attrs={'name':storage_profile_name}) == None:
@@ -1863,29 +3971,30 @@ class ProviderVdc(Container):
                 'xmlns:vcloud':'http://www.vmware.com/vcloud/v1.5'})
             params.append(Tag(builder=builder.TreeBuilder(),name='AddStorageProfile'))
             params.AddStorageProfile.string = storage_profile_name
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.updateProviderVdcStorageProfiles', self.extension_href + '/storageProfiles', params, requests.codes.accepted, inspect.stack()[0][3], storage_profile_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.updateProviderVdcStorageProfiles', self.extension_href + '/storageProfiles', params, requests.codes.accepted, target_name=storage_profile_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_storage_profile(self,storage_profile_name):
         try:
             storage_profile_record = self.get_record('providerVdcStorageProfile', 'ProviderVdcStorageProfileRecord', 'name==' + storage_profile_name + ';providerVdc==' + self.href,show=False)
             if len(storage_profile_record) == 0:
                 logger.info("%s does not exist in %s" % (storage_profile_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], storage_profile_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), storage_profile_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params = Tag(builder=builder.TreeBuilder(),name='UpdateProviderVdcStorageProfiles',attrs={'name':storage_profile_name,
                 'xmlns':'http://www.vmware.com/vcloud/extension/v1.5',
                 'xmlns:vcloud':'http://www.vmware.com/vcloud/v1.5'})
             params.append(Tag(builder=builder.TreeBuilder(),name='RemoveStorageProfile',attrs={'href':storage_profile_record[0]['href']}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.updateProviderVdcStorageProfiles', self.extension_href + '/storageProfiles', params, requests.codes.accepted, inspect.stack()[0][3], storage_profile_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.updateProviderVdcStorageProfiles', self.extension_href + '/storageProfiles', params, requests.codes.accepted, target_name=storage_profile_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_resource_pool(self, name=None, discover_adoptable=None, detailed=None, show=True):
+    def get_resource_pool(self, name=None, discover_adoptable=None, detailed=None, show=None):
         try:
             if discover_adoptable != None:
                 if discover_adoptable:
@@ -1897,7 +4006,7 @@ class ProviderVdc(Container):
                         valid_candidates = BeautifulSoup(self.get_section('/discoverResourcePools/' + discover_source_moref, show=False),'xml').find('VMWDiscoveredResourcePools').find_all('VMWDiscoveredResourcePool',recursive=False,attrs={'validCandidate':'true'})
                         adoptables.extend(valid_candidates)
                     self.href = self.admin_href
-                    if show:
+                    if Container.showing(show):
                         self.show_records('adoptable resource pool',adoptables)
                     return adoptables
             if detailed != None:
@@ -1912,52 +4021,55 @@ class ProviderVdc(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_resource_pool(self,resource_pool_name,enable=True):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
             if len(resource_pool_record) == 0:
                 logger.info("%s does not exist in %s" % (resource_pool_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], resource_pool_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), resource_pool_name))
                 return
             resource_pool_moref = resource_pool_record[0]['resourcePoolMoref']
             for resource_pool in self.get_resource_pool(detailed=True,show=False).find('VMWProviderVdcResourcePoolSet').find_all('VMWProviderVdcResourcePool', recursive=False):
                 if resource_pool.find('ResourcePoolVimObjectRef').find('MoRef',text=resource_pool_moref) != None:
                     resource_pool_href = resource_pool.find('ResourcePoolRef')['href']
             if enable:
-                self.api_post(resource_pool_href + '/action/enable', requests.codes.no_content, inspect.stack()[0][3])
+                self.api_post(resource_pool_href + '/action/enable', requests.codes.no_content)
             else:
-                self.api_post(resource_pool_href + '/action/disable', requests.codes.no_content, inspect.stack()[0][3])
+                self.api_post(resource_pool_href + '/action/disable', requests.codes.no_content)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_resource_pool(self,resource_pool_name,vcenter_name): 
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
             if len(resource_pool_record) > 0:
                 logger.info("%s already exist in %s" % (resource_pool_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], resource_pool_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), resource_pool_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params = Tag(builder=builder.TreeBuilder(),name='UpdateResourcePoolSetParams',attrs={'xmlns':'http://www.vmware.com/vcloud/extension/v1.5'})
             params.append(Tag(builder=builder.TreeBuilder(),name='AddItem'))
-            vcenter = Vcenter(vcenter_name)
+            vcenter = Vcenter(vcenter_name, context=self.context)
             params.AddItem.append(Tag(builder=builder.TreeBuilder(),name='VimServerRef',attrs={'href':vcenter.href}))
             resource_pool = vcenter.get_resource_pool(resource_pool_name, show=False)
             params.AddItem.append(Tag(builder=builder.TreeBuilder(),name='MoRef'))
             params.AddItem.MoRef.string = resource_pool.find('MoRef').string
             params.AddItem.append(Tag(builder=builder.TreeBuilder(),name='VimObjectType'))
             params.AddItem.VimObjectType.string = 'RESOURCE_POOL'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.resourcePoolSetUpdateParams', self.extension_href + '/action/updateResourcePools', params, requests.codes.accepted, inspect.stack()[0][3], resource_pool_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.resourcePoolSetUpdateParams', self.extension_href + '/action/updateResourcePools', params, requests.codes.accepted, target_name=resource_pool_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_resource_pool(self,resource_pool_name):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
             if len(resource_pool_record) == 0:
                 logger.info("%s does not exist in %s" % (resource_pool_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], resource_pool_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), resource_pool_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params = Tag(builder=builder.TreeBuilder(),name='UpdateResourcePoolSetParams',attrs={'xmlns':'http://www.vmware.com/vcloud/extension/v1.5'})
@@ -1966,12 +4078,12 @@ class ProviderVdc(Container):
                 if resource_pool.find('ResourcePoolVimObjectRef').find('MoRef',text=resource_pool_moref) != None:
                     resource_pool_href = resource_pool.find('ResourcePoolRef')['href']
             params.append(Tag(builder=builder.TreeBuilder(),name='DeleteItem',attrs={'href':resource_pool_href}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.resourcePoolSetUpdateParams', self.extension_href + '/action/updateResourcePools', params, requests.codes.accepted, inspect.stack()[0][3], resource_pool_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.resourcePoolSetUpdateParams', self.extension_href + '/action/updateResourcePools', params, requests.codes.accepted, target_name=resource_pool_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_hostgroup(self, resource_pool_name, hostgroup_name=None, show=True):
+    def get_hostgroup(self, resource_pool_name, hostgroup_name=None, show=None):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
             if resource_pool_record != None:
@@ -1985,13 +4097,13 @@ class ProviderVdc(Container):
                 hostgroups = BeautifulSoup(self.get_entity(resource_pool_href + '/hostGroups'),'xml').find('VMWHostGroups').find('HostGroup', attrs={'name':hostgroup_name})
                 if hostgroups != None:
                     hostgroups = [hostgroups]
-            if show:
+            if Container.showing(show):
                 self.show_records('hostgroup',hostgroups)
             return hostgroups
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_vm(self, resource_pool_name, vm_name=None, show=True):
+    def get_vm(self, resource_pool_name, vm_name=None, show=None):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
             resource_pool_moref = resource_pool_record[0]['resourcePoolMoref']
@@ -2004,13 +4116,13 @@ class ProviderVdc(Container):
                 resource_pool_vms = BeautifulSoup(self.get_entity(resource_pool_href + '/vmList'),'xml').find('QueryResultRecords').find('ResourcePoolVMRecord', attrs={'name':vm_name})
                 if resource_pool_vms != None:
                     resource_pool_vms = [resource_pool_vms]
-            if show:
+            if Container.showing(show):
                 self.show_records('resource_pool_vm',resource_pool_vms)
             return resource_pool_vms
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_vmgroup(self, resource_pool_name, vmgroup_name=None, show=True):
+    def get_vmgroup(self, resource_pool_name, vmgroup_name=None, show=None):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
             resource_pool_moref = resource_pool_record[0]['resourcePoolMoref']
@@ -2023,12 +4135,13 @@ class ProviderVdc(Container):
                 vmgroups = BeautifulSoup(self.get_entity(resource_pool_href + '/vmGroups'),'xml').find('VMWVmGroups').find('VmGroup', attrs={'name':vmgroup_name})
                 if vmgroups != None:
                     vmgroups = [vmgroups]
-            if show:
+            if Container.showing(show):
                 self.show_records('vmgroup',vmgroups)
             return vmgroups
         except:
             Container.handle_exception(sys.exc_info())
  
+    @operation_tag
     def add_vmgroup(self, resource_pool_name, vmgroup_name):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
@@ -2045,11 +4158,12 @@ class ProviderVdc(Container):
                 'xmlns':'http://www.vmware.com/vcloud/extension/v1.5'}))
             params.VMWVmGroup.append(Tag(builder=builder.TreeBuilder(),name='vmCount'))
             params.VMWVmGroup.vmCount.string = '0'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.vmwVmGroupType', resource_pool_href + '/vmGroups', params, requests.codes.accepted, inspect.stack()[0][3], vmgroup_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.vmwVmGroupType', resource_pool_href + '/vmGroups', params, requests.codes.accepted, target_name=vmgroup_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_vmgroup(self, resource_pool_name, vmgroup_name):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
@@ -2061,11 +4175,11 @@ class ProviderVdc(Container):
             if vmgroup == None:
                 logger.info("%s does not exist in %s" % (vmgroup_name,resource_pool_name))
                 return
-            self.api_delete(vmgroup['href'], inspect.stack()[0][3], vmgroup_name)
+            self.api_delete(vmgroup['href'], target_name=vmgroup_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_vmgroup_vm(self, resource_pool_name, vmgroup_name, show=True):
+    def get_vmgroup_vm(self, resource_pool_name, vmgroup_name, show=None):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
             resource_pool_moref = resource_pool_record[0]['resourcePoolMoref']
@@ -2077,12 +4191,13 @@ class ProviderVdc(Container):
                 logger.info("%s does not exist in %s" % (vmgroup_name,resource_pool_name))
                 return
             vmgroup_vms = BeautifulSoup(self.get_entity(vmgroup['href'] + '/vmsList'),'xml').find('QueryResultRecords').find_all('VmGroupVmsRecord', recursive=False)
-            if show:
+            if Container.showing(show):
                 self.show_records('vmgroup_vm',vmgroup_vms)
             return vmgroup_vms
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_vmgroup_vm(self, resource_pool_name, vmgroup_name, vm_name):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
@@ -2105,11 +4220,12 @@ class ProviderVdc(Container):
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='Vms',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5'}))
             params.Vms.append(Tag(builder=builder.TreeBuilder(),name='VmReference',attrs={'href':vm['href'],'name':vm_name}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.vms', vmgroup.find('Link', attrs={'rel':'up'})['href'] + '/action/addVms', params, requests.codes.accepted, inspect.stack()[0][3], vm_name)
+            params = Payload.serialize(params)
+            self.api_post_params('vcloud.vms', vmgroup.find('Link', attrs={'rel':'up'})['href'] + '/action/addVms', params, requests.codes.accepted, target_name=vm_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_vmgroup_vm(self, resource_pool_name, vmgroup_name, vm_name):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
@@ -2132,12 +4248,12 @@ class ProviderVdc(Container):
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='Vms',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5'}))
             params.Vms.append(Tag(builder=builder.TreeBuilder(),name='VmReference',attrs={'href':vm['href'],'name':vm_name}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.vms', vmgroup.find('Link', attrs={'rel':'up'})['href'] + '/action/removeVms', params, requests.codes.accepted, inspect.stack()[0][3], vm_name)
+            params = Payload.serialize(params)
+            self.api_post_params('vcloud.vms', vmgroup.find('Link', attrs={'rel':'up'})['href'] + '/action/removeVms', params, requests.codes.accepted, target_name=vm_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_vm_host_affinity_rule(self, resource_pool_name, vm_host_affinity_rule_name=None, show=True):
+    def get_vm_host_affinity_rule(self, resource_pool_name, vm_host_affinity_rule_name=None, show=None):
         try:
             resource_pool_record = self.get_record('providerVdcResourcePoolRelation', 'ProviderVdcResourcePoolRelationRecord', 'name==' + resource_pool_name + ';providerVdc==' + self.href, show=False)
             resource_pool_moref = resource_pool_record[0]['resourcePoolMoref']
@@ -2150,7 +4266,7 @@ class ProviderVdc(Container):
                 vm_host_affinity_rules = BeautifulSoup(self.get_entity(resource_pool_href + '/rules'),'xml').find('VMWVmHostAffinityRules').find('Name', text=vm_host_affinity_rule_name)
                 if vm_host_affinity_rules != None:
                     vm_host_affinity_rules = [vm_host_affinity_rules.parent]
-            if show:
+            if Container.showing(show):
                 self.show_records('vm_host_affinity_rule',vm_host_affinity_rules)
             return vm_host_affinity_rules
         except:
@@ -2158,9 +4274,9 @@ class ProviderVdc(Container):
 
 class OrgVdc(Container):
     
-    def __init__(self, name):
-        Container.__init__(self, name)
-        self.href = self.get_href()
+    def __init__(self, name, context=None, href=None):
+        Container.__init__(self, name, context)
+        self.href = self.get_href() if href == None else href
         self.admin_href = self.href.replace('/api', '/api/admin')
 
     def get_href(self):
@@ -2170,33 +4286,34 @@ class OrgVdc(Container):
             Container.handle_exception(sys.exc_info())
     
     def get_compute(self):
-            vdc_entity = self.get_entity(self.href)
+            vdc_entity = XmlResponse(self.get_entity(self.href))
             compute = {}
             # cpu_mhz
-            cpu_limit = int(BeautifulSoup(vdc_entity,'xml').Vdc.ComputeCapacity.Cpu.Limit.string)
-            cpu_used = int(BeautifulSoup(vdc_entity,'xml').Vdc.ComputeCapacity.Cpu.Used.string)
-            cpu_overhead = int(BeautifulSoup(vdc_entity,'xml').Vdc.ComputeCapacity.Cpu.Overhead.string)
+            cpu_limit = int(vdc_entity.findtext('ComputeCapacity/Cpu/Limit'))
+            cpu_used = int(vdc_entity.findtext('ComputeCapacity/Cpu/Used'))
+            cpu_overhead = int(vdc_entity.findtext('ComputeCapacity/Cpu/Overhead'))
             cpu_mhz = cpu_limit - cpu_used - cpu_overhead
             compute['cpu_mhz'] = cpu_mhz
             # memory_mb
-            memory_limit = int(BeautifulSoup(vdc_entity,'xml').Vdc.ComputeCapacity.Memory.Limit.string)
-            memory_used = int(BeautifulSoup(vdc_entity,'xml').Vdc.ComputeCapacity.Memory.Used.string)
-            memory_overhead = int(BeautifulSoup(vdc_entity,'xml').Vdc.ComputeCapacity.Memory.Overhead.string)
+            memory_limit = int(vdc_entity.findtext('ComputeCapacity/Memory/Limit'))
+            memory_used = int(vdc_entity.findtext('ComputeCapacity/Memory/Used'))
+            memory_overhead = int(vdc_entity.findtext('ComputeCapacity/Memory/Overhead'))
             memory_mb = memory_limit - memory_used - memory_overhead
             compute['memory_mb'] = memory_mb
             return compute
 
-    def get_storage_profile(self, name=None, detailed=False, show=True):
+    def get_storage_profile(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'vdc==' + self.href
             record_filter += ';name==' + name if name != None else ''
-            if Container.session_org_name.lower() == 'system':
+            if self.context.org_name.lower() == 'system':
                 return self.get_record('adminOrgVdcStorageProfile', 'AdminOrgVdcStorageProfileRecord', record_filter, detailed=detailed, show=show)
             else:
                 return self.get_record('orgVdcStorageProfile', 'OrgVdcStorageProfileRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_storage_profile(self, storage_profile_name, enable=None, default=None, limit_gb=None):
         try:
             storage_profile_record = self.get_record('adminOrgVdcStorageProfile', 'AdminOrgVdcStorageProfileRecord', 'name==' + storage_profile_name + ';vdc==' + self.href, show=False)
@@ -2210,12 +4327,12 @@ class OrgVdc(Container):
                 params.AdminVdcStorageProfile.Default.string = str(default).lower()
             if limit_gb != None:
                 params.AdminVdcStorageProfile.Limit.string = str(limit_gb*1024) 
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.vdcStorageProfile', storage_profile_record[0]['href'].replace('/api','/api/admin'), params, requests.codes.ok, inspect.stack()[0][3], storage_profile_name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.vdcStorageProfile', storage_profile_record[0]['href'].replace('/api','/api/admin'), params, requests.codes.ok, target_name=storage_profile_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_network(self,name=None,link_type=None,shared=False,detailed=False, show=True):
+    def get_network(self,name=None,link_type=None,shared=False,detailed=False, show=None, stream=False):
         try:
             if link_type != None and link_type not in Container.vdc_network_types.keys():
                 logger.info("%s not in %s" % (link_type, Container.vdc_network_types.keys()))
@@ -2224,10 +4341,11 @@ class OrgVdc(Container):
             record_filter += ';name==' + name if name != None else ''
             record_filter += ';linkType==' + Container.vdc_network_types[link_type] if link_type != None else ''
             record_filter += ';isShared==' + str(shared).lower() if shared else ''
-            return self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_network(self,network_name,name=None,shared=None):
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) == 0:
@@ -2238,8 +4356,8 @@ class OrgVdc(Container):
                 params.OrgVdcNetwork['name'] = name 
             if shared != None:
                 params.OrgVdcNetwork.IsShared.string = str(shared).lower() 
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('vcloud.orgVdcNetwork', network_record[0]['href'], params, requests.codes.accepted, inspect.stack()[0][3], network_name)
+            params = Payload.serialize(params)
+            self.api_put_params('vcloud.orgVdcNetwork', network_record[0]['href'], params, requests.codes.accepted, target_name=network_name)
 
     def get_network_ip_in_use(self,network_name):
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
@@ -2258,6 +4376,7 @@ class OrgVdc(Container):
             self.show_records('IpRange',records)
             return records
 
+    @operation_tag
     def set_network_iprange(self,network_name,iprange_index,iprange_start=None,iprange_end=None):
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) == 0:
@@ -2275,9 +4394,10 @@ class OrgVdc(Container):
                 ipranges[iprange_index].StartAddress.string = iprange_start 
             if iprange_end != None:
                 ipranges[iprange_index].EndAddress.string = iprange_end 
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('vcloud.orgVdcNetwork', network_record[0]['href'], params, requests.codes.accepted, inspect.stack()[0][3], network_name)
+            params = Payload.serialize(params)
+            self.api_put_params('vcloud.orgVdcNetwork', network_record[0]['href'], params, requests.codes.accepted, target_name=network_name)
 
+    @operation_tag
     def add_network_iprange(self,network_name,iprange_start,iprange_end):
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) == 0:
@@ -2294,9 +4414,10 @@ class OrgVdc(Container):
                 ipranges[-1].insert_after(iprange)
             else:
                 params.append(iprange)
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('vcloud.orgVdcNetwork', network_record[0]['href'], params, requests.codes.accepted, inspect.stack()[0][3], network_name)
+            params = Payload.serialize(params)
+            self.api_put_params('vcloud.orgVdcNetwork', network_record[0]['href'], params, requests.codes.accepted, target_name=network_name)
 
+    @operation_tag
     def del_network_iprange(self,network_name,iprange_index):
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) == 0:
@@ -2308,19 +4429,20 @@ class OrgVdc(Container):
                 logger.info("%s does not exist in %s" % (iprange_index,network_name))
                 return
             ipranges[iprange_index].extract()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('vcloud.orgVdcNetwork', network_record[0]['href'], params, requests.codes.accepted, inspect.stack()[0][3], network_name)
+            params = Payload.serialize(params)
+            self.api_put_params('vcloud.orgVdcNetwork', network_record[0]['href'], params, requests.codes.accepted, target_name=network_name)
 
+    @operation_tag
     def add_network(self,network_name,fence_mode,ipscope_gateway,ipscope_netmask,ipscope_dns1=None,ipscope_dns_suffix=None,iprange_start=None,iprange_end=None,edge_gateway_name=None,shared=False):
         try:
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) > 0:
                 logger.info("%s already exist in %s" % (network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), network_name))
                 return
             if fence_mode not in Container.fence_modes:
                 logger.info("%s not in %s" % (fence_mode, Container.fence_modes))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), network_name))
                 return
             if fence_mode == 'natRouted' and edge_gateway_name == None:
                 logger.info("edge_gateway_name must be specified for fence_mode natRouted")
@@ -2361,26 +4483,28 @@ class OrgVdc(Container):
                 params.append(Tag(builder=builder.TreeBuilder(),name='EdgeGateway',attrs={'href':edge_gateway_record[0]['href']}))
             params.append(Tag(builder=builder.TreeBuilder(),name='IsShared'))
             params.IsShared.string = str(shared).lower() 
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.orgVdcNetwork', self.admin_href + '/networks', params, requests.codes.created, inspect.stack()[0][3], network_name)
+            params = Payload.serialize(params)
+            self.api_post_params('vcloud.orgVdcNetwork', self.admin_href + '/networks', params, requests.codes.created, target_name=network_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_network(self,network_name):
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) == 0:
                 logger.info("%s does not exist in %s" % (network_name,self.name))
                 return
-            self.api_delete(network_record[0]['href'], inspect.stack()[0][3], network_name)
+            self.api_delete(network_record[0]['href'], target_name=network_name)
 
+    @operation_tag
     def reset_network(self,network_name):
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) == 0:
                 logger.info("%s does not exist in %s" % (network_name,self.name))
                 return
-            self.api_post(network_record[0]['href'] + '/action/reset', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(network_record[0]['href'] + '/action/reset', requests.codes.accepted)
 
-    def get_edge_gateway(self, name=None, detailed=False, show=True):
+    def get_edge_gateway(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'vdc==' + self.href
             record_filter += ';name==' + name if name != None else ''
@@ -2388,6 +4512,7 @@ class OrgVdc(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_edge_gateway(self,edge_gateway_name,externalnet_name,externalnet_gateway,externalnet_netmask,iprange_start,iprange_end,edge_gateway_size='compact',default_route=True,enable_ha=False):
         try:
             if edge_gateway_size not in self.edge_gateway_sizes:
@@ -2396,7 +4521,7 @@ class OrgVdc(Container):
             edge_gateway_record = self.get_record('edgeGateway', 'EdgeGatewayRecord', 'name==' + edge_gateway_name + ';vdc==' + self.href,show=False)
             if len(edge_gateway_record) > 0:
                 logger.info("%s already exist in %s" % (edge_gateway_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], edge_gateway_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), edge_gateway_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params = Tag(builder=builder.TreeBuilder(),name='EdgeGateway',attrs={'name':edge_gateway_name,'xmlns':'http://www.vmware.com/vcloud/v1.5'})
@@ -2428,74 +4553,65 @@ class OrgVdc(Container):
             params.Configuration.GatewayInterfaces.GatewayInterface.UseForDefaultRoute.string = str(default_route).lower()
             params.Configuration.append(Tag(builder=builder.TreeBuilder(),name='HaEnabled'))
             params.Configuration.HaEnabled.string = str(enable_ha).lower()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGateway', self.admin_href + '/edgeGateways', params, requests.codes.created, inspect.stack()[0][3], edge_gateway_name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGateway', self.admin_href + '/edgeGateways', params, requests.codes.created, target_name=edge_gateway_name)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def del_edge_gateway(self,edge_gateway_name):
         try:
             edge_gateway_record = self.get_record('edgeGateway', 'EdgeGatewayRecord', 'name==' + edge_gateway_name + ';vdc==' + self.href,show=False)
             if len(edge_gateway_record) == 0:
                 logger.info("%s does not exist in %s" % (edge_gateway_name,self.name))
                 return
-            self.api_delete(edge_gateway_record[0]['href'], inspect.stack()[0][3], edge_gateway_name)
+            self.api_delete(edge_gateway_record[0]['href'], target_name=edge_gateway_name)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_vapp(self, name=None, detailed=False, show=True):
+    def get_vapp(self, name=None, detailed=False, show=None, stream=False):
         try:
             record_filter = 'vdc==' + self.href
             record_filter += ';name==' + name if name != None else ''
-            return self.get_record('vApp', 'VAppRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('vApp', 'VAppRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def get_vapp_template(self, name=None, detailed=False, show=True):
+    def get_vapp_template(self, name=None, detailed=False, show=None, stream=False):
         try:
             record_filter = 'vdc==' + self.href
             record_filter += ';name==' + name if name != None else ''
-            return self.get_record('vAppTemplate', 'VAppTemplateRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('vAppTemplate', 'VAppTemplateRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
-    def add_vapp(self,vapp_name,vapp_template_name=None,source_vapp_name=None, source_vdc_name=None, source_delete=False):
+    @operation_tag
+    def add_vapp(self,vapp_name,vapp_template_name=None,source_vapp_name=None, source_vdc_name=None, source_delete=False, wait=True):
             vapp_record = self.get_record('vApp', 'VAppRecord', 'vdcName==' + self.name + ';name==' + vapp_name, show=False)
             if len(vapp_record) > 0:
                 logger.info("%s already exists" % (vapp_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_name))
                 return
             # empty vapp
             if vapp_template_name == None and source_vapp_name == None:
-                params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
-                params.append(Tag(builder=builder.TreeBuilder(),name='ComposeVAppParams',attrs={'name':vapp_name,
-                    'xmlns':'http://www.vmware.com/vcloud/v1.5',
-                    'xmlns:ovf':'http://schemas.dmtf.org/ovf/envelope/1'}))
-                params.ComposeVAppParams.append(Tag(builder=builder.TreeBuilder(),name='Description'))
-                params.ComposeVAppParams.append(Tag(builder=builder.TreeBuilder(),name='InstantiationParams'))
-                params.ComposeVAppParams.append(Tag(builder=builder.TreeBuilder(),name='AllEULAsAccepted'))
-                params.ComposeVAppParams.AllEULAsAccepted.string = 'true'
-                params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-                self.api_post_params('vcloud.ComposeVAppParams', self.href + '/action/composeVApp', params, requests.codes.created, inspect.stack()[0][3], vapp_name)
+                E = Payload.E_ovf
+                params = E.ComposeVAppParams(E.Description(), E.InstantiationParams(), E.AllEULAsAccepted('true'), name=vapp_name)
+                params = Payload.serialize(params)
+                return self.api_post_params('vcloud.ComposeVAppParams', self.href + '/action/composeVApp', params, requests.codes.created, target_name=vapp_name, wait=wait)
                 return
             # vapp from template
             if vapp_template_name:
                 vapp_template = self.get_vapp_template(vapp_template_name, detailed=False, show=False)
                 if len(vapp_template) == 0:
                     logger.info("%s not in %s" % (vapp_template_name, self.name))
-                    logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_name))
+                    logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_name))
                     return
-                params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
-                params.append(Tag(builder=builder.TreeBuilder(),name='InstantiateVAppTemplateParams',attrs={'name':vapp_name,
-                    'xmlns':'http://www.vmware.com/vcloud/v1.5',
-                    'xmlns:ovf':'http://schemas.dmtf.org/ovf/envelope/1'}))
-                params.InstantiateVAppTemplateParams.append(Tag(builder=builder.TreeBuilder(),name='Description'))
-                params.InstantiateVAppTemplateParams.append(Tag(builder=builder.TreeBuilder(),name='InstantiationParams'))
-                params.InstantiateVAppTemplateParams.append(Tag(builder=builder.TreeBuilder(),name='Source',attrs={'href':vapp_template[0]['href'],
-                    'name':vapp_template_name,
-                    'type':'application/vnd.vmware.vcloud.vAppTemplate+xml'}))
-                params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-                self.api_post_params('vcloud.instantiateVAppTemplateParams', self.href + '/action/instantiateVAppTemplate', params, requests.codes.created, inspect.stack()[0][3], vapp_name)
+                E = Payload.E_ovf
+                params = E.InstantiateVAppTemplateParams(E.Description(), E.InstantiationParams(),
+                    E.Source(href=vapp_template[0]['href'], name=vapp_template_name, type='application/vnd.vmware.vcloud.vAppTemplate+xml'),
+                    name=vapp_name)
+                params = Payload.serialize(params)
+                return self.api_post_params('vcloud.instantiateVAppTemplateParams', self.href + '/action/instantiateVAppTemplate', params, requests.codes.created, target_name=vapp_name, wait=wait)
                 return
             # clone vapp
             if source_vapp_name and not source_vdc_name:
@@ -2503,41 +4619,39 @@ class OrgVdc(Container):
             if source_vapp_name and source_vdc_name:
                 if len(self.get_record('orgVdc', 'OrgVdcRecord', 'name==' + source_vdc_name, show=False)) == 0:
                     logger.info("%s does not exist" % (source_vdc_name))
-                    logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], source_vdc_name))
+                    logger.info("%s %s %s failed" % (self.name, Metrics.operation(), source_vdc_name))
                     return
                 source_vapp_record = self.get_record('vApp', 'VAppRecord', 'vdcName==' + source_vdc_name + ';name==' + source_vapp_name, show=False)
                 if len(source_vapp_record) == 0:
                     logger.info("%s does not exist in %s" % (source_vapp_name, source_vdc_name))
-                    logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], source_vapp_name))
+                    logger.info("%s %s %s failed" % (self.name, Metrics.operation(), source_vapp_name))
                     return
-                params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
-                params.append(Tag(builder=builder.TreeBuilder(),name='CloneVAppParams',attrs={'name':vapp_name,
-                    'xmlns':'http://www.vmware.com/vcloud/v1.5'}))
-                params.CloneVAppParams.append(Tag(builder=builder.TreeBuilder(),name='Description'))
-                params.CloneVAppParams.append(Tag(builder=builder.TreeBuilder(),name='Source',attrs={'href':source_vapp_record[0]['href'],
-                    'name':source_vapp_record[0]['name'],
-                    'type':'application/vnd.vmware.vcloud.cloneVAppParams+xml'}))
-                params.CloneVAppParams.append(Tag(builder=builder.TreeBuilder(),name='IsSourceDelete'))
-                params.CloneVAppParams.IsSourceDelete.string = str(source_delete).lower()
-                params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-                self.api_post_params('vcloud.cloneVAppParams', self.href + '/action/cloneVApp', params, requests.codes.created, inspect.stack()[0][3], source_vapp_name)
-
-    def del_vapp(self, vapp_name):
+                E = Payload.E
+                params = E.CloneVAppParams(E.Description(),
+                    E.Source(href=source_vapp_record[0]['href'], name=source_vapp_record[0]['name'], type='application/vnd.vmware.vcloud.cloneVAppParams+xml'),
+                    E.IsSourceDelete(Payload.text(source_delete)),
+                    name=vapp_name)
+                params = Payload.serialize(params)
+                return self.api_post_params('vcloud.cloneVAppParams', self.href + '/action/cloneVApp', params, requests.codes.created, target_name=source_vapp_name, wait=wait)
+
+    @operation_tag
+    def del_vapp(self, vapp_name, wait=True):
             vapp_record = self.get_record('vApp', 'VAppRecord', 'vdcName==' + self.name + ';name==' + vapp_name, show=False)
             if len(vapp_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_name))
                 return
-            self.api_delete(vapp_record[0]['href'], inspect.stack()[0][3], vapp_name)
+            return self.api_delete(vapp_record[0]['href'], target_name=vapp_name, wait=wait)
 
-    def get_independent_disk(self, name=None, detailed=False, show=True):
+    def get_independent_disk(self, name=None, detailed=False, show=None, stream=False):
         try:
             record_filter = 'vdc==' + self.href
             record_filter += ';name==' + name if name != None else ''
-            return self.get_record('disk', 'DiskRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('disk', 'DiskRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_independent_disk(self,disk_index,name=None,storage_profile_name=None):
         disks = self.get_record('disk', 'DiskRecord', 'vdcName==' + self.name, show=False)
         if disk_index not in range(len(disks)):
@@ -2550,12 +4664,13 @@ class OrgVdc(Container):
             storage_profile_record = self.get_record('orgVdcStorageProfile','OrgVdcStorageProfileRecord','name==' + storage_profile_name + ';vdc==' + self.href, show=False)
             if len(storage_profile_record) == 0:
                 logger.info("%s does not exist" % (storage_profile_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], storage_profile_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), storage_profile_name))
                 return
             params.Disk.StorageProfile['href'] = storage_profile_record[0]['href']
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_put_params('vcloud.disk', disks[disk_index]['href'], params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_put_params('vcloud.disk', disks[disk_index]['href'], params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_independent_disk(self,size_gb,name=None,bus_sub_type='lsilogic'):
         if name == None:
             name = self.name + '_' + str(size_gb) + 'GB' 
@@ -2568,41 +4683,44 @@ class OrgVdc(Container):
             'size':str(size_gb*1024*1024*1024),
             'busType':Container.disk_bus_sub_types[bus_sub_type],
             'busSubType':bus_sub_type}))
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.diskCreateParams', self.href + '/disk', params, requests.codes.created, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.diskCreateParams', self.href + '/disk', params, requests.codes.created, target_name=self.name)
 
+    @operation_tag
     def del_independent_disk(self,disk_index):
         disks = self.get_record('disk', 'DiskRecord', 'vdcName==' + self.name, show=False)
         if disk_index not in range(len(disks)):
             logger.info("%s does not exist in %s" % (disk_index,self.name))
             return
-        self.api_delete(disks[disk_index]['href'], inspect.stack()[0][3], self.name)
+        self.api_delete(disks[disk_index]['href'], target_name=self.name)
 
 class EdgeGateway(Container):
 
-    def __init__(self, name, parent):
-        Container.__init__(self, name)
+    def __init__(self, name, parent, context=None, href=None):
+        Container.__init__(self, name, parent.context if context == None else context)
         self.parent = parent
-        self.href = self.get_href(parent)
+        self.href = self.get_href(parent) if href == None else href
 
+    @operation_tag
     def get_href(self, parent):
-            edge_gateway_record = self.get_record('edgeGateway', 'EdgeGatewayRecord', 'name==' + self.name + ';vdc==' + self.parent.href, show=False)
-            if len(edge_gateway_record) == 0:
+            edge_gateway_hrefs = self.resolve_hrefs('edgeGateway', 'EdgeGatewayRecord', self.name, 'vdc==' + self.parent.href)
+            if len(edge_gateway_hrefs) == 0:
                 logger.info("%s not in %s" % (self.name, self.parent.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], self.parent.name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), self.parent.name))
                 return None
-            return edge_gateway_record[0]['href']
+            return edge_gateway_hrefs[0]
 
+    @operation_tag
     def set_edge_gateway(self,name=None,enable_advanced=False):
         try:
             if enable_advanced:
-                self.api_post(self.href + '/action/convertToAdvancedGateway', requests.codes.no_content, inspect.stack()[0][3])
+                self.api_post(self.href + '/action/convertToAdvancedGateway', requests.codes.no_content)
             edge_gateway_entity = self.get_entity(self.href)
             params = BeautifulSoup(edge_gateway_entity,'xml')
             if name != None:
                 params.EdgeGateway['name'] = name
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.edgeGateway', self.href, params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.edgeGateway', self.href, params, requests.codes.accepted, target_name=self.name)
         except:
             Container.handle_exception(sys.exc_info())
 
@@ -2611,6 +4729,7 @@ class EdgeGateway(Container):
             self.show_records('interface',records)
             return records
 
+    @operation_tag
     def add_interface(self,externalnet_name,externalnet_gateway,externalnet_netmask,iprange_start,iprange_end,default_route=False):
         try:
             params = BeautifulSoup(self.get_entity(self.href),'xml')
@@ -2636,57 +4755,55 @@ class EdgeGateway(Container):
             interface.append(Tag(builder=builder.TreeBuilder(),name='UseForDefaultRoute'))
             interface.UseForDefaultRoute.string = str(default_route).lower()
             params.GatewayInterfaces.append(interface)            
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_put_params('admin.edgeGateway', self.href, params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_put_params('admin.edgeGateway', self.href, params, requests.codes.accepted, target_name=self.name)
         except:
             Container.handle_exception(sys.exc_info())
     
     def get_dhcp(self): 
             return Container.convertXml2Yaml(str(BeautifulSoup(self.get_entity(self.href),'xml').find('GatewayDhcpService')))
 
+    @operation_tag
     def set_dhcp(self, enable): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            if params.find('GatewayDhcpService') == None:
-                params.append(Tag(builder=builder.TreeBuilder(),name='GatewayDhcpService'))
-                params.GatewayDhcpService.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-            params.GatewayDhcpService.IsEnabled.string = str(enable).lower() 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            Payload.child(params, 'GatewayDhcpService', 'IsEnabled').text = Payload.text(enable)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_dhcp_pools(self): 
             records = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('GatewayDhcpService').find_all('Pool',recursive=False)
             self.show_records('pool',records)
             return records
 
+    @operation_tag
     def set_dhcp_pool(self,pool_index,enable=None,network_name=None,default_lease_time=None,max_lease_time=None,iprange_start=None,iprange_end=None): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            pools = params.find('GatewayDhcpService').find_all('Pool',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            pools = params.findall(XmlResponse.path('GatewayDhcpService/Pool'))
             if pool_index not in range(len(pools)):
                 logger.info("%s does not exist in %s" % (pool_index,self.name))
                 return
+            pool = pools[pool_index]
             if enable != None:
-                pools[pool_index].IsEnabled.string = str(enable).lower()
+                pool.find('{*}IsEnabled').text = Payload.text(enable)
             if network_name != None:
                 network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
                 if len(network_record) == 0:
                     logger.info("%s does not exist in %s" % (network_name, self.name))
                     return
-                pools[pool_index].Network['href'] = network_record[0]['href']
+                pool.find('{*}Network').set('href', network_record[0]['href'])
             if default_lease_time != None:
-                pools[pool_index].DefaultLeaseTime.string = str(default_lease_time) 
+                pool.find('{*}DefaultLeaseTime').text = str(default_lease_time)
             if max_lease_time != None:
-                pools[pool_index].MaxLeaseTime.string = str(max_lease_time) 
+                pool.find('{*}MaxLeaseTime').text = str(max_lease_time)
             if iprange_start != None:
-                pools[pool_index].LowIpAddress.string = iprange_start 
+                pool.find('{*}LowIpAddress').text = iprange_start
             if iprange_end != None:
-                pools[pool_index].HighIpAddress.string = iprange_end 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+                pool.find('{*}HighIpAddress').text = iprange_end
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_dhcp_pool(self,enable=True,network_name=None,default_lease_time=3600,max_lease_time=7200,iprange_start=None,iprange_end=None): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             if network_name == None:
                 logger.info("network_name must be specified")
                 return
@@ -2697,199 +4814,170 @@ class EdgeGateway(Container):
             if len(network_record) == 0:
                 logger.info("%s does not exist in %s" % (network_name, self.name))
                 return
-            pool = Tag(builder=builder.TreeBuilder(),name='Pool')
-            pool.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-            pool.IsEnabled.string = str(enable).lower() 
-            pool.append(Tag(builder=builder.TreeBuilder(),name='Network',attrs={'href':network_record[0]['href']}))
-            pool.append(Tag(builder=builder.TreeBuilder(),name='DefaultLeaseTime'))
-            pool.DefaultLeaseTime.string = str(default_lease_time) 
-            pool.append(Tag(builder=builder.TreeBuilder(),name='MaxLeaseTime'))
-            pool.MaxLeaseTime.string = str(max_lease_time) 
-            pool.append(Tag(builder=builder.TreeBuilder(),name='LowIpAddress'))
-            pool.append(Tag(builder=builder.TreeBuilder(),name='HighIpAddress'))
-            pool.LowIpAddress.string = iprange_start 
-            pool.HighIpAddress.string = iprange_end 
-            params.GatewayDhcpService.append(pool)
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
-
+            E = Payload.E
+            pool = E.Pool(
+                E.IsEnabled(Payload.text(enable)),
+                E.Network(href=network_record[0]['href']),
+                E.DefaultLeaseTime(str(default_lease_time)),
+                E.MaxLeaseTime(str(max_lease_time)),
+                E.LowIpAddress(iprange_start),
+                E.HighIpAddress(iprange_end))
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            Payload.child(params, 'GatewayDhcpService').append(pool)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
+
+    @operation_tag
     def del_dhcp_pool(self,pool_index): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            pools = params.find('GatewayDhcpService').find_all('Pool',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            pools = params.findall(XmlResponse.path('GatewayDhcpService/Pool'))
             if pool_index not in range(len(pools)):
                 logger.info("%s does not exist in %s" % (pool_index,self.name))
                 return
-            pools[pool_index].extract()
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            pools[pool_index].getparent().remove(pools[pool_index])
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_firewall(self): 
             return Container.convertXml2Yaml(str(BeautifulSoup(self.get_entity(self.href),'xml').find('FirewallService')))
 
+    @operation_tag
     def set_firewall(self,enable=None,default_action=None,log_default_action=None): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            firewall = params.find('{*}FirewallService')
             if enable != None:
-                params.FirewallService.IsEnabled.string = str(enable).lower() 
+                firewall.find('{*}IsEnabled').text = Payload.text(enable)
             if default_action != None:
-                params.FirewallService.DefaultAction.string = default_action 
+                firewall.find('{*}DefaultAction').text = default_action
             if log_default_action != None:
-                params.FirewallService.LogDefaultAction.string = str(log_default_action).lower() 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+                firewall.find('{*}LogDefaultAction').text = Payload.text(log_default_action)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_firewall_rules(self): 
             records = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('FirewallService').find_all('FirewallRule',recursive=False)
             self.show_records('rule',records)
             return records
 
+    @operation_tag
     def set_firewall_rule(self,rule_index,enable=None,rule_name=None,action=None,protocols=None,dest_port=None,dest_ip=None,source_port=None,source_ip=None,log=None): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            rules = params.find('FirewallService').find_all('FirewallRule',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            rules = params.findall(XmlResponse.path('FirewallService/FirewallRule'))
             if rule_index not in range(len(rules)):
                 logger.info("%s does not exist in %s" % (rule_index,self.name))
                 return
+            rule = rules[rule_index]
             if enable != None:
-                rules[rule_index].IsEnabled.string = str(enable).lower()
+                rule.find('{*}IsEnabled').text = Payload.text(enable)
             if rule_name != None:
-                rules[rule_index].Description.string = rule_name
+                rule.find('{*}Description').text = rule_name
             if action != None:
-                rules[rule_index].Policy.string = action
+                rule.find('{*}Policy').text = action
             if protocols != None:
                 if protocols not in Container.firewall_protocols:
                         logger.info("%s not in %s" % (protocols,Container.firewall_protocols))
                         return
-                rules[rule_index].Protocols.clear()
-                for protocol in protocols:
-                    rules[rule_index].Protocols.append(Tag(builder=builder.TreeBuilder(),name=protocol))
-                    rules[rule_index].Protocols.find(protocol).string = 'true'
-            rules[rule_index].Port.string = '-1'
+                rule.find('{*}Protocols').clear()
+                rule.find('{*}Protocols').extend([getattr(Payload.E, protocol)('true') for protocol in protocols])
+            rule.find('{*}Port').text = '-1'
             if dest_port != None:
-                rules[rule_index].DestinationPortRange.string = dest_port 
+                rule.find('{*}DestinationPortRange').text = dest_port 
             if dest_ip != None:
-                rules[rule_index].DestinationIp.string = dest_ip 
-            rules[rule_index].SourcePort.string = '-1'
+                rule.find('{*}DestinationIp').text = dest_ip 
+            rule.find('{*}SourcePort').text = '-1'
             if source_port != None:
-                rules[rule_index].SourcePortRange.string = source_port 
+                rule.find('{*}SourcePortRange').text = source_port 
             if source_ip != None:
-                rules[rule_index].SourceIp.string = source_ip 
-            rules[rule_index].EnableLogging.string = str(log).lower()
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+                rule.find('{*}SourceIp').text = source_ip 
+            rule.find('{*}EnableLogging').text = Payload.text(log)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_firewall_rule(self,rule_index,enable=True,rule_name='',action='allow',protocols=['Tcp'],dest_port=None,dest_ip=None,source_port=None,source_ip=None,log=True): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            rule = Tag(builder=builder.TreeBuilder(),name='FirewallRule')
-            rule.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-            rule.IsEnabled.string = str(enable).lower() 
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Description'))
-            rule.Description.string = rule_name
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Policy'))
             if action not in Container.firewall_policies:
                 logger.info("%s not in %s" % (action,Container.firewall_policies))
                 return
-            else:
-                rule.Policy.string = action
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Protocols'))
-            if protocols:
-                if protocols not in Container.firewall_protocols:
-                        logger.info("%s not in %s" % (protocols,Container.firewall_protocols))
-                        return
-                for protocol in protocols:
-                    rule.Protocols.append(Tag(builder=builder.TreeBuilder(),name=protocol))
-                    rule.Protocols.find(protocol).string = 'true'
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Port'))
-            rule.Port.string = '-1'
-            if dest_port:
-                rule.append(Tag(builder=builder.TreeBuilder(),name='DestinationPortRange'))
-                rule.DestinationPortRange.string = dest_port 
-            else:
-                logger.info("dest_port must be specified")
+            if protocols and protocols not in Container.firewall_protocols:
+                logger.info("%s not in %s" % (protocols,Container.firewall_protocols))
                 return
-            if dest_ip:
-                rule.append(Tag(builder=builder.TreeBuilder(),name='DestinationIp'))
-                rule.DestinationIp.string = dest_ip 
-            else:
-                logger.info("dest_ip must be specified")
-                return
-            rule.append(Tag(builder=builder.TreeBuilder(),name='SourcePort'))
-            rule.SourcePort.string = '-1'
-            if source_port:
-                rule.append(Tag(builder=builder.TreeBuilder(),name='SourcePortRange'))
-                rule.SourcePortRange.string = source_port 
-            else:
-                logger.info("source_port must be specified")
-                return
-            if source_ip:
-                rule.append(Tag(builder=builder.TreeBuilder(),name='SourceIp'))
-                rule.SourceIp.string = source_ip 
-            else:
-                logger.info("source_ip must be specified")
-                return
-            rule.append(Tag(builder=builder.TreeBuilder(),name='EnableLogging'))
-            rule.EnableLogging.string = str(log).lower() 
-            rules = params.find('FirewallService').find_all('FirewallRule',recursive=False)
+            for option, value in (('dest_port', dest_port), ('dest_ip', dest_ip), ('source_port', source_port), ('source_ip', source_ip)):
+                if not value:
+                    logger.info("%s must be specified" % (option))
+                    return
+            E = Payload.E
+            rule = E.FirewallRule(
+                E.IsEnabled(Payload.text(enable)),
+                E.Description(rule_name),
+                E.Policy(action),
+                E.Protocols(*[getattr(E, protocol)('true') for protocol in protocols or []]),
+                E.Port('-1'),
+                E.DestinationPortRange(dest_port),
+                E.DestinationIp(dest_ip),
+                E.SourcePort('-1'),
+                E.SourcePortRange(source_port),
+                E.SourceIp(source_ip),
+                E.EnableLogging(Payload.text(log)))
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            firewall = params.find('{*}FirewallService')
+            rules = firewall.findall('{*}FirewallRule')
             if len(rules) == 0: 
-                params.find('FirewallService').append(rule)
+                firewall.append(rule)
             elif rule_index < len(rules):
-                rules[rule_index].insert_before(rule)
+                rules[rule_index].addprevious(rule)
             elif rule_index >= len(rules):
-                rules[-1].insert_after(rule)
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+                rules[-1].addnext(rule)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def del_firewall_rule(self,rule_index): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            rules = params.find('FirewallService').find_all('FirewallRule',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            rules = params.findall(XmlResponse.path('FirewallService/FirewallRule'))
             if rule_index not in range(len(rules)):
                 logger.info("%s does not exist in %s" % (rule_index,self.name))
                 return
-            rules[rule_index].extract()
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            rules[rule_index].getparent().remove(rules[rule_index])
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_nat(self): 
             return Container.convertXml2Yaml(str(BeautifulSoup(self.get_entity(self.href),'xml').find('NatService')))
 
+    @operation_tag
     def set_nat(self, enable): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            if params.find('NatService') == None:
-                params.append(Tag(builder=builder.TreeBuilder(),name='NatService'))
-                params.NatService.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-                params.NatService.IsEnabled.string = str(enable).lower() 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            Payload.child(params, 'NatService', 'IsEnabled').text = Payload.text(enable)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_nat_rules(self): 
             records = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('NatService').find_all('NatRule',recursive=False)
             self.show_records('rule',records)
             return rules
 
+    @operation_tag
     def set_nat_rule(self,rule_index,enable=None,network_name=None,original_ip=None,original_port=None,translated_ip=None,translated_port=None,protocol=None,icmp_sub_type=None): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            rules = params.find('NatService').find_all('NatRule',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            rules = params.findall(XmlResponse.path('NatService/NatRule'))
             if rule_index not in range(len(rules)):
                 logger.info("%s does not exist in %s" % (rule_index,self.name))
                 return
+            rule = rules[rule_index]
+            gateway_rule = rule.find('{*}GatewayNatRule')
             if enable != None:
-                rules[rule_index].IsEnabled.string = str(enable).lower() 
+                rule.find('{*}IsEnabled').text = Payload.text(enable)
             if network_name != None:
                 network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
                 if len(network_record) == 0:
                     logger.info("%s does not exist in %s" % (network_name, self.name))
                     return
-                rules[rule_index].GatewayNatRule.Interface['href'] = network_record[0]['href']
+                gateway_rule.find('{*}Interface').set('href', network_record[0]['href'])
             if original_ip != None:
-                rules[rule_index].GatewayNatRule.OriginalIp.string = original_ip 
+                gateway_rule.find('{*}OriginalIp').text = original_ip
             if translated_ip != None:
-                rules[rule_index].GatewayNatRule.TranslatedIp.string = translated_ip 
-            nat_type = rules[rule_index].RuleType.string
+                gateway_rule.find('{*}TranslatedIp').text = translated_ip
+            nat_type = rule.findtext('{*}RuleType')
             if nat_type == 'DNAT':
                 if protocol == 'icmp' and icmp_sub_type == None:
                     logger.info("icmp_sub_type must be specified for protocol icmp")
@@ -2898,39 +4986,30 @@ class EdgeGateway(Container):
                     logger.info("%s not in %s" % (icmp_sub_type,Container.icmp_sub_types))
                     return
                 if protocol == 'icmp' and icmp_sub_type:
-                    rules[rule_index].GatewayNatRule.IcmpSubType.string = icmp_sub_type
+                    Payload.child(gateway_rule, 'IcmpSubType').text = icmp_sub_type
                     original_port = 'any'
                     translated_port = 'any'
                 if original_port != None:
-                    rules[rule_index].GatewayNatRule.OriginalPort.string = original_port 
+                    gateway_rule.find('{*}OriginalPort').text = original_port
                 if translated_port != None:
-                    rules[rule_index].GatewayNatRule.TranslatedPort.string = translated_port 
+                    gateway_rule.find('{*}TranslatedPort').text = translated_port
             if protocol != None and protocol not in Container.edge_gateway_dnat_protocols:
                 logger.info("%s not in %s" % (protocol,Container.edge_gateway_dnat_protocols))
                 return
             if protocol != None:
-                rules[rule_index].Protocol.string = protocol 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+                gateway_rule.find('{*}Protocol').text = protocol
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_nat_rule(self,nat_type,network_name,original_ip,translated_ip,enable=None,original_port=None,translated_port=None,protocol=None,icmp_sub_type=None): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            rule = Tag(builder=builder.TreeBuilder(),name='NatRule')
             if nat_type not in Container.edge_gateway_nat_types:
                 logger.info("%s not in %s" % (nat_type,Container.edge_gateway_nat_types))
-                return                       
-            rule.append(Tag(builder=builder.TreeBuilder(),name='RuleType'))
-            rule.RuleType.string = nat_type
-            rule.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-            rule.IsEnabled.string = str(enable).lower() if enable != None else 'true'
+                return
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) == 0:
                 logger.info("%s does not exist in %s" % (network_name, self.name))
                 return
-            rule.append(Tag(builder=builder.TreeBuilder(),name='GatewayNatRule'))
-            rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name='Interface',attrs={'href':network_record[0]['href']}))
-            rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name='OriginalIp'))
             if nat_type == 'DNAT' and (original_port == None or translated_port == None):
                 logger.info("original_port/translated_port must be specified for DNAT rule")
                 return
@@ -2943,138 +5022,128 @@ class EdgeGateway(Container):
             if protocol == 'icmp' and icmp_sub_type:
                 original_port = 'any'
                 translated_port = 'any'
-            rule.GatewayNatRule.OriginalIp.string = original_ip 
+            if nat_type == 'DNAT' and protocol != None and protocol not in Container.edge_gateway_dnat_protocols:
+                logger.info("%s not in %s" % (protocol,Container.edge_gateway_dnat_protocols))
+                return
+            E = Payload.E
+            gateway_rule = E.GatewayNatRule(E.Interface(href=network_record[0]['href']), E.OriginalIp(original_ip))
             if nat_type == 'DNAT':
-                rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name='OriginalPort'))
-                rule.GatewayNatRule.OriginalPort.string = original_port 
-            rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name='TranslatedIp'))
-            rule.GatewayNatRule.TranslatedIp.string = translated_ip 
+                gateway_rule.append(E.OriginalPort(original_port))
+            gateway_rule.append(E.TranslatedIp(translated_ip))
             if nat_type == 'DNAT':
-                rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name='TranslatedPort'))
-                rule.GatewayNatRule.TranslatedPort.string = translated_port 
-                if protocol != None and protocol not in Container.edge_gateway_dnat_protocols:
-                    logger.info("%s not in %s" % (protocol,Container.edge_gateway_dnat_protocols))
-                    return
-                rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name='Protocol'))
-                rule.GatewayNatRule.Protocol.string = protocol if protocol != None else 'TCP'
+                gateway_rule.append(E.TranslatedPort(translated_port))
+                gateway_rule.append(E.Protocol(protocol if protocol != None else 'TCP'))
                 if protocol == 'icmp' and icmp_sub_type:
-                    rule.GatewayNatRule.append(Tag(builder=builder.TreeBuilder(),name='IcmpSubType'))
-                    rule.GatewayNatRule.IcmpSubType.string = icmp_sub_type
-            params.NatService.append(rule)
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
-
+                    gateway_rule.append(E.IcmpSubType(icmp_sub_type))
+            rule = E.NatRule(E.RuleType(nat_type), E.IsEnabled(Payload.text(enable) if enable != None else 'true'), gateway_rule)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            Payload.child(params, 'NatService').append(rule)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
+
+    @operation_tag
     def del_nat_rule(self,rule_index): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            rules = params.find('NatService').find_all('NatRule',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            rules = params.findall(XmlResponse.path('NatService/NatRule'))
             if rule_index not in range(len(rules)):
                 logger.info("%s does not exist in %s" % (rule_index,self.name))
                 return
-            rules[rule_index].extract()
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            rules[rule_index].getparent().remove(rules[rule_index])
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_static_routing(self): 
             return Container.convertXml2Yaml(str(BeautifulSoup(self.get_entity(self.href),'xml').find('StaticRoutingService')))
 
+    @operation_tag
     def set_static_routing(self, enable): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            if params.find('StaticRoutingService') == None:
-                params.append(Tag(builder=builder.TreeBuilder(),name='StaticRoutingService'))
-                params.StaticRoutingService.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-            params.StaticRoutingService.IsEnabled.string = str(enable).lower() 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            Payload.child(params, 'StaticRoutingService', 'IsEnabled').text = Payload.text(enable)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_static_routes(self): 
             records = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('StaticRoutingService').find_all('StaticRoute',recursive=False)
             self.show_records('route',records)
             return records
 
+    @operation_tag
     def set_static_route(self,route_index,name=None,subnet=None,next_hop_ip=None): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            routes = params.find('StaticRoutingService').find_all('StaticRoute',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            routes = params.findall(XmlResponse.path('StaticRoutingService/StaticRoute'))
             if route_index not in range(len(routes)):
                 logger.info("%s does not exist in %s" % (route_index,self.name))
                 return
             if name != None:
-                routes[route_index].Name.string = name
+                routes[route_index].find('{*}Name').text = name
             if subnet != None:
-                routes[route_index].Network.string = subnet 
+                routes[route_index].find('{*}Network').text = subnet
             if next_hop_ip != None:
-                routes[route_index].NextHopIp.string = next_hop_ip 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+                routes[route_index].find('{*}NextHopIp').text = next_hop_ip
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_static_route(self,network_name,subnet,next_hop_ip,name=None): 
             network_record = self.get_record('orgVdcNetwork', 'OrgVdcNetworkRecord', 'name==' + network_name + ';vdcName==' + self.name, show=False)
             if len(network_record) == 0:
                 logger.info("%s does not exist in %s" % (network_name, self.name))
                 return
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            route = Tag(builder=builder.TreeBuilder(),name='StaticRoute')
-            route.append(Tag(builder=builder.TreeBuilder(),name='Name'))
-            route.Name.string = name if name != None else subnet
-            route.append(Tag(builder=builder.TreeBuilder(),name='Network'))
-            route.Network.string = subnet 
-            route.append(Tag(builder=builder.TreeBuilder(),name='NextHopIp'))
-            route.NextHopIp.string = next_hop_ip 
-            route.append(Tag(builder=builder.TreeBuilder(),name='GatewayInterface',attrs={'href':network_record[0]['href']}))
-            params.StaticRoutingService.append(route)
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
-
+            E = Payload.E
+            route = E.StaticRoute(
+                E.Name(name if name != None else subnet),
+                E.Network(subnet),
+                E.NextHopIp(next_hop_ip),
+                E.GatewayInterface(href=network_record[0]['href']))
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            Payload.child(params, 'StaticRoutingService').append(route)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
+
+    @operation_tag
     def del_static_route(self,route_index): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            routes = params.find('StaticRoutingService').find_all('StaticRoute',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            routes = params.findall(XmlResponse.path('StaticRoutingService/StaticRoute'))
             if route_index not in range(len(routes)):
                 logger.info("%s does not exist in %s" % (route_index,self.name))
                 return
-            routes[route_index].extract()
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            routes[route_index].getparent().remove(routes[route_index])
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
     
     def get_ipsec_vpn(self): 
             return Container.convertXml2Yaml(str(BeautifulSoup(self.get_entity(self.href),'xml').find('GatewayIpsecVpnService')))
 
+    @operation_tag
     def set_ipsec_vpn(self, enable): 
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            if params.find('GatewayIpsecVpnService') == None:
-                params.append(Tag(builder=builder.TreeBuilder(),name='GatewayIpsecVpnService'))
-                params.GatewayIpsecVpnService.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-            params.GatewayIpsecVpnService.IsEnabled.string = str(enable).lower() 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            Payload.child(params, 'GatewayIpsecVpnService', 'IsEnabled').text = Payload.text(enable)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_ipsec_vpn_endpoints(self): 
             records = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('GatewayIpsecVpnService').find_all('Endpoint',recursive=False)
             self.show_records('endpoint',records)
             return records
 
+    @operation_tag
     def set_ipsec_vpn_endpoint(self,endpoint_index,public_ip=None):
-            params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
-            endpoints = params.find('GatewayIpsecVpnService').find_all('Endpoint',recursive=False)
+            params = XmlResponse(self.get_entity(self.href)).find('EdgeGatewayServiceConfiguration')
+            endpoints = params.findall(XmlResponse.path('GatewayIpsecVpnService/Endpoint'))
             if endpoint_index not in range(len(endpoints)):
                 logger.info("%s does not exist in %s" % (endpoint_index,self.name))
                 return
             if public_ip != None:
-                endpoints[endpoint_index].PublicIp.string = public_ip 
-            params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+                endpoints[endpoint_index].find('{*}PublicIp').text = public_ip
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_ipsec_vpn_tunnels(self): 
             records = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('GatewayIpsecVpnService').find_all('Endpoint',recursive=False)
             self.show_records('tunnel',records)
             return records
 
+    @operation_tag
     def set_ipsec_vpn_tunnel(self,tunnel_index,name=None,peer_public_ip=None,peer_private_ip=None,peer_networks=[],local_public_ip=None,local_network_names=[],secret=None,encryption=None,enable=None): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             tunnels = params.find('GatewayIpsecVpnService').find_all('Endpoint',recursive=False)
@@ -3130,9 +5199,10 @@ class EdgeGateway(Container):
             if enable != None:
                 tunnels[tunnel_index].IsEnabled.string = str(enable).lower() 
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_ipsec_vpn_tunnel(self,name,peer_public_ip,peer_networks,local_public_ip,local_network_names,secret,encryption,peer_private_ip=None,enable=True): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             tunnel = Tag(builder=builder.TreeBuilder(),name='Tunnel')
@@ -3197,9 +5267,10 @@ class EdgeGateway(Container):
             tunnel.IsOperational.string = 'false'
             params.GatewayIpsecVpnService.append(tunnel)
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def del_ipsec_vpn_tunnel(self,tunnel_index): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             tunnels = params.find('GatewayIpsecVpnService').find_all('Endpoint',recursive=False)
@@ -3208,12 +5279,13 @@ class EdgeGateway(Container):
                 return
             tunnels[tunnel_index].extract()
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_load_balancer(self): 
             return Container.convertXml2Yaml(str(BeautifulSoup(self.get_entity(self.href),'xml').find('LoadBalancerService')))
 
+    @operation_tag
     def set_load_balancer(self, enable): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             if params.find('LoadBalancerService') == None:
@@ -3221,14 +5293,15 @@ class EdgeGateway(Container):
                 params.LoadBalancerService.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
             params.LoadBalancerService.IsEnabled.string = str(enable).lower() 
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_load_balancer_pools(self): 
             records = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('LoadBalancerService').find_all('Pool',recursive=False)
             self.show_records('pool',records)
             return records
 
+    @operation_tag
     def set_load_balancer_pool(self,pool_index,name=None,protocol=None,algorithm=None,port=None): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             pools = params.find('LoadBalancerService').find_all('Pool',recursive=False)
@@ -3260,9 +5333,10 @@ class EdgeGateway(Container):
             if port != None:
                 pools[pool_index].ServicePort.Port.string = port 
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_load_balancer_pool(self,name,member_ip,protocol='HTTP',algorithm='ROUND_ROBIN',http_uri='/',port=None,weight=None): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             pool = Tag(builder=builder.TreeBuilder(),name='Pool')
@@ -3316,9 +5390,10 @@ class EdgeGateway(Container):
             else:
                 params.LoadBalancerService.append(pool)               
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def del_load_balancer_pool(self,pool_index): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             pools = params.find('LoadBalancerService').find_all('Pool',recursive=False)
@@ -3327,8 +5402,8 @@ class EdgeGateway(Container):
                 return
             pools[pool_index].extract()
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_load_balancer_pool_members(self,pool_index): 
             pools = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('LoadBalancerService').find_all('Pool',recursive=False)
@@ -3339,6 +5414,7 @@ class EdgeGateway(Container):
             self.show_records('member',records)
             return records
 
+    @operation_tag
     def set_load_balancer_pool_member(self,pool_index,member_index,member_ip=None,weight=None): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             pools = params.find('LoadBalancerService').find_all('Pool',recursive=False)
@@ -3354,9 +5430,10 @@ class EdgeGateway(Container):
             if weight != None:
                 members[member_index].Weight.string = weight 
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_load_balancer_pool_member(self,pool_index,member_ip,weight=None): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             pools = params.find('LoadBalancerService').find_all('Pool',recursive=False)
@@ -3370,9 +5447,10 @@ class EdgeGateway(Container):
             member.Weight.string = weight if weight != None else '1' 
             pools[pool_index].find_all('Member')[-1].insert_after(member)
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def del_load_balancer_pool_member(self,pool_index,member_index): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             pools = params.find('LoadBalancerService').find_all('Pool',recursive=False)
@@ -3385,14 +5463,15 @@ class EdgeGateway(Container):
                 return
             members[member_index].extract()
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
     def get_load_balancer_virtual_servers(self): 
             records = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration').find('LoadBalancerService').find_all('VirtualServer',recursive=False)
             self.show_records('vserver',records)
             return records
 
+    @operation_tag
     def set_load_balancer_virtual_server(self,vserver_index,enable=None,name=None,interface_name=None,vip=None,protocol=None,port=None,persistence=None,cookie_name=None,cookie_mode=None,logging=None,pool_name=None): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             vservers = params.find('LoadBalancerService').find_all('VirtualServer',recursive=False)
@@ -3436,9 +5515,10 @@ class EdgeGateway(Container):
                     return
                 vservers[vserver_index].Pool.string = pool_name
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def add_load_balancer_virtual_server(self,name,interface_name,vip,protocol,port,pool_name,persistence=None,cookie_name=None,cookie_mode=None): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             vserver = Tag(builder=builder.TreeBuilder(),name='VirtualServer')
@@ -3492,9 +5572,10 @@ class EdgeGateway(Container):
             else:
                 params.LoadBalancerService.append(vserver)               
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def del_load_balancer_virtual_server(self,vserver_index): 
             params = BeautifulSoup(self.get_entity(self.href),'xml').find('EdgeGatewayServiceConfiguration')
             vservers = params.find('LoadBalancerService').find_all('VirtualServer',recursive=False)
@@ -3503,23 +5584,26 @@ class EdgeGateway(Container):
                 return
             vservers[vserver_index].extract()
             params['xmlns'] = 'http://www.vmware.com/vcloud/v1.5'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+            params = Payload.serialize(params)
+            self.api_post_params('admin.edgeGatewayServiceConfiguration', self.href + '/action/configureServices', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def reapply_services(self):
-            self.api_post(self.href + '/action/reapplyServices', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(self.href + '/action/reapplyServices', requests.codes.accepted)
 
+    @operation_tag
     def redeploy(self):
-            self.api_post(self.href + '/action/redeploy', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(self.href + '/action/redeploy', requests.codes.accepted)
 
+    @operation_tag
     def sync_syslog_setting(self):
-            self.api_post(self.href + '/action/syncSyslogServerSettings', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(self.href + '/action/syncSyslogServerSettings', requests.codes.accepted)
 
 class Vapp(Container):
     
-    def __init__(self, name):
-        Container.__init__(self, name)
-        self.href = self.get_href()
+    def __init__(self, name, context=None, href=None):
+        Container.__init__(self, name, context)
+        self.href = self.get_href() if href == None else href
         self.sections = {'':'vApp',
             '/action/controlAccess':'controlAccess',
             '/startupSection':'startupSection',
@@ -3529,13 +5613,14 @@ class Vapp(Container):
     def get_href(self):
             return super(Vapp, self).get_href('vApp', 'VAppRecord')
 
+    @operation_tag
     def set_vapp(self, name):
         params = BeautifulSoup(self.get_entity(self.href),'xml')
         params.VApp['name'] = name
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_put_params('vcloud.vApp', self.href, params, requests.codes.accepted, inspect.stack()[0][3], name)
+        params = Payload.serialize(params)
+        self.api_put_params('vcloud.vApp', self.href, params, requests.codes.accepted, target_name=name)
 
-    def get_lease_settings(self, show=True):
+    def get_lease_settings(self, show=None):
         return self.get_section('/leaseSettingsSection',show)
  
     def set_lease_settings(self,deployment_lease_days,storage_lease_days):
@@ -3544,7 +5629,7 @@ class Vapp(Container):
             params.StorageLeaseInSeconds.string= str(int(storage_lease_days)*38400) 
             self.set_section('/leaseSettingsSection',params)
  
-    def get_control_access(self, show=True):
+    def get_control_access(self, show=None):
         return self.get_section('/controlAccess', show)
         
     def set_control_access_everyone(self,shared_to_everyone=True,access_level='ReadOnly'):
@@ -3564,6 +5649,7 @@ class Vapp(Container):
         self.show_records('accessSetting',records)
         return records
 
+    @operation_tag
     def add_control_access_subject(self,subject_type,subject_name,access_level):
         if subject_type == 'user':
             record_type = 'UserRecord'
@@ -3587,9 +5673,10 @@ class Vapp(Container):
         if params.find('AccessSettings') == None:
             params.ControlAccessParams.append(Tag(builder=builder.TreeBuilder(),name='AccessSettings'))
         params.find('AccessSettings').append(access)
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.controlAccess', self.href + '/action/controlAccess', params, requests.codes.ok, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.controlAccess', self.href + '/action/controlAccess', params, requests.codes.ok, target_name=self.name)
 
+    @operation_tag
     def del_control_access_subject(self,access_index):
         params = BeautifulSoup(self.get_control_access()[0],'xml')
         accesses = params.find_all('AccessSetting')
@@ -3600,10 +5687,10 @@ class Vapp(Container):
             params.find('AccessSettings').extract()
         else:
             accesses[access_index].extract()
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.controlAccess', self.href + '/action/controlAccess', params, requests.codes.ok, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.controlAccess', self.href + '/action/controlAccess', params, requests.codes.ok, target_name=self.name)
 
-    def get_startup_section(self, show=True):
+    def get_startup_section(self, show=None):
         self.get_section('/startupSection', show)
 
     def set_startup_section(self,vm_index,order=None,start_action=None,start_delay=None,stop_action=None,stop_delay=None):
@@ -3624,7 +5711,7 @@ class Vapp(Container):
                 vms[vm_index]['ovf:stopDelay'] = str(stop_delay) 
             self.set_section('/startupSection',params)
 
-    def get_network(self, name=None, detailed=False, show=True):
+    def get_network(self, name=None, detailed=False, show=None):
         try:
             record_filter = 'vApp==' + self.href
             record_filter += ';name==' + name if name != None else ''
@@ -3632,98 +5719,100 @@ class Vapp(Container):
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def set_network(self,vapp_network_name,name):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            nc['networkName'] = name 
-            self.set_section('/networkConfigSection',params)
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            params.find('NetworkConfig', networkName=vapp_network_name).set('networkName', name)
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def get_network_ip_in_use(self,vapp_network_name):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             r = self.api_get(vapp_network_record[0]['href'] + '/allocatedAddresses')
             return r.content if r != None else None
 
+    @operation_tag
     def get_network_ipranges(self,vapp_network_name):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             records = BeautifulSoup(self.get_entity(vapp_network_record[0]['href']),'xml').find_all('IpRange')
             self.show_records('IpRange',records)
             return records
 
+    @operation_tag
     def set_network_iprange(self,vapp_network_name,iprange_index,iprange_start=None,iprange_end=None):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            ipranges = nc.find_all('IpRange')
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            ipranges = list(nc.iter(XmlResponse.path('IpRange')))
             if iprange_index not in range(len(ipranges)):
-                logger.info("%s does not exist in %s" % (iprange_index,network_name))
+                logger.info("%s does not exist in %s" % (iprange_index,vapp_network_name))
                 return
             if iprange_start == None or iprange_end == None:
                 logger.info("one of iprange_start or iprange_end must be specified")
                 return
             if iprange_start != None:
-                ipranges[iprange_index].StartAddress.string = iprange_start 
+                ipranges[iprange_index].find('{*}StartAddress').text = iprange_start
             if iprange_end != None:
-                ipranges[iprange_index].EndAddress.string = iprange_end 
-            self.set_section('/networkConfigSection',params)
+                ipranges[iprange_index].find('{*}EndAddress').text = iprange_end
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def add_network_iprange(self,vapp_network_name,iprange_start,iprange_end):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            iprange = Tag(builder=builder.TreeBuilder(),name='IpRange')
-            iprange.append(Tag(builder=builder.TreeBuilder(),name='StartAddress'))
-            iprange.append(Tag(builder=builder.TreeBuilder(),name='EndAddress'))
-            iprange.StartAddress.string = iprange_start 
-            iprange.EndAddress.string = iprange_end 
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            ipranges = nc.find_all('IpRange')
-            ipranges[-1].insert_after(iprange)
-            self.set_section('/networkConfigSection',params)
+            iprange = Payload.E.IpRange(Payload.E.StartAddress(iprange_start), Payload.E.EndAddress(iprange_end))
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            ipranges = list(nc.iter(XmlResponse.path('IpRange')))
+            ipranges[-1].addnext(iprange)
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def del_network_iprange(self,vapp_network_name,iprange_index):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            ipranges = nc.find_all('IpRange')
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            ipranges = list(nc.iter(XmlResponse.path('IpRange')))
             if iprange_index not in range(len(ipranges)):
                 logger.info("%s does not exist in %s" % (iprange_index,vapp_network_name))
                 return
-            ipranges[iprange_index].extract()
-            self.set_section('/networkConfigSection',params)
+            ipranges[iprange_index].getparent().remove(ipranges[iprange_index])
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def add_network(self,vapp_network_name,fence_mode,ipscope_gateway,ipscope_netmask,iprange_start=None,iprange_end=None,vdc_network_name=None):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) > 0:
                 logger.info("%s salerady exist" % (vapp_network_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if fence_mode not in Container.fence_modes:
                 logger.info("%s not in %s" % (fence_mode, Container.fence_modes))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if fence_mode != 'isolated' and not vdc_network_name:
                 logger.info("vdc_network_name needed for %s" % (fence_mode))
@@ -3735,135 +5824,120 @@ class Vapp(Container):
                     logger.info("%s does not exist" % (vdc_network_name))
                     return
                 vdc_network_href = vdc_network_record[0]['href']
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = Tag(builder=builder.TreeBuilder(),name='NetworkConfig',attrs={'networkName':vapp_network_name})
-            nc.append(Tag(builder=builder.TreeBuilder(),name='Description'))
-            nc.append(Tag(builder=builder.TreeBuilder(),name='Configuration'))
-            nc.Configuration.append(Tag(builder=builder.TreeBuilder(),name='IpScopes'))
-            nc.Configuration.IpScopes.append(Tag(builder=builder.TreeBuilder(),name='IpScope'))
-            nc.Configuration.IpScopes.IpScope.append(Tag(builder=builder.TreeBuilder(),name='IsInherited'))
-            nc.Configuration.IpScopes.IpScope.IsInherited.string = str(fence_mode == 'bridged').lower()
-            nc.Configuration.IpScopes.IpScope.append(Tag(builder=builder.TreeBuilder(),name='Gateway'))
-            nc.Configuration.IpScopes.IpScope.Gateway.string = ipscope_gateway 
-            nc.Configuration.IpScopes.IpScope.append(Tag(builder=builder.TreeBuilder(),name='Netmask'))
-            nc.Configuration.IpScopes.IpScope.Netmask.string = ipscope_netmask 
-            nc.Configuration.IpScopes.IpScope.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-            nc.Configuration.IpScopes.IpScope.IsEnabled.string = 'true'
+            E = Payload.E
+            ipscope = E.IpScope(
+                E.IsInherited(Payload.text(fence_mode == 'bridged')),
+                E.Gateway(ipscope_gateway),
+                E.Netmask(ipscope_netmask),
+                E.IsEnabled('true'))
             if iprange_start and iprange_end:
-                nc.Configuration.IpScopes.IpScope.append(Tag(builder=builder.TreeBuilder(),name='IpRanges'))
-                nc.Configuration.IpScopes.IpScope.IpRanges.append(Tag(builder=builder.TreeBuilder(),name='IpRange'))
-                nc.Configuration.IpScopes.IpScope.IpRanges.IpRange.append(Tag(builder=builder.TreeBuilder(),name='StartAddress'))
-                nc.Configuration.IpScopes.IpScope.IpRanges.IpRange.StartAddress.string = iprange_start 
-                nc.Configuration.IpScopes.IpScope.IpRanges.IpRange.append(Tag(builder=builder.TreeBuilder(),name='EndAddress'))
-                nc.Configuration.IpScopes.IpScope.IpRanges.IpRange.EndAddress.string = iprange_end 
+                ipscope.append(E.IpRanges(E.IpRange(E.StartAddress(iprange_start), E.EndAddress(iprange_end))))
+            configuration = E.Configuration(E.IpScopes(ipscope))
             if fence_mode != 'isolated':
-                nc.Configuration.append(Tag(builder=builder.TreeBuilder(),name='ParentNetwork',attrs={
-                    'href':vdc_network_href,
-                    'name':vdc_network_name}))
-            nc.Configuration.append(Tag(builder=builder.TreeBuilder(),name='FenceMode'))
-            nc.Configuration.FenceMode.string = fence_mode
-            nc.Configuration.append(Tag(builder=builder.TreeBuilder(),name='RetainNetInfoAcrossDeployments'))
-            nc.Configuration.RetainNetInfoAcrossDeployments.string = 'false'
-            params.NetworkConfigSection.append(nc)
-            self.set_section('/networkConfigSection',params)
-
+                configuration.append(E.ParentNetwork(href=vdc_network_href, name=vdc_network_name))
+            configuration.append(E.FenceMode(fence_mode))
+            configuration.append(E.RetainNetInfoAcrossDeployments('false'))
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            params.root.append(E.NetworkConfig(E.Description(), configuration, networkName=vapp_network_name))
+            self.set_section('/networkConfigSection',params.root)
+
+    @operation_tag
     def clone_network(self, vapp, vapp_network_name):
             nc = BeautifulSoup(vapp.get_section('/networkConfigSection', show=False),'xml').find('NetworkConfig',attrs={'networkName':vapp_network_name})
             if len(nc) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, vapp.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp.name + '.' + vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp.name + '.' + vapp_network_name))
                 return
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             params.NetworkConfigSection.append(nc)
             self.set_section('/networkConfigSection',params)
 
+    @operation_tag
     def del_network(self, vapp_network_name):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             params.find('NetworkConfig',attrs={'networkName':vapp_network_name}).decompose()
             self.set_section('/networkConfigSection',params)
 
+    @operation_tag
     def get_network_dhcp(self, vapp_network_name):
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
             if len(nc) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if nc.Configuration.find('Features'):
                 return nc.Configuration.Features.find('DhcpService')
             else:
                 return None
 
+    @operation_tag
     def set_network_dhcp(self, vapp_network_name,enable=True,default_lease_time=3600,max_lease_time=7200,iprange_start=None,iprange_end=None):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode == 'bridged':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) == 'bridged':
                 logger.info("dhcp only available under isolated or natRouted network")
                 return
-            if nc.Configuration.find('Features') == None:
-                nc.Configuration.append(Tag(builder=builder.TreeBuilder(),name='Features'))
-            if nc.Configuration.Features.find('DhcpService') == None:
-                nc.Configuration.Features.append(Tag(builder=builder.TreeBuilder(),name='DhcpService'))
-                nc.Configuration.Features.DhcpService.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-                nc.Configuration.Features.DhcpService.append(Tag(builder=builder.TreeBuilder(),name='DefaultLeaseTime'))
-                nc.Configuration.Features.DhcpService.append(Tag(builder=builder.TreeBuilder(),name='MaxLeaseTime'))
-                nc.Configuration.Features.DhcpService.append(Tag(builder=builder.TreeBuilder(),name='IpRange'))
-                nc.Configuration.Features.DhcpService.IpRange.append(Tag(builder=builder.TreeBuilder(),name='StartAddress'))
-                nc.Configuration.Features.DhcpService.IpRange.append(Tag(builder=builder.TreeBuilder(),name='EndAddress'))
-            nc.Configuration.Features.DhcpService.IsEnabled.string = str(enable).lower()
-            nc.Configuration.Features.DhcpService.DefaultLeaseTime.string = str(default_lease_time)
-            nc.Configuration.Features.DhcpService.MaxLeaseTime.string = str(max_lease_time)
+            dhcp = Payload.child(nc, 'Configuration', 'Features', 'DhcpService')
+            Payload.child(dhcp, 'IsEnabled').text = Payload.text(enable)
+            Payload.child(dhcp, 'DefaultLeaseTime').text = str(default_lease_time)
+            Payload.child(dhcp, 'MaxLeaseTime').text = str(max_lease_time)
+            iprange = Payload.child(dhcp, 'IpRange')
             if iprange_start:
-                nc.Configuration.Features.DhcpService.IpRange.StartAddress.string = iprange_start 
+                Payload.child(iprange, 'StartAddress').text = iprange_start
             if iprange_end:
-                nc.Configuration.Features.DhcpService.IpRange.EndAddress.string = iprange_end 
-            self.set_section('/networkConfigSection',params)
+                Payload.child(iprange, 'EndAddress').text = iprange_end
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def get_network_firewall(self, vapp_network_name):
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
             if len(nc) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if nc.Configuration.FenceMode.string != 'natRouted':
                 logger.info("firewall only available under natRouted network")
                 return
             return nc.Configuration.Features.FirewallService
 
+    @operation_tag
     def set_network_firewall(self, vapp_network_name,enable=None,default_action=None,log_default_action=None):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("firewall only available under natRouted network")
                 return
+            firewall = nc.find(XmlResponse.path('Configuration/Features/FirewallService'))
             if enable != None:
-                nc.Configuration.Features.FirewallService.IsEnabled.string = str(enable).lower() 
+                firewall.find('{*}IsEnabled').text = Payload.text(enable)
             if default_action != None:
-                nc.Configuration.Features.FirewallService.DefaultAction.string = default_action 
+                firewall.find('{*}DefaultAction').text = default_action
             if log_default_action != None:
-                nc.Configuration.Features.FirewallService.LogDefaultAction.string = str(log_default_action).lower() 
-            self.set_section('/networkConfigSection',params)
+                firewall.find('{*}LogDefaultAction').text = Payload.text(log_default_action)
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def get_network_firewall_rules(self, vapp_network_name):
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
             if len(nc) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if nc.Configuration.FenceMode.string != 'natRouted':
                 logger.info("firewall only available under natRouted network")
@@ -3872,176 +5946,155 @@ class Vapp(Container):
             self.show_records('rule',records)
             return records
     
+    @operation_tag
     def set_network_firewall_rule(self,vapp_network_name,rule_index,enable=None,rule_name=None,action=None,protocols=None,dest_port=None,dest_ip=None,source_port=None,source_ip=None,log=None):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("firewall only available under natRouted network")
                 return
-            rules = nc.Configuration.Features.FirewallService.find_all('FirewallRule',recursive=False)
+            rules = nc.findall(XmlResponse.path('Configuration/Features/FirewallService/FirewallRule'))
             if rule_index not in range(len(rules)):
                 logger.info("%s does not exist in %s" % (rule_index,vapp_network_name))
                 return
+            rule = rules[rule_index]
             if enable != None:
-                rules[rule_index].IsEnabled.string = str(enable).lower()
-            rules[rule_index].MatchOnTranslate.string = 'false'
+                rule.find('{*}IsEnabled').text = Payload.text(enable)
+            rule.find('{*}MatchOnTranslate').text = 'false'
             if rule_name != None:
-                rules[rule_index].Description.string = rule_name
+                rule.find('{*}Description').text = rule_name
             if action != None:
-                rules[rule_index].Policy.string = action
+                rule.find('{*}Policy').text = action
             if protocols != None:
                 if protocols not in Container.firewall_protocols:
                         logger.info("%s not in %s" % (protocols,Container.firewall_protocols))
                         return
-                rules[rule_index].Protocols.clear()
-                for protocol in protocols:
-                    rules[rule_index].Protocols.append(Tag(builder=builder.TreeBuilder(),name=protocol))
-                    rules[rule_index].Protocols.find(protocol).string = 'true'
-            rules[rule_index].Port.string = '-1'
+                rule.find('{*}Protocols').clear()
+                rule.find('{*}Protocols').extend([getattr(Payload.E, protocol)('true') for protocol in protocols])
+            rule.find('{*}Port').text = '-1'
             if dest_port != None:
-                rules[rule_index].DestinationPortRange.string = dest_port 
+                rule.find('{*}DestinationPortRange').text = dest_port
             if dest_ip != None:
-                rules[rule_index].DestinationIp.string = dest_ip 
-            rules[rule_index].SourcePort.string = '-1'
+                rule.find('{*}DestinationIp').text = dest_ip
+            rule.find('{*}SourcePort').text = '-1'
             if source_port != None:
-                rules[rule_index].SourcePortRange.string = source_port 
+                rule.find('{*}SourcePortRange').text = source_port
             if source_ip != None:
-                rules[rule_index].SourceIp.string = source_ip 
-            rules[rule_index].EnableLogging.string = str(log).lower()
-            self.set_section('/networkConfigSection',params)
+                rule.find('{*}SourceIp').text = source_ip
+            rule.find('{*}EnableLogging').text = Payload.text(log)
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def add_network_firewall_rule(self,vapp_network_name,rule_index,enable=True,rule_name='',action='allow',protocols=['Tcp'],dest_port=None,dest_ip=None,source_port=None,source_ip=None,log=True):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("firewall only available under natRouted network")
                 return
-            rule = Tag(builder=builder.TreeBuilder(),name='FirewallRule')
-            rule.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-            rule.IsEnabled.string = str(enable).lower() 
-            rule.append(Tag(builder=builder.TreeBuilder(),name='MatchOnTranslate'))
-            rule.MatchOnTranslate.string = 'false'
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Description'))
-            rule.Description.string = rule_name
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Policy'))
             if action not in Container.firewall_policies:
                 logger.info("%s not in %s" % (action,Container.firewall_policies))
                 return
-            else:
-                rule.Policy.string = action
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Protocols'))
-            if protocols:
-                if protocols not in Container.firewall_protocols:
-                        logger.info("%s not in %s" % (protocols,Container.firewall_protocols))
-                        return
-                for protocol in protocols:
-                    rule.Protocols.append(Tag(builder=builder.TreeBuilder(),name=protocol))
-                    rule.Protocols.find(protocol).string = 'true'
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Port'))
-            rule.Port.string = '-1'
-            if dest_port:
-                rule.append(Tag(builder=builder.TreeBuilder(),name='DestinationPortRange'))
-                rule.DestinationPortRange.string = dest_port 
-            else:
-                logger.info("dest_port must be specified")
-                return
-            if dest_ip:
-                rule.append(Tag(builder=builder.TreeBuilder(),name='DestinationIp'))
-                rule.DestinationIp.string = dest_ip 
-            else:
-                logger.info("dest_ip must be specified")
-                return
-            rule.append(Tag(builder=builder.TreeBuilder(),name='SourcePort'))
-            rule.SourcePort.string = '-1'
-            if source_port:
-                rule.append(Tag(builder=builder.TreeBuilder(),name='SourcePortRange'))
-                rule.SourcePortRange.string = source_port 
-            else:
-                logger.info("source_port must be specified")
+            if protocols and protocols not in Container.firewall_protocols:
+                logger.info("%s not in %s" % (protocols,Container.firewall_protocols))
                 return
-            if source_ip:
-                rule.append(Tag(builder=builder.TreeBuilder(),name='SourceIp'))
-                rule.SourceIp.string = source_ip 
-            else:
-                logger.info("source_ip must be specified")
-                return
-            rule.append(Tag(builder=builder.TreeBuilder(),name='EnableLogging'))
-            rule.EnableLogging.string = str(log).lower() 
-            rules = nc.Configuration.Features.FirewallService.find_all('FirewallRule',recursive=False)
-            if rule_index < len(rules):
-                rules[rule_index].insert_before(rule)
+            for option, value in (('dest_port', dest_port), ('dest_ip', dest_ip), ('source_port', source_port), ('source_ip', source_ip)):
+                if not value:
+                    logger.info("%s must be specified" % (option))
+                    return
+            E = Payload.E
+            rule = E.FirewallRule(
+                E.IsEnabled(Payload.text(enable)),
+                E.MatchOnTranslate('false'),
+                E.Description(rule_name),
+                E.Policy(action),
+                E.Protocols(*[getattr(E, protocol)('true') for protocol in protocols or []]),
+                E.Port('-1'),
+                E.DestinationPortRange(dest_port),
+                E.DestinationIp(dest_ip),
+                E.SourcePort('-1'),
+                E.SourcePortRange(source_port),
+                E.SourceIp(source_ip),
+                E.EnableLogging(Payload.text(log)))
+            firewall = Payload.child(nc, 'Configuration', 'Features', 'FirewallService')
+            rules = firewall.findall('{*}FirewallRule')
+            if len(rules) == 0:
+                firewall.append(rule)
+            elif rule_index < len(rules):
+                rules[rule_index].addprevious(rule)
             else:
-                rules[-1].insert_after(rule)
-            self.set_section('/networkConfigSection',params)
+                rules[-1].addnext(rule)
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def del_network_firewall_rule(self,vapp_network_name,rule_index):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("firewall only available under natRouted network")
                 return
-            rules = nc.Configuration.Features.FirewallService.find_all('FirewallRule',recursive=False)
+            rules = nc.findall(XmlResponse.path('Configuration/Features/FirewallService/FirewallRule'))
             if rule_index not in range(len(rules)):
                 logger.info("%s does not exist in %s" % (rule_index,vapp_network_name))
                 return
-            rules[rule_index].extract()
-            self.set_section('/networkConfigSection',params)
+            rules[rule_index].getparent().remove(rules[rule_index])
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def get_network_nat(self, vapp_network_name):
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
             if len(nc) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if nc.Configuration.FenceMode.string != 'natRouted':
                 logger.info("nat only available under natRouted network")
                 return
             return nc.Configuration.Features.NatService
 
+    @operation_tag
     def set_network_nat(self, vapp_network_name,enable=None,nat_type=None):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("nat only available under natRouted network")
                 return
-            if nc.Configuration.Features.NatService == None:
-                nc.Configuration.Features.append(Tag(builder=builder.TreeBuilder(),name='NatService'))
-                nc.Configuration.Features.NatService.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
-                nc.Configuration.Features.NatService.append(Tag(builder=builder.TreeBuilder(),name='NatType'))
-                nc.Configuration.Features.NatService.append(Tag(builder=builder.TreeBuilder(),name='Policy'))
+            nat = Payload.child(nc, 'Configuration', 'Features', 'NatService')
+            for tag in ('IsEnabled', 'NatType', 'Policy'):
+                Payload.child(nat, tag)
             if enable != None:
-                nc.Configuration.Features.NatService.IsEnabled.string = str(enable).lower() 
+                nat.find('{*}IsEnabled').text = Payload.text(enable)
             if nat_type != None:
-                nc.Configuration.Features.NatService.NatType.string = nat_type 
+                nat.find('{*}NatType').text = nat_type
             if nat_type == 'ipTranslation':
-                nc.Configuration.Features.NatService.Policy.string = 'allowTrafficIn'
+                nat.find('{*}Policy').text = 'allowTrafficIn'
             if nat_type == 'portForwarding':
-                nc.Configuration.Features.NatService.Policy.string = 'allowTraffic'
-            self.set_section('/networkConfigSection',params)
+                nat.find('{*}Policy').text = 'allowTraffic'
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def get_network_nat_rules(self, vapp_network_name):
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
             if len(nc) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if nc.Configuration.FenceMode.string != 'natRouted':
                 logger.info("nat only available under natRouted network")
@@ -4050,29 +6103,32 @@ class Vapp(Container):
             self.show_records('rule',records)
             return records
 
+    @operation_tag
     def set_network_nat_rule(self,vapp_network_name,rule_index,mapping_mode=None,external_ip=None,external_port=None,internal_port=None,protocol=None):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("nat only available under natRouted network")
                 return
-            rules = nc.Configuration.Features.NatService.find_all('NatRule',recursive=False)
+            nat = nc.find(XmlResponse.path('Configuration/Features/NatService'))
+            rules = nat.findall('{*}NatRule')
             if rule_index not in range(len(rules)):
                 logger.info("%s does not exist in %s" % (rule_index,vapp_network_name))
                 return
-            nat_type = nc.Configuration.Features.NatService.NatType.string
+            rule = rules[rule_index]
+            nat_type = nat.findtext('{*}NatType')
             if nat_type == 'ipTranslation':
                 if mapping_mode != None:
-                    rules[rule_index].MappingMode.string = mapping_mode
+                    rule.find('.//{*}MappingMode').text = mapping_mode
                 if mapping_mode == 'manual' and external_ip == None:
                     logger.info("external_ip must be specified for manual mapping in ip_translation rule")
                     return
                 if mapping_mode == 'manual' and external_ip != None:
-                    rules[rule_index].ExternalIpAddress.string = external_ip
+                    rule.find('.//{*}ExternalIpAddress').text = external_ip
             if nat_type == 'portForwarding':
                 if external_ip == None or external_port == None or internal_port == None or protocol == None:
                     logger.info("external_ip,external_port,internal_port,protocol must be specified in port_forwarding rule" )
@@ -4080,144 +6136,119 @@ class Vapp(Container):
                 if protocol not in Container.vapp_port_forwarding_protocols:
                     logger.info("%s not in %s" % (protocol,Container.vapp_port_forwarding_protocols))
                     return
-                rules[rule_index].ExternalIpAddress.string = external_ip 
-                rules[rule_index].ExternalPort.string = external_port 
-                rules[rule_index].InternalPort.string = internal_port 
-                rules[rule_index].Protocol.string = protocol
-            self.set_section('/networkConfigSection',params)
+                rule.find('.//{*}ExternalIpAddress').text = external_ip
+                rule.find('.//{*}ExternalPort').text = str(external_port)
+                rule.find('.//{*}InternalPort').text = str(internal_port)
+                rule.find('.//{*}Protocol').text = protocol
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def add_network_nat_rule(self,vapp_network_name,vm_name,nic_index,mapping_mode=None,external_ip=None,external_port=None,internal_port=None,protocol=None):
             vm_record = self.get_record('vm', 'VMRecord', 'name==' + vm_name + ';container==' + self.href, show=False)
-            vm_entity = self.get_entity(vm_record[0]['href'])
-            vapp_scoped_vm_id = BeautifulSoup(vm_entity,'xml').Vm.VAppScopedLocalId.string
             if len(vm_record) == 0:
                 logger.info("%s does not exist in %s" % (vm_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vm_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vm_name))
                 return
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            vapp_scoped_vm_id = XmlResponse(self.get_entity(vm_record[0]['href'])).findtext('VAppScopedLocalId')
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("nat only available under natRouted network")
                 return
-            rule = Tag(builder=builder.TreeBuilder(),name='NatRule')
-            rule.append(Tag(builder=builder.TreeBuilder(),name='Id'))
-            rule.Id.string = str(randint(65537,131072))
-            nat_type = nc.Configuration.Features.NatService.NatType.string
+            E = Payload.E
+            rule = E.NatRule(E.Id(str(randint(65537,131072))))
+            nat = nc.find(XmlResponse.path('Configuration/Features/NatService'))
+            nat_type = nat.findtext('{*}NatType')
             if nat_type == 'ipTranslation':
                 if mapping_mode == None:
                     logger.info("mapping_mode must be specified in ip_translation rule" )
                     return
-                rule.append(Tag(builder=builder.TreeBuilder(),name='OneToOneVmRule'))
-                rule.OneToOneVmRule.append(Tag(builder=builder.TreeBuilder(),name='MappingMode'))
                 if mapping_mode not in Container.vapp_ip_translation_mapping_modes:
                     logger.info("%s not in %s" % (mapping_mode,Container.vapp_ip_translation_mapping_modes))
                     return
-                rule.OneToOneVmRule.MappingMode.string = mapping_mode
-                rule.OneToOneVmRule.append(Tag(builder=builder.TreeBuilder(),name='ExternalIpAddress'))
                 if mapping_mode == 'manual' and external_ip == None:
                     logger.info("external_ip must be specified for manual mapping in ip_translation rule")
                     return
-                if mapping_mode == 'manual' and external_ip != None:
-                    rule.OneToOneVmRule.ExternalIpAddress.string = external_ip 
-                rule.OneToOneVmRule.append(Tag(builder=builder.TreeBuilder(),name='VAppScopedVmId'))
-                rule.OneToOneVmRule.VAppScopedVmId.string = vapp_scoped_vm_id
-                rule.OneToOneVmRule.append(Tag(builder=builder.TreeBuilder(),name='VmNicId'))
-                rule.OneToOneVmRule.VmNicId.string = str(nic_index)
+                rule.append(E.OneToOneVmRule(
+                    E.MappingMode(mapping_mode),
+                    E.ExternalIpAddress(external_ip if mapping_mode == 'manual' else ''),
+                    E.VAppScopedVmId(vapp_scoped_vm_id),
+                    E.VmNicId(str(nic_index))))
             if nat_type == 'portForwarding':
                 if external_ip == None or external_port == None or internal_port == None or protocol == None:
                     logger.info("external_ip,external_port,internal_port,protocol must be specified in port_forwarding rule" )
                     return
-                rule = Tag(builder=builder.TreeBuilder(),name='NatRule')
-                rule.append(Tag(builder=builder.TreeBuilder(),name='Id'))
-                rule.Id.string = str(randint(65537,131072))
-                rule.append(Tag(builder=builder.TreeBuilder(),name='VmRule'))
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='ExternalIpAddress'))
-                rule.VmRule.ExternalIpAddress.string = external_ip 
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='ExternalPort'))
-                rule.VmRule.ExternalPort.string = str(external_port) 
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='VAppScopedVmId'))
-                rule.VmRule.VAppScopedVmId.string = vapp_scoped_vm_id
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='VmNicId'))
-                rule.VmRule.VmNicId.string = str(nic_index) 
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='InternalPort'))
-                rule.VmRule.InternalPort.string = str(internal_port) 
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='Protocol'))
-                rule.VmRule.Protocol.string = protocol
                 if protocol not in Container.vapp_port_forwarding_protocols:
                     logger.info("%s not in %s" % (protocol,Container.vapp_port_forwarding_protocols))
                     return
-                rule.append(Tag(builder=builder.TreeBuilder(),name='VmRule'))
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='ExternalIpAddress'))
-                rule.VmRule.ExternalIpAddress.string = external_ip 
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='ExternalPort'))
-                rule.VmRule.ExternalPort.string = str(external_port) 
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='VAppScopedVmId'))
-                rule.VmRule.VAppScopedVmId.string = vapp_scoped_vm_id
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='VmNicId'))
-                rule.VmRule.VmNicId.string = str(nic_index) 
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='InternalPort'))
-                rule.VmRule.InternalPort.string = str(internal_port) 
-                rule.VmRule.append(Tag(builder=builder.TreeBuilder(),name='Protocol'))
-                rule.VmRule.Protocol.string = protocol
-            nc.Configuration.Features.NatService.append(rule)
-            self.set_section('/networkConfigSection',params)
-
+                rule.append(E.VmRule(
+                    E.ExternalIpAddress(external_ip),
+                    E.ExternalPort(str(external_port)),
+                    E.VAppScopedVmId(vapp_scoped_vm_id),
+                    E.VmNicId(str(nic_index)),
+                    E.InternalPort(str(internal_port)),
+                    E.Protocol(protocol)))
+            nat.append(rule)
+            self.set_section('/networkConfigSection',params.root)
+
+    @operation_tag
     def del_network_nat_rule(self,vapp_network_name,rule_index):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("nat only available under natRouted network")
                 return
-            rules = nc.Configuration.Features.NatService.find_all('NatRule',recursive=False)
+            rules = nc.findall(XmlResponse.path('Configuration/Features/NatService/NatRule'))
             if rule_index not in range(len(rules)):
                 logger.info("%s does not exist in %s" % (rule_index,vapp_network_name))
                 return
-            rules[rule_index].extract()
-            self.set_section('/networkConfigSection',params)
+            rules[rule_index].getparent().remove(rules[rule_index])
+            self.set_section('/networkConfigSection',params.root)
     
+    @operation_tag
     def get_network_static_routing(self, vapp_network_name):
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
             if len(nc) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if nc.Configuration.FenceMode.string != 'natRouted':
                 logger.info("static routing only available under natRouted network")
                 return
             return nc.Configuration.Features.StaticRoutingService
 
+    @operation_tag
     def set_network_static_routing(self, vapp_network_name,enable=None):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("static routing only available under natRouted network")
                 return
-            if nc.Configuration.Features.StaticRoutingService == None:
-                nc.Configuration.Features.append(Tag(builder=builder.TreeBuilder(),name='StaticRoutingService'))
-                nc.Configuration.Features.StaticRoutingService.append(Tag(builder=builder.TreeBuilder(),name='IsEnabled'))
+            enabled = Payload.child(nc, 'Configuration', 'Features', 'StaticRoutingService', 'IsEnabled')
             if enable != None:
-                nc.Configuration.Features.StaticRoutingService.IsEnabled.string = str(enable).lower() 
-            self.set_section('/networkConfigSection',params)
+                enabled.text = Payload.text(enable)
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def get_network_static_routes(self, vapp_network_name):
             params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
             nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
             if len(nc) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
             if nc.Configuration.FenceMode.string != 'natRouted':
                 logger.info("static routing only available under natRouted network")
@@ -4226,98 +6257,97 @@ class Vapp(Container):
             self.show_records('route',records)
             return records
 
+    @operation_tag
     def set_network_static_route(self,vapp_network_name,route_index,subnet=None,next_hop_ip=None):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("static routing only available under natRouted network")
                 return
-            routes = nc.Configuration.Features.StaticRoutingService.find_all('StaticRoute',recursive=False)
+            routes = nc.findall(XmlResponse.path('Configuration/Features/StaticRoutingService/StaticRoute'))
             if route_index not in range(len(routes)):
                 logger.info("%s does not exist in %s" % (route_index,vapp_network_name))
                 return
             if subnet != None:
-                routes[route_index].Name.string = subnet 
-                routes[route_index].Network.string = subnet
-            if next_hop_ip !=None:
-                routes[route_index].NextHopIp.string = next_hop_ip 
-            self.set_section('/networkConfigSection',params)
+                routes[route_index].find('{*}Name').text = subnet
+                routes[route_index].find('{*}Network').text = subnet
+            if next_hop_ip != None:
+                routes[route_index].find('{*}NextHopIp').text = next_hop_ip
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def add_network_static_route(self,vapp_network_name,subnet=None,next_hop_ip=None):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("static routing only available under natRouted network")
                 return
             if subnet == None or next_hop_ip == None:
                 logger.info("subnet,next_hop_ip must be specified in static route" )
                 return
-            route = Tag(builder=builder.TreeBuilder(),name='StaticRoute')
-            route.append(Tag(builder=builder.TreeBuilder(),name='Name'))
-            route.Name.string = subnet 
-            route.append(Tag(builder=builder.TreeBuilder(),name='Network'))
-            route.Network.string = subnet
-            route.append(Tag(builder=builder.TreeBuilder(),name='NextHopIp'))
-            route.NextHopIp.string = next_hop_ip 
-            route.append(Tag(builder=builder.TreeBuilder(),name='Interface'))
-            route.Interface.string = 'External'
-            nc.Configuration.Features.StaticRoutingService.append(route)
-            self.set_section('/networkConfigSection',params)
+            E = Payload.E
+            route = E.StaticRoute(E.Name(subnet), E.Network(subnet), E.NextHopIp(next_hop_ip), E.Interface('External'))
+            Payload.child(nc, 'Configuration', 'Features', 'StaticRoutingService').append(route)
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def del_network_static_route(self,vapp_network_name,route_index):
-            params = BeautifulSoup(self.get_section('/networkConfigSection', show=False),'xml')
-            nc = params.find('NetworkConfig',attrs={'networkName':vapp_network_name})
-            if len(nc) == 0:
+            params = XmlResponse(self.get_section('/networkConfigSection', show=False))
+            nc = params.find('NetworkConfig', networkName=vapp_network_name)
+            if nc == None:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            if nc.Configuration.FenceMode.string != 'natRouted':
+            if nc.findtext(XmlResponse.path('Configuration/FenceMode')) != 'natRouted':
                 logger.info("static routing only available under natRouted network")
                 return
-            routes = nc.Configuration.Features.StaticRoutingService.find_all('StaticRoute',recursive=False)
+            routes = nc.findall(XmlResponse.path('Configuration/Features/StaticRoutingService/StaticRoute'))
             if route_index not in range(len(routes)):
                 logger.info("%s does not exist in %s" % (route_index,vapp_network_name))
                 return
-            routes[route_index].extract()
-            self.set_section('/networkConfigSection',params)
+            routes[route_index].getparent().remove(routes[route_index])
+            self.set_section('/networkConfigSection',params.root)
 
+    @operation_tag
     def reset_network(self,vapp_network_name):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            self.api_post(vapp_network_record[0]['href'].replace('/api','/api/admin') + '/action/reset', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(vapp_network_record[0]['href'].replace('/api','/api/admin') + '/action/reset', requests.codes.accepted)
 
+    @operation_tag
     def sync_network_syslog_setting(self,vapp_network_name):
             vapp_network_record = self.get_record('vAppNetwork', 'VAppNetworkRecord', 'name==' + vapp_network_name + ';vApp==' + self.href, show=False)
             if  len(vapp_network_record) == 0:
                 logger.info("%s does not exist in %s" % (vapp_network_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_network_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_network_name))
                 return
-            self.api_post(vapp_network_record[0]['href'].replace('/api','/api/admin') + '/action/syncSyslogServerSettings', requests.codes.accepted, inspect.stack()[0][3])
+            self.api_post(vapp_network_record[0]['href'].replace('/api','/api/admin') + '/action/syncSyslogServerSettings', requests.codes.accepted)
 
-    def get_vm(self,name=None,detailed=False,show=True):
+    def get_vm(self,name=None,detailed=False,show=None,stream=False):
         try:
             record_filter = 'container==' + self.href
             record_filter += ';name==' +name if name != None else ''
-            return self.get_record('vm','VMRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('vm','VMRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_vm(self, vm, source_delete=False, wait=True):
             vm_record = self.get_record('vm', 'VMRecord', 'href==' + vm.href, show=False)
             if not vm_record[0]['status'] == 'POWERED_OFF':
                 logger.info("%s must be powered off" % (vm.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vm.name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vm.name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='RecomposeVAppParams',attrs={'name':self.name,
@@ -4342,18 +6372,19 @@ class Vapp(Container):
             # eula
             params.RecomposeVAppParams.append(Tag(builder=builder.TreeBuilder(),name='AllEULAsAccepted'))
             params.RecomposeVAppParams.AllEULAsAccepted.string = 'true'
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.recomposeVAppParams', self.href + '/action/recomposeVApp', params, requests.codes.accepted, inspect.stack()[0][3], vm.name, wait)
+            params = Payload.serialize(params)
+            return self.api_post_params('vcloud.recomposeVAppParams', self.href + '/action/recomposeVApp', params, requests.codes.accepted, target_name=vm.name, wait=wait)
 
+    @operation_tag
     def del_vm(self, vm_name, wait=True):
             vm_record = self.get_record('vm', 'VMRecord', 'name==' + vm_name + ';container==' + self.href, show=False)
             if len(vm_record) == 0:
                 logger.info("%s does not exist in %s" % (vm_name, self.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vm_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vm_name))
                 return
             if not vm_record[0]['status'] == 'POWERED_OFF':
                 logger.info("%s must be powered off" % (vm_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vm_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vm_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='RecomposeVAppParams',attrs={'name':self.name,
@@ -4361,32 +6392,35 @@ class Vapp(Container):
                 'xmlns:ovf':'http://schemas.dmtf.org/ovf/envelope/1'}))
             # delete vm
             params.RecomposeVAppParams.append(Tag(builder=builder.TreeBuilder(),name='DeleteItem',attrs={'href':vm_record[0]['href']}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.recomposeVAppParams', self.href + 'recomposeVApp', params, requests.codes.accepted, inspect.stack()[0][3], vm_name)
+            params = Payload.serialize(params)
+            return self.api_post_params('vcloud.recomposeVAppParams', self.href + '/action/recomposeVApp', params, requests.codes.accepted, target_name=vm_name, wait=wait)
 
-    def get_snapshots(self, show=True):
+    def get_snapshots(self, show=None):
         return self.get_section('/snapshotSection', show=False)
 
-    def add_snapshot(self,name=None):
+    @operation_tag
+    def add_snapshot(self,name=None,wait=True):
         if name == None:
             name = datetime.now().isoformat()
         params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
         params.append(Tag(builder=builder.TreeBuilder(),name='CreateSnapshotParams',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5',
             'name':name})) 
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.createSnapshotParams', self.href + '/action/createSnapshot', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        return self.api_post_params('vcloud.createSnapshotParams', self.href + '/action/createSnapshot', params, requests.codes.accepted, target_name=self.name, wait=wait)
 
-    def del_snapshot(self):
-        self.api_post(self.href + '/action/removeAllSnapshots', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def del_snapshot(self, wait=True):
+        return self.api_post(self.href + '/action/removeAllSnapshots', requests.codes.accepted, wait=wait)
 
-    def revert_snapshot(self):
-        self.api_post(self.href + '/action/revertToCurrentSnapshot', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def revert_snapshot(self, wait=True):
+        return self.api_post(self.href + '/action/revertToCurrentSnapshot', requests.codes.accepted, wait=wait)
 
 class Catalog(Container):
 
-    def __init__(self, name, parent):
-        Container.__init__(self, name)
-        self.href = self.get_href()
+    def __init__(self, name, parent, context=None, href=None):
+        Container.__init__(self, name, parent.context if context == None else context)
+        self.href = self.get_href() if href == None else href
         self.admin_href = self.href.replace('/api','/api/admin')
         self.parent = parent
         self.sections = {'/action/controlAccess':'controlAccess'}
@@ -4394,12 +6428,14 @@ class Catalog(Container):
     def get_href(self):
         return super(Catalog, self).get_href('catalog', 'CatalogRecord')
 
+    @operation_tag
     def set_catalog(self, name):
         params = BeautifulSoup(self.get_entity(self.admin_href),'xml')
         params.AdminCatalog['name'] = name
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_put_params('admin.catalog', self.admin_href, params, requests.codes.ok, inspect.stack()[0][3], name)
+        params = Payload.serialize(params)
+        self.api_put_params('admin.catalog', self.admin_href, params, requests.codes.ok, target_name=name)
 
+    @operation_tag
     def set_storage_profile(self,vdc_name,storage_profile_name):
         storage_profile_record = self.get_record('orgVdcStorageProfile', 'OrgVdcStorageProfileRecord', 'vdcName==' + vdc_name + ';name==' + storage_profile_name, show=False)
         params = BeautifulSoup(self.get_entity(self.admin_href),'xml')
@@ -4407,18 +6443,20 @@ class Catalog(Container):
             params.AdminCatalog.CatalogStorageProfiles.append(Tag(builder=builder.TreeBuilder(),name='VdcStorageProfile',attrs={'href':storage_profile_record[0]['href']}))
         else:
             params.AdminCatalog.CatalogStorageProfiles.VdcStorageProfile['href'] = storage_profile_record[0]['href']
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_put_params('admin.catalog', self.admin_href, params, requests.codes.ok, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_put_params('admin.catalog', self.admin_href, params, requests.codes.ok, target_name=self.name)
 
+    @operation_tag
     def sync(self):
-        self.api_post(self.href + '/action/sync', requests.codes.accepted, inspect.stack()[0][3])
+        self.api_post(self.href + '/action/sync', requests.codes.accepted)
 
     def get_control_access(self):
-        r = self.api_get(self.href.replace('/api','/api' + self.parent.href.replace(Container.api_url_prefix,'')) + '/controlAccess')
+        r = self.api_get(self.href.replace('/api','/api' + self.parent.href.replace(self.context.api_url_prefix,'')) + '/controlAccess')
         records = [r.content if r != None else None]
         self.show_records('controlAccess', records)
         return records
 
+    @operation_tag
     def set_control_access_everyone(self,shared_to_everyone=True,access_level='ReadOnly'):
         if access_level not in Container.access_levels:
             logger.info("%s not in %s" % (access_level,Container.access_levels))
@@ -4429,14 +6467,15 @@ class Catalog(Container):
         params.ControlAccessParams.IsSharedToEveryone.string = str(shared_to_everyone).lower() 
         params.ControlAccessParams.append(Tag(builder=builder.TreeBuilder(),name='EveryoneAccessLevel'))
         params.ControlAccessParams.EveryoneAccessLevel.string = access_level
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.controlAccess', self.href.replace('/api','/api' + self.parent.href.replace(Container.api_url_prefix,'')) + '/action/controlAccess', params, requests.codes.ok, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.controlAccess', self.href.replace('/api','/api' + self.parent.href.replace(self.context.api_url_prefix,'')) + '/action/controlAccess', params, requests.codes.ok, target_name=self.name)
 
     def get_control_access_subjects(self):
         records = BeautifulSoup(self.get_control_access()[0],'xml').find_all('AccessSetting')
         self.show_records('accessSetting',records)
         return records
 
+    @operation_tag
     def add_control_access_subject(self,subject_type,subject_name,access_level):
         if subject_type == 'user':
             record_type = 'UserRecord'
@@ -4460,9 +6499,10 @@ class Catalog(Container):
         if params.find('AccessSettings') == None:
             params.ControlAccessParams.append(Tag(builder=builder.TreeBuilder(),name='AccessSettings'))
         params.find('AccessSettings').append(access)
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.controlAccess', self.href.replace('/api','/api' + self.parent.href.replace(Container.api_url_prefix,'')) + '/action/controlAccess', params, requests.codes.ok, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.controlAccess', self.href.replace('/api','/api' + self.parent.href.replace(self.context.api_url_prefix,'')) + '/action/controlAccess', params, requests.codes.ok, target_name=self.name)
 
+    @operation_tag
     def del_control_access_subject(self,access_index):
         params = BeautifulSoup(self.get_control_access()[0],'xml')
         accesses = params.find_all('AccessSetting')
@@ -4473,37 +6513,39 @@ class Catalog(Container):
             params.find('AccessSettings').extract()
         else:
             accesses[access_index].extract()
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.controlAccess', self.href.replace('/api','/api' + self.parent.href.replace(Container.api_url_prefix,'')) + '/action/controlAccess', params, requests.codes.ok, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.controlAccess', self.href.replace('/api','/api' + self.parent.href.replace(self.context.api_url_prefix,'')) + '/action/controlAccess', params, requests.codes.ok, target_name=self.name)
 
-    def get_catalog_item(self,name=None,detailed=False,show=True):
+    def get_catalog_item(self,name=None,detailed=False,show=None,stream=False):
         try:
             record_filter = 'catalogName==' + self.name
             record_filter += ';name==' +name if name != None else ''
-            return self.get_record('catalogItem', 'CatalogItemRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('catalogItem', 'CatalogItemRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def sync_catalog_item(self,catalog_item_index):
         catalog_items = self.get_record('catalogItem', 'CatalogItemRecord', 'catalogName==' + self.name, show=False)
         if catalog_item_index not in range(len(catalog_items)):
             logger.info("%s does not exist in %s" % (catalog_item_index,catalog_items[catalog_item_index]))
             return
-        self.api_post(catalog_items[catalog_item_index]['href'] + '/action/sync', requests.codes.accepted, inspect.stack()[0][3])
+        self.api_post(catalog_items[catalog_item_index]['href'] + '/action/sync', requests.codes.accepted)
 
-    def get_vapp_template(self,name=None,detailed=False,show=True):
+    def get_vapp_template(self,name=None,detailed=False,show=None,stream=False):
         try:
             record_filter = 'catalogName==' + self.name
             record_filter += ';name==' +name if name != None else ''
-            return self.get_record('vAppTemplate', 'VAppTemplateRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('vAppTemplate', 'VAppTemplateRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_vapp_template(self, vdc_name, file_path=None, dummy_hardware_ver='vmx-10', vapp_name=None, source_catalog_name=None, source_vapp_template_name=None, source_delete=False):
         vdc_record = self.get_record('orgVdc', 'OrgVdcRecord', 'name==' + vdc_name, show=False)
         if len(vdc_record) == 0:
             logger.info("%s does not exist" % (vdc_name))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vdc_name))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vdc_name))
             return
         if file_path == None and vapp_name == None and source_vapp_template_name == None:
             logger.info("either file_path or vapp_name or source_vapp_template_name needed")
@@ -4650,7 +6692,7 @@ class Catalog(Container):
                 tag.string = '4'
                 item.append(tag)
                 item.append(Tag(builder=builder.TreeBuilder(),name='rasd:Weight'))
-                ovf_content = etree.tostring(etree.fromstring(str(ovf_content)),pretty_print=True)
+                ovf_content = Payload.serialize(ovf_content)
                 with open('/tmp/dummy.ovf', "wb") as file:
                     file.write(ovf_content)
                 self.upload_ovf('/tmp/dummy.ovf', vdc_name)
@@ -4658,17 +6700,19 @@ class Catalog(Container):
                 logger.info("%s does not exist" % (file_path))
                 return
             elif file_path.endswith('.ova'):
-                tar = tarfile.open(file_path)
-                members = tar.getnames()
-                tar.extractall('/tmp')
-                tar.close()
-                for member in members:
-                    if member.endswith('.ovf'):
-                        ovf_path = '/tmp/' + member
-                    if member.endswith('.000000000'):
-                        vmdk_name = member[:-10]
-                        os.rename('/tmp/' + member, '/tmp/' + vmdk_name)
-                self.upload_ovf(ovf_path, vdc_name)
+                # members are uploaded in place from the archive, nothing is extracted
+                try:
+                    members = OvaMember.members(file_path)
+                except (tarfile.TarError, ValueError) as e:
+                    logger.info("invalid %s: %s" % (file_path, e))
+                    logger.info("%s %s %s failed" % (self.name, Metrics.operation(), file_path))
+                    return
+                ovf_names = [name for name in members if name.endswith('.ovf')]
+                if len(ovf_names) == 0:
+                    logger.info("no ovf in %s" % (file_path))
+                    logger.info("%s %s %s failed" % (self.name, Metrics.operation(), file_path))
+                    return
+                self.upload_ovf(members[ovf_names[0]], vdc_name, members)
             elif file_path.endswith('.ovf'):
                 self.upload_ovf(file_path, vdc_name)
             else:
@@ -4678,7 +6722,7 @@ class Catalog(Container):
             vapp_record = self.get_record('vApp', 'VAppRecord', 'vdcName==' + vdc_name + ';name==' + vapp_name, show=False)
             if len(vapp_record) == 0:
                 logger.info("%s does not exist" % (vapp_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='CaptureVAppParams',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5',
@@ -4688,19 +6732,19 @@ class Catalog(Container):
                 'href':vapp_record[0]['href'],
                 'name':vapp_record[0]['name'],
                 'type':'application/vnd.vmware.vcloud.vApp+xml'}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.captureVAppParams', self.href + '/action/captureVApp', params, requests.codes.accepted, inspect.stack()[0][3], vapp_name)
+            params = Payload.serialize(params)
+            self.api_post_params('vcloud.captureVAppParams', self.href + '/action/captureVApp', params, requests.codes.accepted, target_name=vapp_name)
             return
         if source_vapp_template_name and source_catalog_name:
             source_catalog_record = self.get_record('catalog', 'CatalogRecord', 'name==' + source_catalog_name, show=False)
             if len(source_catalog_name) == 0:
                 logger.info("%s does not exist" % (source_catalog_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], source_catalog_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), source_catalog_name))
                 return
             source_vapp_template_record = self.get_record('vAppTemplate', 'VAppTemplateRecord', 'catalogName==' + source_catalog_name + ';name==' + source_vapp_template_name, show=False)
             if len(source_vapp_template_record) == 0:
                 logger.info("%s does not exist in %s" % (source_vapp_template_name, source_catalog_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], source_vapp_template_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), source_vapp_template_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='CloneVAppTemplateParams',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5',
@@ -4708,28 +6752,29 @@ class Catalog(Container):
             params.CloneVAppTemplateParams.append(Tag(builder=builder.TreeBuilder(),name='Source',attrs={'href':source_vapp_template_record[0]['href']}))
             params.CloneVAppTemplateParams.append(Tag(builder=builder.TreeBuilder(),name='IsSourceDelete'))
             params.CloneVAppTemplateParams.IsSourceDelete.string = str(source_delete).lower()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.cloneVAppTemplateParams', vdc_record[0]['href'] + '/action/cloneVAppTemplate', params, requests.codes.created, inspect.stack()[0][3], source_vapp_template_name)
+            params = Payload.serialize(params)
+            self.api_post_params('vcloud.cloneVAppTemplateParams', vdc_record[0]['href'] + '/action/cloneVAppTemplate', params, requests.codes.created, target_name=source_vapp_template_name)
         else:
             logger.info("both source_vapp_template_name and source_catalog_name needed")
             return
         
-    def upload_ovf(self, ovf_path, vdc_name):
+    @operation_tag
+    def upload_ovf(self, ovf_path, vdc_name, files=None):
+        # files: upload sources by file name, such as the OvaMember of an ova, instead of files next to ovf_path
         if len(self.get_record('orgVdc', 'OrgVdcRecord', 'name==' + vdc_name, show=False)) == 0:
             logger.info("%s does not exist" % (vdc_name))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vdc_name))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vdc_name))
             return
-        if not os.path.isfile(ovf_path):
+        if FileSlice.file_mtime(ovf_path) == None:
             logger.info("%s does not exist" % (ovf_path))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], ovf_path))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), ovf_path))
             return
-        if not ovf_path.endswith('.ovf'):
+        if not str(ovf_path).endswith('.ovf'):
             logger.info("invalid %s" % (ovf_path))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], ovf_path))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), ovf_path))
             return
-        ovf_content = open(ovf_path,'r').read()
-        ovf_dirname = os.path.dirname(ovf_path)
-        ovf_size = len(ovf_content)
+        ovf_content = b''.join(bytes(chunk) for chunk in FileSlice(ovf_path, 0, FileSlice.file_size(ovf_path)))
+        ovf_dirname = os.path.dirname(str(ovf_path))
         if BeautifulSoup(ovf_content,'xml').find('Envelope').find('VirtualSystemCollection'):
             ovf_name = BeautifulSoup(ovf_content,'xml').find('Envelope').find('VirtualSystemCollection')['ovf:id']
         elif BeautifulSoup(ovf_content,'xml').find('Envelope').find('VirtualSystem'):
@@ -4759,8 +6804,8 @@ class Catalog(Container):
                 'href':storage_profile_record[0]['href'],
                 'name':storage_profile_record[0]['name'],
                 'type':'application/vnd.vmware.vcloud.vdcStorageProfile+xml'}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            r = self.api_post_params('vcloud.uploadVAppTemplateParams', self.href + '/action/upload', params, requests.codes.created, inspect.stack()[0][3], ovf_name)
+            params = Payload.serialize(params)
+            r = self.api_post_params('vcloud.uploadVAppTemplateParams', self.href + '/action/upload', params, requests.codes.created, target_name=ovf_name)
             if r == None:
                 return
             ovf_href = BeautifulSoup(r.content,'xml').CatalogItem.Entity['href']
@@ -4768,85 +6813,55 @@ class Catalog(Container):
         ovf_entity = self.get_entity(ovf_href)
         transfer_files = BeautifulSoup(ovf_entity,'xml').Files.find_all('File')
         if len(transfer_files) == 1:
-            transfer_file_href = transfer_files[0].Link['href']
-            transfer_offset = int(transfer_files[0]['bytesTransferred'])
-            api_headers = Container.api_headers.copy()
-            api_headers['Content-lenght'] = ovf_size
+            api_headers = self.context.api_headers
             api_headers['Content-type'] = 'text/xml'
-            api_headers['Content-Range'] = 'bytes ' + str(transfer_offset) + '-' + str(ovf_size) + '/' + str(ovf_size)
-            try:
-                it = UploadInChunks(ovf_path, transfer_offset, Container.chunk_size)
-                r = requests.put(transfer_file_href, headers = api_headers, data=IterableToFileAdapter(it))
-                if not r.status_code == requests.codes.ok:
-                    raise ApiError(inspect.stack()[0][3] + ' ' + ovf_name, r.status_code, r.content)
-                    return
-            except requests.exceptions.ConnectionError as e:
-                pass
-            # check ovf upload status
-            ovf_entity = self.get_entity(ovf_href)
-            transfer_offset = int(BeautifulSoup(ovf_entity,'xml').Files.File['bytesTransferred'])
-            if transfer_offset == ovf_size:
-                logger.info("upload %s succeeded" % (ovf_name))
-            else:
-                logger.info("upload %s failed" % (ovf_name))
+            if not self.upload_file(ovf_href, transfer_files[0].Link['href'], ovf_path, int(transfer_files[0]['bytesTransferred']), api_headers):
                 return
         # wait for ovf import
+        delays = TaskPoller().delays()
         while True:
             ovf_entity = self.get_entity(ovf_href)
-            if BeautifulSoup(ovf_entity,'xml').VAppTemplate['ovfDescriptorUploaded'] == 'true':
+            if XmlResponse(ovf_entity)['ovfDescriptorUploaded'] == 'true':
                 break
-        # upload vmdks
-        vmdk_files = BeautifulSoup(ovf_entity,'xml').Files.find_all('File')
-        for vmdk_file in vmdk_files:
+            delay = next(delays, None)
+            if delay == None:
+                raise ApiError(Metrics.operation() + ' ' + ovf_name, 'timeout', ovf_href)
+            time.sleep(delay)
+        # upload vmdks, Container.upload_streams at a time
+        uploads = []
+        for vmdk_file in BeautifulSoup(ovf_entity,'xml').Files.find_all('File'):
             if 'descriptor.ovf' in vmdk_file.Link['href']:
                 continue
-            else:
-                vmdk_path = ovf_dirname + '/' + vmdk_file.Link['href'].split('/')[-1]
-                vmdk_size = os.path.getsize(vmdk_path)
-                transfer_offset = int(vmdk_file['bytesTransferred'])
-                if not os.path.isfile(vmdk_path):
-                    logger.info("%s does not exist" % (vmdk_path))
-                    return
-                if transfer_offset == vmdk_size:
-                    logger.info("%s already uploaded" % (vmdk_path))
-                    continue
-                # upload vmdk
-                api_headers = {}
-                api_headers['Content-lenght'] = vmdk_size
-                api_headers['Content-Range'] = 'bytes ' + str(transfer_offset) + '-' + str(vmdk_size) + '/' + str(vmdk_size)
-                try:
-                    it = UploadInChunks(vmdk_path, transfer_offset, Container.chunk_size)
-                    r = requests.put(vmdk_file.Link['href'], headers = api_headers, data=IterableToFileAdapter(it))
-                    if not r.status_code == requests.codes.ok:
-                        raise ApiError(inspect.stack()[0][3] + ' ' + ovf_name, r.status_code, r.content)
-                        return
-                except requests.exceptions.ConnectionError as e:
-                    pass
-                # check vmdk upload status
-                ovf_entity = self.get_entity(ovf_href)
-                vmdk_link = BeautifulSoup(ovf_entity,'xml').find('Link',attrs={'href':vmdk_file.Link['href']})
-                transfer_offset = int(vmdk_link.parent['bytesTransferred'])
-                if transfer_offset == vmdk_size:
-                    logger.info("upload %s succeeded" % (vmdk_path))
-                else:
-                    logger.info("upload %s failed" % (vmdk_path))
-                    return
+            vmdk_name = vmdk_file.Link['href'].split('/')[-1]
+            vmdk_path = files.get(vmdk_name) if files != None else ovf_dirname + '/' + vmdk_name
+            if vmdk_path == None or FileSlice.file_mtime(vmdk_path) == None:
+                logger.info("%s does not exist" % (vmdk_path if vmdk_path != None else vmdk_name))
+                return
+            transfer_offset = int(vmdk_file['bytesTransferred'])
+            if transfer_offset == FileSlice.file_size(vmdk_path):
+                logger.info("%s already uploaded" % (vmdk_path))
+                continue
+            uploads.append((vmdk_file.Link['href'], vmdk_path, transfer_offset))
+        if len(uploads) > 0 and not self.upload_files(ovf_href, uploads):
+            return
         transfer_task_href = BeautifulSoup(ovf_entity,'xml').Tasks.Task['href']
         self.get_task_progress(transfer_task_href)
 
+    @operation_tag
     def del_vapp_template(self, vapp_template_name, wait=True):
         vapp_template_record = self.get_record('vAppTemplate', 'VAppTemplateRecord', 'catalogName==' + self.name + ';name==' + vapp_template_name, show=False)
         if len(vapp_template_record) == 0:
             logger.info("%s does not exist in %s" % (vapp_template_name, self.name))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vapp_template_name))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vapp_template_name))
             return
-        self.api_delete(vapp_template_record[0]['href'], inspect.stack()[0][3], vapp_template_name)
+        return self.api_delete(vapp_template_record[0]['href'], target_name=vapp_template_name, wait=wait)
 
+    @operation_tag
     def download_ovf(self, ovf_source, download_dirname):
         if not os.path.isdir(download_dirname):
             logger.info("%s does not exist" % (download_dirname))
             return
-        self.api_post(ovf_source.href + '/action/enableDownload', requests.codes.accepted, inspect.stack()[0][3])
+        self.api_post(ovf_source.href + '/action/enableDownload', requests.codes.accepted)
         # ovf
         ovf_source_entity = self.get_entity(ovf_source.href)
         ovf_href = BeautifulSoup(ovf_source_entity,'xml').find('Link',attrs={'rel':'download:default'})['href']
@@ -4855,44 +6870,34 @@ class Catalog(Container):
         transfer_url = ovf_href.replace(ovf_name,'')
         with open(ovf_path, 'wb') as file:
             logger.info("downloading %s" % (ovf_name))
-            r = requests.get(ovf_href, stream=True)
-            file.write(r.content)
-        # vmdk
+            with self.request_slot(ovf_href, 'transfer'):
+                r = self.context.transport.get(ovf_href, stream=True)
+                file.write(r.content)
+        # vmdk, resumed from the transfer journal
         vmdk_files = BeautifulSoup(r.content,'xml').find_all('File')
         for vmdk_file in vmdk_files:
             vmdk_name = vmdk_file['ovf:href']
             vmdk_href = transfer_url + vmdk_name
             vmdk_path = download_dirname + '/' + vmdk_name
-            with open(vmdk_path, 'wb') as file:
-                logger.info("downloading %s" % (vmdk_name))
-                r = requests.get(vmdk_href, stream=True)
-                length = r.headers.get('content-length')
-                if length is None:
-                    file.write(r.content)
-                else:
-                    dl = 0
-                    length = int(length)
-                    for chunk in r.iter_content(Container.chunk_size):
-                        dl += len(chunk)
-                        file.write(chunk)
-                        done = int(50 * dl / length)
-                        sys.stdout.write("\r[%s%s]" % ('=' * done, ' ' * (50-done)))    
-                        sys.stdout.flush()
-                    print
+            logger.info("downloading %s" % (vmdk_name))
+            if not self.download_file(vmdk_href, vmdk_path):
+                return False
+        return True
 
-    def get_media(self,name=None,detailed=False,show=True):
+    def get_media(self,name=None,detailed=False,show=None,stream=False):
         try:
             record_filter = 'catalogName==' + self.name
             record_filter += ';name==' +name if name != None else ''
-            return self.get_record('media', 'MediaRecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('media', 'MediaRecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def add_media(self, vdc_name, media_path=None, source_catalog_name=None, source_media_name=None, source_delete=False):
         vdc_record = self.get_record('orgVdc', 'OrgVdcRecord', 'name==' + vdc_name, show=False)
         if len(vdc_record) == 0:
             logger.info("%s does not exist" % (vdc_name))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], vdc_name))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), vdc_name))
             return
         if media_path == None and source_media_name == None:
             logger.info("either media_path or source_media_name needed")
@@ -4901,7 +6906,7 @@ class Catalog(Container):
         if media_path:
             if not os.path.isfile(media_path):
                 logger.info("%s does not exist" % (media_path))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], media_path))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), media_path))
                 return
             media_name = os.path.basename(media_path)
             media_size = os.path.getsize(media_path)
@@ -4929,8 +6934,8 @@ class Catalog(Container):
                     'href':storage_profile_record[0]['href'],
                     'name':storage_profile_record[0]['name'],
                     'type':'application/vnd.vmware.vcloud.vdcStorageProfile+xml'}))
-                params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-                r = self.api_post_params('vcloud.media', self.href + '/action/upload', params, requests.codes.created, inspect.stack()[0][3], media_name)
+                params = Payload.serialize(params)
+                r = self.api_post_params('vcloud.media', self.href + '/action/upload', params, requests.codes.created, target_name=media_name)
                 if r == None:
                     return
                 media_href = BeautifulSoup(r.content,'xml').CatalogItem.Entity['href']
@@ -4938,24 +6943,7 @@ class Catalog(Container):
             transfer_file_href = BeautifulSoup(media_entity,'xml').Files.File.Link['href']
             transfer_task_href = BeautifulSoup(media_entity,'xml').Tasks.Task['href']
             transfer_offset = int(BeautifulSoup(media_entity,'xml').Files.File['bytesTransferred'])
-
-            api_headers = Container.api_headers.copy()
-            api_headers['Content-lenght'] = media_size
-            api_headers['Content-Range'] = 'bytes ' + str(transfer_offset) + '-' + str(media_size) + '/' + str(media_size)
-            try:
-                it = UploadInChunks(media_path, transfer_offset, Container.chunk_size)
-                r = requests.put(transfer_file_href, headers = api_headers, data=IterableToFileAdapter(it))
-                if not r.status_code == requests.codes.ok:
-                    raise ApiError(inspect.stack()[0][3] + ' ' + media_name, r.status_code, r.content)
-                    return
-            except requests.exceptions.ConnectionError as e:
-                pass
-            media_entity = self.get_entity(media_href)
-            transfer_offset = int(BeautifulSoup(media_entity,'xml').Files.File['bytesTransferred'])
-            if transfer_offset == media_size:
-                logger.info("upload %s succeeded" % (media_name))
-            else:
-                logger.info("upload %s failed" % (media_name))
+            if not self.upload_file(media_href, transfer_file_href, media_path, transfer_offset, self.context.api_headers):
                 return
             self.get_task_progress(transfer_task_href)
             return
@@ -4963,12 +6951,12 @@ class Catalog(Container):
             source_catalog_record = self.get_record('catalog', 'CatalogRecord', 'name==' + source_catalog_name, show=False)
             if len(source_catalog_name) == 0:
                 logger.info("%s does not exist" % (source_catalog_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], source_catalog_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), source_catalog_name))
                 return
             source_media_record = self.get_record('media', 'MediaRecord', 'catalogName==' + source_catalog_name + ';name==' + source_media_name, show=False)
             if len(source_media_record) == 0:
                 logger.info("%s does not exist in %s" % (source_media_name, source_catalog_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], source_media_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), source_media_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='CloneMediaParams',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5',
@@ -4976,101 +6964,93 @@ class Catalog(Container):
             params.CloneMediaParams.append(Tag(builder=builder.TreeBuilder(),name='Source',attrs={'href':source_media_record[0]['href']}))
             params.CloneMediaParams.append(Tag(builder=builder.TreeBuilder(),name='IsSourceDelete'))
             params.CloneMediaParams.IsSourceDelete.string = str(source_delete).lower()
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.cloneMediaParams', vdc_record[0]['href'] + '/action/cloneMedia', params, requests.codes.created, inspect.stack()[0][3], source_media_name)
+            params = Payload.serialize(params)
+            self.api_post_params('vcloud.cloneMediaParams', vdc_record[0]['href'] + '/action/cloneMedia', params, requests.codes.created, target_name=source_media_name)
         else:
             logger.info("both source_media_name and source_catalog_name needed")
             return
 
+    @operation_tag
     def del_media(self, media_name, wait=True):
         media_record = self.get_record('media', 'MediaRecord', 'catalogName==' + self.name + ';name==' + media_name, show=False)
         if len(media_record) == 0:
             logger.info("%s does not exist in %s" % (media_name, self.name))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], media_name))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), media_name))
             return
-        self.api_delete(media_record[0]['href'], inspect.stack()[0][3], media_name)
+        return self.api_delete(media_record[0]['href'], target_name=media_name, wait=wait)
 
+    @operation_tag
     def download_media(self, media, download_dirname):
         if not os.path.isdir(download_dirname):
             logger.info("%s does not exist" % (download_dirname))
             return
-        self.api_post(media.href + '/action/enableDownload', requests.codes.accepted, inspect.stack()[0][3])
+        self.api_post(media.href + '/action/enableDownload', requests.codes.accepted)
         media_entity = self.get_entity(media.href)
         media_href = BeautifulSoup(media_entity,'xml').find('Link',attrs={'rel':'download:default'})['href']
         media_path = download_dirname + '/' + media.name
-        with open(media_path, 'wb') as file:
-            logger.info("downloading %s" % (media.name))
-            r = requests.get(media_href, stream=True)
-            length = r.headers.get('content-length')
-            if length is None:
-                file.write(r.content)
-            else:
-                dl = 0
-                length = int(length)
-                for chunk in r.iter_content(Container.chunk_size):
-                    dl += len(chunk)
-                    file.write(chunk)
-                    done = int(50 * dl / length)
-                    sys.stdout.write("\r[%s%s]" % ('=' * done, ' ' * (50-done)))    
-                    sys.stdout.flush()
-                print
+        logger.info("downloading %s" % (media.name))
+        return self.download_file(media_href, media_path)
 
 class VappTemplate(Container):
 
-    def __init__(self, name, parent):
-        Container.__init__(self, name)
+    def __init__(self, name, parent, context=None, href=None):
+        Container.__init__(self, name, parent.context if context == None else context)
         self.parent = parent
-        self.href = self.get_href(parent)
+        self.href = self.get_href(parent) if href == None else href
 
+    @operation_tag
     def get_href(self, parent):
-        vapp_template_record = self.get_record('vAppTemplate' , 'VAppTemplateRecord', 'name==' + self.name + ';catalogName==' + parent.name, show=False)
-        if len(vapp_template_record) == 0:
+        vapp_template_hrefs = self.resolve_hrefs('vAppTemplate', 'VAppTemplateRecord', self.name, 'catalogName==' + parent.name)
+        if len(vapp_template_hrefs) == 0:
             logger.info("%s not in %s" % (self.name, self.parent.name))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], self.parent.name))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), self.parent.name))
             return None
-        return vapp_template_record[0]['href']
+        return vapp_template_hrefs[0]
 
+    @operation_tag
     def set_vapp_template(self, name):
         params = BeautifulSoup(self.get_entity(self.href),'xml')
         params.VAppTemplate['name'] = name
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_put_params('vcloud.vAppTemplate', self.href, params, requests.codes.accepted, inspect.stack()[0][3], name)
+        params = Payload.serialize(params)
+        self.api_put_params('vcloud.vAppTemplate', self.href, params, requests.codes.accepted, target_name=name)
 
-    def get_vm(self,name=None,detailed=False,show=True):
+    def get_vm(self,name=None,detailed=False,show=None,stream=False):
         try:
             record_filter = 'container==' + self.href
             record_filter += ';name==' +name if name != None else ''
-            return self.get_record('vm', 'VMecord', record_filter, detailed=detailed, show=show)
+            return self.get_record('vm', 'VMecord', record_filter, detailed=detailed, show=show, stream=stream)
         except:
             Container.handle_exception(sys.exc_info())
 
 class Media(Container):
     
-    def __init__(self, name, parent):
-        Container.__init__(self, name)
+    def __init__(self, name, parent, context=None, href=None):
+        Container.__init__(self, name, parent.context if context == None else context)
         self.parent = parent
-        self.href = self.get_href(parent)
+        self.href = self.get_href(parent) if href == None else href
 
+    @operation_tag
     def get_href(self, parent):
-        media_record = self.get_record('media' , 'MediaRecord', 'name==' + self.name + ';catalogName==' + parent.name, show=False)
-        if len(media_record) == 0:
+        media_hrefs = self.resolve_hrefs('media', 'MediaRecord', self.name, 'catalogName==' + parent.name)
+        if len(media_hrefs) == 0:
             logger.info("%s not in %s" % (self.name, self.parent.name))
-            logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], self.parent.name))
+            logger.info("%s %s %s failed" % (self.name, Metrics.operation(), self.parent.name))
             return None
-        return media_record[0]['href']
+        return media_hrefs[0]
 
+    @operation_tag
     def set_media(self, name):
         params = BeautifulSoup(self.get_entity(self.href),'xml')
         params.Media['name'] = name
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_put_params('vcloud.media', self.href, params, requests.codes.accepted, inspect.stack()[0][3], name)
+        params = Payload.serialize(params)
+        self.api_put_params('vcloud.media', self.href, params, requests.codes.accepted, target_name=name)
 
 class Vm(Container):
 
-    def __init__(self, name, parent):
-        Container.__init__(self, name)
+    def __init__(self, name, parent, context=None, href=None):
+        Container.__init__(self, name, parent.context if context == None else context)
         self.parent = parent
-        self.href = self.get_href(parent)
+        self.href = self.get_href(parent) if href == None else href
         self.sections = {'':'vm',
             '/operatingSystemSection':'operatingSystemSection',
             '/networkConnectionSection':'networkConnectionSection',
@@ -5083,13 +7063,14 @@ class Vm(Container):
             '/virtualHardwareSection/disks':'rasdItemsList',
             '/virtualHardwareSection/networkCards':'rasdItemsList'}
 
+    @operation_tag
     def get_href(self, parent):
-            vm_record = self.get_record('vm' , 'VMRecord', 'name==' + self.name + ';container==' + self.parent.href, show=False)
-            if len(vm_record) == 0:
+            vm_hrefs = self.resolve_hrefs('vm', 'VMRecord', self.name, 'container==' + self.parent.href)
+            if len(vm_hrefs) == 0:
                 logger.info("%s not in %s" % (self.name, self.parent.name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], self.parent.name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), self.parent.name))
                 return None
-            return vm_record[0]['href']
+            return vm_hrefs[0]
 
     def set_vm(self, name):
             params = BeautifulSoup(self.get_entity(self.href),'xml')
@@ -5102,26 +7083,28 @@ class Vm(Container):
             self.show_records('storageProfile',records)
             return records
 
+    @operation_tag
     def set_storage_profile(self, storage_profile_name):
             vm_record = self.get_record('vm' , 'VMRecord', 'name==' + self.name + ';href==' + self.href, show=False)[0]
-            storage_profile_record = self.get_record('orgVdcStorageProfile','OrgVdcStorageProfileRecord','name==' + storage_profile_name + ';vdc==' + vm_record['vdc'], show=False)
-            if len(storage_profile_record) == 0:
+            storage_profile_hrefs = self.resolve_hrefs('orgVdcStorageProfile', 'OrgVdcStorageProfileRecord', storage_profile_name, 'vdc==' + vm_record['vdc'])
+            if len(storage_profile_hrefs) == 0:
                 logger.info("%s does not exist" % (storage_profile_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], storage_profile_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), storage_profile_name))
                 return
             vm_entity = self.get_entity(self.href)
             params = BeautifulSoup(vm_entity,'xml')
-            params.Vm.StorageProfile['name'] = storage_profile_record[0]['name']
-            params.Vm.StorageProfile['href'] = storage_profile_record[0]['href']
+            params.Vm.StorageProfile['name'] = storage_profile_name
+            params.Vm.StorageProfile['href'] = storage_profile_hrefs[0]
             self.set_section('', params)
 
-    def get_guest_customization(self, show=True):
+    def get_guest_customization(self, show=None):
             return self.get_section('/guestCustomizationSection', show=False)
 
+    @operation_tag
     def set_guest_customization(self,enable_customization=None,change_sid=None,join_domain=False,use_org_settings=None,domain_name=None,domain_user=None,domain_password=None,admin_password_enable=None,admin_password_auto=None,admin_password=None,reset_password_required=None,customization_script=None,computer_name=None):
             if not enable_customization in [True, False]:
                 logger.info("invalid input %s" % (str(enable_customization)))
-                logger.info("%s %s failed" % (self.name, inspect.stack()[0][3]))
+                logger.info("%s %s failed" % (self.name, Metrics.operation()))
                 return
             params = BeautifulSoup(self.get_section('/guestCustomizationSection', show=False),'xml')
             if enable_customization != None:
@@ -5154,20 +7137,21 @@ class Vm(Container):
                 params.GuestCustomizationSection.ComputerName.string = computer_name 
             self.set_section('/guestCustomizationSection',params)                   
 
-    def get_operating_system(self, show=True):
+    def get_operating_system(self, show=None):
             return self.get_section('/operatingSystemSection', show)
 
+    @operation_tag
     def set_operating_system(self, os_type):
             os_type = str(os_type).lower()
             if os_type not in Container.os_types:
                 logger.info("%s not in %s" % (os_type, Container.os_types.keys()))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], os_type))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), os_type))
                 return
             params = BeautifulSoup(self.get_section('/operatingSystemSection', show=False),'xml')
             params.OperatingSystemSection['vmw:osType'] = os_type
             self.set_section('/operatingSystemSection',params)                   
 
-    def get_vm_capabilities(self, show=True):
+    def get_vm_capabilities(self, show=None):
             return self.get_section('/vmCapabilities', show)
 
     def set_vm_capabilities(self):
@@ -5176,7 +7160,7 @@ class Vm(Container):
             params.VmCapabilities.CpuHotAddEnabled.string = 'true'
             self.set_section('/vmCapabilities',params)                   
 
-    def get_custom_properties(self, show=True):
+    def get_custom_properties(self, show=None):
             self.get_section('/productSections', show=False)
  
     def add_custom_property(self,property_key,property_value):
@@ -5200,54 +7184,60 @@ class Vm(Container):
             properties[property_index].extract()
             self.set_section('/productSections',params)
 
-    def get_vmtools(self, show=True):
+    def get_vmtools(self, show=None):
         self.get_section('/runtimeInfoSection', show)
 
+    @operation_tag
     def install_vmtools(self):
-        self.api_post(self.href + '/action/installVMwareTools', requests.codes.accepted, inspect.stack()[0][3])
+        self.api_post(self.href + '/action/installVMwareTools', requests.codes.accepted)
 
-    def consolidate_snapshot(self):
-        self.api_post(self.href + '/action/consolidate', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def consolidate_snapshot(self, wait=True):
+        return self.api_post(self.href + '/action/consolidate', requests.codes.accepted, wait=wait)
 
-    def upgrade_hardware(self):
-        self.api_post(self.href + '/action/upgradeHardwareVersion', requests.codes.accepted, inspect.stack()[0][3])
+    @operation_tag
+    def upgrade_hardware(self, wait=True):
+        return self.api_post(self.href + '/action/upgradeHardwareVersion', requests.codes.accepted, wait=wait)
 
-    def get_cpu(self, show=True):
+    def get_cpu(self, show=None):
         self.get_section('/virtualHardwareSection/cpu', show)
 
+    @operation_tag
     def set_cpu(self,num_cpu,core_socket):
             if not str(num_cpu).isdigit() or not str(core_socket).isdigit():
                 logger.info("invalid input %s or %s" % (num_cpu,core_socket))
-                logger.info("%s %s failed" % (self.name, inspect.stack()[0][3]))
+                logger.info("%s %s failed" % (self.name, Metrics.operation()))
                 return
             if not int(num_cpu) % int(core_socket) == 0:
                 logger.info("%s not divisible by %s" % (num_cpu,core_socket))
-                logger.info("%s %s failed" % (self.name, inspect.stack()[0][3]))
+                logger.info("%s %s failed" % (self.name, Metrics.operation()))
                 return
             params = BeautifulSoup(self.get_section('/virtualHardwareSection/cpu', show=False),'xml')
             params.Item.find('VirtualQuantity').string = str(num_cpu)
             params.Item.find('CoresPerSocket').string = str(core_socket)
             self.set_section('/virtualHardwareSection/cpu', params)
     
-    def get_memory(self, show=True):
+    def get_memory(self, show=None):
         self.get_section('/virtualHardwareSection/memory', show)
 
+    @operation_tag
     def set_memory(self,memory_size_mb):
             if not str(memory_size_mb).isdigit():
                 logger.info("invalid input %s" % (memory_size_mb))
-                logger.info("%s %s failed" % (self.name, inspect.stack()[0][3]))
+                logger.info("%s %s failed" % (self.name, Metrics.operation()))
                 return
             params = BeautifulSoup(self.get_section('/virtualHardwareSection/memory', show=False),'xml')
             params.Item.find('VirtualQuantity').string = str(memory_size_mb)
             self.set_section('/virtualHardwareSection/memory', params)
 
-    def get_disks(self, show=True):
+    def get_disks(self, show=None):
         self.get_section('/virtualHardwareSection/disks', show)
 
+    @operation_tag
     def set_disk(self,disk_index,disk_size_mb,storage_profile_name=None):
             if not str(disk_size_mb).isdigit():
                 logger.info("invalid input %s" % (disk_size_mb))
-                logger.info("%s %s failed" % (self.name, inspect.stack()[0][3]))
+                logger.info("%s %s failed" % (self.name, Metrics.operation()))
                 return
             vm_record = self.get_record('vm' , 'VMRecord', 'name==' + self.name + ';href==' + self.href, show=False)[0]
             sp_name = storage_profile_name if storage_profile_name != None else vm_record['storageProfileName']
@@ -5266,10 +7256,11 @@ class Vm(Container):
                params.RasdItemsList.find('AddressOnParent',text=str(disk_index)).parent.HostResource['vcloud:storageProfileHref'] = storage_profile_record[0]['href']
             self.set_section('/virtualHardwareSection/disks', params)
 
+    @operation_tag
     def add_disk(self,disk_size_mb,bus_sub_type=None):
             if not str(disk_size_mb).isdigit():
                 logger.info("invalid input %s" % (disk_size_mb))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], str(disk_size_mb)))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), str(disk_size_mb)))
                 return
 
             if bus_sub_type != None and bus_sub_type not in Container.disk_bus_sub_types.keys():
@@ -5354,7 +7345,7 @@ class Vm(Container):
                 nic.parent.IpAddress.string = ip_address 
             if mac_address:
                 nic.parent.MACAddress.string = mac_address 
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
+            params = Payload.serialize(params)
             self.set_section('/networkConnectionSection', params)
 
     def add_nic(self,nic_type,vapp_network_name,ip_alloc_mode):
@@ -5423,11 +7414,12 @@ class Vm(Container):
             params.RasdItemsList['xmlns:rasd'] = 'http://schemas.dmtf.org/wbem/wscim/1/cim-schema/2/CIM_ResourceAllocationSettingData'
             self.set_section('/virtualHardwareSection/networkCards', params)
 
+    @operation_tag
     def del_nic(self,nic_index):
             params = BeautifulSoup(self.get_section('/virtualHardwareSection/networkCards', show=False),'xml')
             if params.RasdItemsList.find('AddressOnParent',text=str(nic_index)) == None:
                 logger.info("nic %s does not exist" % (str(nic_index)))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], str(nic_index)))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), str(nic_index)))
                 return
             # restore namespaced attrs ripped by bs4
             for connection in params.RasdItemsList.find_all('Connection'):
@@ -5453,28 +7445,30 @@ class Vm(Container):
             media = BeautifulSoup(self.get_entity(self.href),'xml').find('ResourceSubType',text='vmware.cdrom.iso')
             return media.parent.find('HostResource').string if media.has_attr('parent') else None
 
+    @operation_tag
     def insert_media(self, media_name):
             # media must in vm vdc
             vm_record = self.get_record('vm' , 'VMRecord', 'name==' + self.name + ';href==' + self.href, show=False)[0]
             media_record = self.get_record('media' , 'MediaRecord', 'name==' + media_name + ';vdc==' + vm_record['vdc'], show=False)
             if len(media_record) == 0:
                 logger.info("%s does not exist" % (media_name))
-                logger.info("%s %s %s failed" % (self.name, inspect.stack()[0][3], media_name))
+                logger.info("%s %s %s failed" % (self.name, Metrics.operation(), media_name))
                 return
             params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
             params.append(Tag(builder=builder.TreeBuilder(),name='ns6:MediaInsertOrEjectParams',attrs={'xmlns:ns6':'http://www.vmware.com/vcloud/v1.5'}))
             params.find('ns6:MediaInsertOrEjectParams').append(Tag(builder=builder.TreeBuilder(),name='ns6:Media',attrs={'type':'application/vnd.vmware.vcloud.media+xml',
                 'name':media_name,
                 'href':media_record[0]['href']}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.mediaInsertOrEjectParams', self.href + '/media/action/insertMedia', params, requests.codes.accepted, inspect.stack()[0][3], media_name)
+            params = Payload.serialize(params)
+            self.api_post_params('vcloud.mediaInsertOrEjectParams', self.href + '/media/action/insertMedia', params, requests.codes.accepted, target_name=media_name)
 
+    @operation_tag
     def eject_media(self):
             vm_entity = self.get_entity(self.href)
             media = BeautifulSoup(vm_entity,'xml').find('ResourceSubType',text='vmware.cdrom.iso')
             if media == None:
                 logger.info("%s has no media inserted" % (self.name))
-                logger.info("%s %s failed" % (self.name, inspect.stack()[0][3]))
+                logger.info("%s %s failed" % (self.name, Metrics.operation()))
                 return
             else:
                 media_name = media.parent.find('HostResource').string
@@ -5486,16 +7480,17 @@ class Vm(Container):
             params.find('ns6:MediaInsertOrEjectParams').append(Tag(builder=builder.TreeBuilder(),name='ns6:Media',attrs={'type':'application/vnd.vmware.vcloud.media+xml',
                 'name':media_name,
                 'href':media_record[0]['href']}))
-            params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-            self.api_post_params('vcloud.mediaInsertOrEjectParams', self.href + '/media/action/ejectMedia', params, requests.codes.accepted, inspect.stack()[0][3], media_name)
+            params = Payload.serialize(params)
+            self.api_post_params('vcloud.mediaInsertOrEjectParams', self.href + '/media/action/ejectMedia', params, requests.codes.accepted, target_name=media_name)
 
-    def get_independent_disk(self,detailed=False,show=True):
+    def get_independent_disk(self,detailed=False,show=None):
         try:
             record_filter = 'vm==' + self.href
             return self.get_record('vmDiskRelation' , 'VmDiskRelationRecord', record_filter, detailed=detailed, show=show)
         except:
             Container.handle_exception(sys.exc_info())
 
+    @operation_tag
     def attach_independent_disk(self,vdc_disk_index):
         vm_record = self.get_record('vm' , 'VMRecord', 'name==' + self.name + ';href==' + self.href, show=False)[0]
         vdc_disks = self.get_record('disk', 'DiskRecord', 'vdc==' + vm_record['vdc'], show=False)
@@ -5505,9 +7500,10 @@ class Vm(Container):
         params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
         params.append(Tag(builder=builder.TreeBuilder(),name='DiskAttachOrDetachParams',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5'}))
         params.DiskAttachOrDetachParams.append(Tag(builder=builder.TreeBuilder(),name='Disk',attrs={'href':vdc_disks[vdc_disk_index]['href']}))
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.diskAttachOrDetachParams', self.href + '/disk/action/attach', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.diskAttachOrDetachParams', self.href + '/disk/action/attach', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def detach_independent_disk(self,vm_disk_index):
         vm_disks = self.get_record('vmDiskRelation' , 'VmDiskRelationRecord', 'vm==' + self.href, show=False)
         if vm_disk_index not in range(len(vm_disks)):
@@ -5516,15 +7512,17 @@ class Vm(Container):
         params = BeautifulSoup('<?xml version="1.0" encoding=""?>','xml')
         params.append(Tag(builder=builder.TreeBuilder(),name='DiskAttachOrDetachParams',attrs={'xmlns':'http://www.vmware.com/vcloud/v1.5'}))
         params.DiskAttachOrDetachParams.append(Tag(builder=builder.TreeBuilder(),name='Disk',attrs={'href':vm_disks[vm_disk_index]['disk']}))
-        params = etree.tostring(etree.fromstring(str(params)),pretty_print=True)
-        self.api_post_params('vcloud.diskAttachOrDetachParams', self.href + '/disk/action/detach', params, requests.codes.accepted, inspect.stack()[0][3], self.name)
+        params = Payload.serialize(params)
+        self.api_post_params('vcloud.diskAttachOrDetachParams', self.href + '/disk/action/detach', params, requests.codes.accepted, target_name=self.name)
 
+    @operation_tag
     def get_storage_compliance(self):
-        self.api_post(self.href + '/action/checkCompliance', requests.codes.accepted, inspect.stack()[0][3])
-        self.get_section('/complianceResult', show=True)
+        self.api_post(self.href + '/action/checkCompliance', requests.codes.accepted)
+        self.get_section('/complianceResult', show=None)
 
+    @operation_tag
     def get_wmks(self):
-        r = self.api_post(self.href + '/screen/action/acquireMksTicket', requests.codes.ok, inspect.stack()[0][3])
+        r = self.api_post(self.href + '/screen/action/acquireMksTicket', requests.codes.ok)
         if r == None:
             logger.info("%s has to be powered on" % (self.name))
             return